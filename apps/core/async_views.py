@@ -0,0 +1,144 @@
+"""
+Async request handling for DRF viewsets served over ASGI.
+"""
+from asgiref.sync import markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.http import Http404
+from rest_framework.exceptions import APIException
+
+
+class AsyncViewSetMixin:
+    """
+    ViewSet mixin serving selected actions with native coroutines.
+
+    When ``API_ASYNC_VIEWS`` is on (the default under ``config.asgi``), the
+    view is a coroutine function, so Django's ASGI handler awaits it on the
+    event loop instead of handing the whole request to a thread. An action
+    ``name`` is served by ``async def a<name>()`` when the viewset defines
+    one; authentication uses the authenticators' ``aauthenticate()`` where
+    available, and mixins whose ``initial()`` does I/O provide an
+    ``ainitial()`` that is awaited instead. Actions without an async variant
+    (writes, OPTIONS) run the regular sync dispatch, response finalization
+    included, in a thread, so behaviour is unchanged.
+
+    Under WSGI (the flag off) the viewset dispatches synchronously exactly
+    as before.
+    """
+    async_dispatch = False
+
+    @classmethod
+    def as_view(cls, actions=None, **initkwargs):
+        initkwargs.setdefault('async_dispatch', settings.API_ASYNC_VIEWS)
+        view = super().as_view(actions, **initkwargs)
+        if initkwargs['async_dispatch']:
+            # DRF's view function is sync; it returns dispatch()'s coroutine.
+            markcoroutinefunction(view)
+        return view
+
+    def dispatch(self, request, *args, **kwargs):
+        if self.async_dispatch:
+            return self.adispatch(request, *args, **kwargs)
+        return super().dispatch(request, *args, **kwargs)
+
+    async def adispatch(self, request, *args, **kwargs):
+        """
+        Async counterpart of ``APIView.dispatch()``.
+        """
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        handler = self.get_async_handler(request)
+        if handler is None:
+            return await sync_to_async(self.handle_sync)(request, *args, **kwargs)
+
+        try:
+            await aauthenticate(request)
+            if hasattr(self, 'ainitial'):
+                await self.ainitial(request, *args, **kwargs)
+            else:
+                self.initial(request, *args, **kwargs)
+            response = await handler(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    def get_async_handler(self, request):
+        """
+        Return the ``a<action>`` coroutine method serving ``request``, or None.
+        """
+        action = getattr(self, 'action', None)
+        if action is None or request.method.lower() not in self.http_method_names:
+            return None
+        return getattr(self, f'a{action}', None)
+
+    def handle_sync(self, request, *args, **kwargs):
+        """
+        Run the sync checks, handler and response finalization of ``request``.
+        """
+        try:
+            self.initial(request, *args, **kwargs)
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+            response = handler(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def apaginate_queryset(self, queryset):
+        """
+        Async counterpart of ``GenericAPIView.paginate_queryset()``.
+        """
+        if self.paginator is None:
+            return None
+        return await self.paginator.apaginate_queryset(queryset, self.request, view=self)
+
+    async def aget_object(self):
+        """
+        Async counterpart of ``GenericAPIView.get_object()``.
+
+        Raises:
+            Http404: If no object matches the lookup
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        filter_kwargs = {self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        try:
+            obj = await queryset.aget(**filter_kwargs)
+        except (queryset.model.DoesNotExist, TypeError, ValueError, ValidationError):
+            raise Http404
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+
+async def aauthenticate(request):
+    """
+    Authenticate a DRF ``request`` without blocking the event loop.
+
+    Mirrors ``Request._authenticate()``: the first authenticator returning
+    a ``(user, auth)`` pair wins. Authenticators without ``aauthenticate()``
+    run in a thread.
+    """
+    for authenticator in request.authenticators:
+        try:
+            if hasattr(authenticator, 'aauthenticate'):
+                user_auth = await authenticator.aauthenticate(request)
+            else:
+                user_auth = await sync_to_async(authenticator.authenticate)(request)
+        except APIException:
+            request._not_authenticated()
+            raise
+        if user_auth is not None:
+            request._authenticator = authenticator
+            request.user, request.auth = user_auth
+            return
+    request._not_authenticated()
@@ -0,0 +1,36 @@
+"""
+Bulk writes through PostgreSQL COPY.
+"""
+import csv
+import datetime
+import io
+
+
+def copy_rows(cursor, table, columns, rows, force_not_null=()):
+    """
+    Write ``rows`` into ``table`` with one ``COPY ... FROM STDIN``.
+
+    Rows are encoded as CSV, where an empty unquoted value means NULL;
+    text columns listed in ``force_not_null`` read it as an empty string.
+
+    Args:
+        cursor: Database cursor
+        table: Table name
+        columns: Column names, in row order
+        rows: Iterable of value tuples
+        force_not_null: Text columns that never hold NULL
+    """
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(map(_copy_row, rows))
+    buffer.seek(0)
+    options = 'FORMAT csv'
+    if force_not_null:
+        options += f', FORCE_NOT_NULL ({", ".join(force_not_null)})'
+    cursor.copy_expert(
+        f'COPY {table} ({", ".join(columns)}) FROM STDIN WITH ({options})', buffer
+    )
+
+
+def _copy_row(row):
+    return [value.isoformat() if isinstance(value, datetime.datetime) else value
+            for value in row]
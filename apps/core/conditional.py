@@ -0,0 +1,155 @@
+"""
+Conditional GET (ETag / Last-Modified) support for API viewsets.
+"""
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+class ConditionalGetMixin:
+    """
+    ViewSet mixin computing validators for BaseModel resources.
+
+    Objects are validated by ``updated_at`` (ETag and Last-Modified).
+    Lists are validated by ETag only, since deleting a row never raises
+    ``max(updated_at)``. A list ETag is built after the page is fetched
+    from the full request path, ``max(updated_at)`` of the filtered
+    queryset, the ids of the rows on the page and whatever the paginator
+    reports about the page (its count per the configured count strategy),
+    so validating a list never adds a full ``COUNT(*)``.
+    """
+
+    def get_object_validators(self, instance):
+        """
+        Return ``(etag, last_modified)`` for a single object.
+        The query string is part of the ETag, as it can select fields.
+        """
+        etag = make_etag(
+            instance.uuid,
+            instance.updated_at,
+            self.request.GET.urlencode(),
+        )
+        return etag, instance.updated_at
+
+    def get_list_etag(self, queryset, rows, page_state=()):
+        """
+        Return the ETag of the page ``rows`` of a filtered list queryset.
+
+        Args:
+            queryset: Filtered queryset the page was taken from
+            rows: Rows of the page (dicts with ``id`` or model instances)
+            page_state: Paginator state shown in the response, such as
+                the count and whether a next page exists
+
+        Returns:
+            Weak ETag string
+        """
+        last_modified = queryset.order_by().aggregate(
+            last_modified=Max('updated_at')
+        )['last_modified']
+        return self._make_list_etag(last_modified, rows, page_state)
+
+    async def aget_list_etag(self, queryset, rows, page_state=()):
+        """
+        Async variant of :meth:`get_list_etag`.
+        """
+        last_modified = (await queryset.order_by().aaggregate(
+            last_modified=Max('updated_at')
+        ))['last_modified']
+        return self._make_list_etag(last_modified, rows, page_state)
+
+    def add_related_validators(self, validators, queryset):
+        """
+        Fold the fingerprint of related rows embedded in a response into
+        ``validators``, an ``(etag, last_modified)`` pair.
+        """
+        return _fold_fingerprint(validators, get_fingerprint(queryset))
+
+    async def aadd_related_validators(self, validators, queryset):
+        """
+        Async variant of :meth:`add_related_validators`.
+        """
+        return _fold_fingerprint(validators, await aget_fingerprint(queryset))
+
+    def _make_list_etag(self, last_modified, rows, page_state):
+        return make_etag(
+            self.request.get_full_path(),
+            last_modified,
+            *page_state,
+            *(_row_id(row) for row in rows),
+        )
+
+    def get_not_modified_response(self, etag, last_modified=None):
+        """
+        Return a 304 (or 412) response if the request preconditions allow
+        it, otherwise None.
+        """
+        response = get_conditional_response(
+            self.request._request,
+            etag=etag,
+            last_modified=_timestamp(last_modified),
+        )
+        if response is not None:
+            set_validator_headers(response, etag, last_modified)
+        return response
+
+
+def get_fingerprint(queryset):
+    """
+    Return ``max(updated_at)`` and the row count of ``queryset``.
+    """
+    return queryset.order_by().aggregate(
+        last_modified=Max('updated_at'),
+        count=Count('pk'),
+    )
+
+
+async def aget_fingerprint(queryset):
+    """
+    Async variant of :func:`get_fingerprint`.
+    """
+    return await queryset.order_by().aaggregate(
+        last_modified=Max('updated_at'),
+        count=Count('pk'),
+    )
+
+
+def make_etag(*parts):
+    """
+    Build a weak ETag from the string form of ``parts``.
+    """
+    digest = hashlib.md5(
+        '|'.join(str(part) for part in parts).encode('utf-8'),
+        usedforsecurity=False,
+    ).hexdigest()
+    return f'W/{quote_etag(digest)}'
+
+
+def set_validator_headers(response, etag, last_modified=None):
+    """
+    Set the ETag header, and Last-Modified when given, on ``response``.
+    """
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(_timestamp(last_modified))
+    return response
+
+
+def _fold_fingerprint(validators, fingerprint):
+    etag, last_modified = validators
+    related_modified = fingerprint['last_modified']
+    if related_modified is not None and (
+        last_modified is None or related_modified > last_modified
+    ):
+        last_modified = related_modified
+    return make_etag(etag, fingerprint['count'], related_modified), last_modified
+
+
+def _row_id(row):
+    return row['id'] if isinstance(row, dict) else row.pk
+
+
+def _timestamp(value):
+    return None if value is None else int(value.timestamp())
@@ -0,0 +1,124 @@
+"""
+Streaming NDJSON/CSV exports of row-serialized querysets.
+"""
+import csv
+import io
+import json
+from itertools import batched
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import BaseRenderer
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Newline-delimited JSON, one object per line.
+
+    Export views stream their own responses; the renderer makes
+    ``?format=ndjson`` negotiable and renders error responses.
+    """
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        items = data if isinstance(data, list) else [data]
+        return ''.join(_ndjson_line(item) for item in items).encode(self.charset)
+
+
+class CSVRenderer(BaseRenderer):
+    """
+    CSV with a header row; renders error responses of export views.
+    """
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        items = data if isinstance(data, list) else [data]
+        if not items:
+            return b''
+        columns = list(items[0])
+        lines = [_csv_line(columns)]
+        lines.extend(_csv_line([item.get(column) for column in columns]) for item in items)
+        return ''.join(lines).encode(self.charset)
+
+
+EXPORT_RENDERERS = [NDJSONRenderer, CSVRenderer]
+
+
+def stream_export(queryset, make_serializer, export_format, chunk_size, filename):
+    """
+    Return a StreamingHttpResponse exporting ``queryset`` row by row.
+
+    Rows are read from a server-side cursor ``chunk_size`` at a time and
+    each chunk gets a fresh row serializer, so memory use does not grow
+    with the size of the export.
+
+    Args:
+        queryset: ``values()`` queryset from ``RowSerializer.get_queryset``
+        make_serializer: Callable returning a RowSerializer for some rows
+        export_format: ``ndjson`` or ``csv``
+        chunk_size: Rows fetched and encoded per chunk
+        filename: Base name of the attachment
+
+    Returns:
+        StreamingHttpResponse
+    """
+    def content():
+        if export_format == 'csv':
+            yield _csv_line(make_serializer(()).get_flat_fields())
+        for chunk in batched(queryset.iterator(chunk_size=chunk_size), chunk_size):
+            yield _encode_chunk(make_serializer(chunk), export_format)
+
+    return _make_response(content(), export_format, filename)
+
+
+def astream_export(queryset, make_serializer, export_format, chunk_size, filename):
+    """
+    Async variant of :func:`stream_export` for ASGI, reading rows with
+    ``aiterator()``.
+    """
+    async def content():
+        if export_format == 'csv':
+            yield _csv_line(make_serializer(()).get_flat_fields())
+        chunk = []
+        async for row in queryset.aiterator(chunk_size=chunk_size):
+            chunk.append(row)
+            if len(chunk) == chunk_size:
+                yield _encode_chunk(make_serializer(chunk), export_format)
+                chunk = []
+        if chunk:
+            yield _encode_chunk(make_serializer(chunk), export_format)
+
+    return _make_response(content(), export_format, filename)
+
+
+def _make_response(content, export_format, filename):
+    renderer = NDJSONRenderer if export_format == 'ndjson' else CSVRenderer
+    response = StreamingHttpResponse(
+        content, content_type=f'{renderer.media_type}; charset={renderer.charset}'
+    )
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{export_format}"'
+    return response
+
+
+def _encode_chunk(serializer, export_format):
+    if export_format == 'csv':
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(
+            serializer.to_flat_representation(row) for row in serializer.rows
+        )
+        return buffer.getvalue()
+    return ''.join(_ndjson_line(serializer.to_representation(row)) for row in serializer.rows)
+
+
+def _ndjson_line(item):
+    return json.dumps(item, cls=DjangoJSONEncoder, ensure_ascii=False, separators=(',', ':')) + '\n'
+
+
+def _csv_line(values):
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(values)
+    return buffer.getvalue()
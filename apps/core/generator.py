@@ -0,0 +1,250 @@
+"""
+Deterministic synthetic users, tasks and comments for load and benchmark
+datasets.
+"""
+import datetime
+import random
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+from django.db.models import Max
+from apps.core.bulk_copy import copy_rows
+from apps.tasks.models import ChangeLogEntry, Task, Comment
+
+User = get_user_model()
+
+USER_COLUMNS = (
+    'id', 'uuid', 'password', 'is_superuser', 'username', 'first_name', 'last_name',
+    'email', 'is_staff', 'is_active', 'date_joined', 'created_at', 'updated_at',
+)
+TASK_COLUMNS = (
+    'id', 'uuid', 'title', 'description', 'creator_id', 'assignee_id', 'is_completed',
+    'completed_at', 'comment_count', 'last_activity_at', 'created_at', 'updated_at',
+)
+COMMENT_COLUMNS = ('uuid', 'task_id', 'author_id', 'text', 'created_at', 'updated_at')
+CHANGE_LOG_COLUMNS = ('kind', 'uuid', 'deleted')
+
+FIRST_NAMES = (
+    'Anna', 'Ben', 'Chloe', 'David', 'Emma', 'Felix', 'Grace', 'Hugo', 'Iris', 'Jack',
+    'Kate', 'Leo', 'Mia', 'Noah', 'Olga', 'Paul', 'Rosa', 'Sam', 'Tina', 'Victor',
+)
+LAST_NAMES = (
+    'Adams', 'Brown', 'Clark', 'Davis', 'Evans', 'Fisher', 'Garcia', 'Hill', 'Ivanov',
+    'Jones', 'King', 'Lopez', 'Miller', 'Nguyen', 'Owens', 'Petrov', 'Reed', 'Smith',
+)
+VERBS = (
+    'Fix', 'Review', 'Implement', 'Update', 'Refactor', 'Test', 'Document', 'Deploy',
+    'Investigate', 'Design', 'Migrate', 'Remove',
+)
+NOUNS = (
+    'login page', 'billing report', 'search index', 'user profile', 'export job',
+    'notification email', 'API client', 'database backup', 'dashboard', 'onboarding flow',
+    'payment webhook', 'audit log', 'mobile layout', 'cache layer', 'import script',
+)
+SENTENCES = (
+    'Steps to reproduce are in the linked ticket.',
+    'Customers reported this after the last release.',
+    'Needs a review from the backend team.',
+    'Blocked until the staging environment is updated.',
+    'Measure the response time before and after the change.',
+    'Keep the old behaviour behind a feature flag.',
+    'The logs show timeouts under load.',
+    'Check the edge cases for empty input.',
+    'Done on my side, please verify.',
+    'Pushed a fix, waiting for CI.',
+    'Can we split this into smaller tasks?',
+    'Agreed, let us ship it this week.',
+)
+
+# Share of unassigned tasks.
+UNASSIGNED_RATIO = 0.25
+# Upper bound of generated comments per task.
+MAX_COMMENTS = 500
+
+
+class DataGenerator:
+    """
+    Generate users, tasks and comments in fixed-size chunks.
+
+    Every chunk draws from its own random generator seeded with ``seed``,
+    the table and the chunk position, so the same arguments produce the
+    same rows whatever the chunk order or the number of worker processes.
+    Explicit user and task ids (continuing after the current maximum) let
+    chunks reference each other without reading back generated rows.
+
+    The data is skewed like real usage: a few users create and receive
+    most tasks, tasks get more frequent towards ``end``, older tasks are
+    more likely completed, and comment counts per task follow a power law
+    (``comments_per_task='zipf'``) unless a fixed number is given.
+    """
+
+    def __init__(self, users, tasks, comments_per_task='zipf', seed=0,
+                 days=730, end=None, password=None, user_base=0, task_base=0):
+        self.users = users
+        self.tasks = tasks
+        self.comments_per_task = comments_per_task
+        self.seed = seed
+        self.end = end or datetime.datetime.now(datetime.UTC).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        self.span = datetime.timedelta(days=days)
+        self.start = self.end - self.span
+        # One hash for all users; None gives unusable passwords.
+        self.password = make_password(password)
+        self.user_base = user_base
+        self.task_base = task_base
+
+    @staticmethod
+    def next_ids():
+        """
+        Return the current maximum user and task ids.
+        """
+        return (
+            User.objects.aggregate(max_id=Max('id'))['max_id'] or 0,
+            Task.objects.aggregate(max_id=Max('id'))['max_id'] or 0,
+        )
+
+    def rng(self, table, start):
+        return random.Random(f'{self.seed}:{table}:{start}')
+
+    def user_rows(self, start, stop):
+        """
+        Return user rows for user numbers ``start`` to ``stop``.
+        """
+        rng = self.rng('users', start)
+        rows = []
+        for index in range(start, stop):
+            user_id = self.user_base + index + 1
+            joined = self.start + self.span * rng.random() ** 2
+            rows.append((
+                user_id, _uuid(rng), self.password, False, f'user{user_id}',
+                rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES),
+                f'user{user_id}@example.com', False, True, joined, joined, joined,
+            ))
+        return rows
+
+    def task_rows(self, start, stop):
+        """
+        Return task and comment rows for task numbers ``start`` to ``stop``.
+
+        Returns:
+            ``(task_rows, comment_rows)``
+        """
+        rng = self.rng('tasks', start)
+        tasks, comments = [], []
+        for index in range(start, stop):
+            task_id = self.task_base + index + 1
+            # Denser towards the end: task i is created at sqrt(i / n) of the span.
+            created = self.start + self.span * ((index + rng.random()) / self.tasks) ** 0.5
+            remaining = self.end - created
+            # From 20% completed for the newest tasks to 90% for the oldest.
+            is_completed = rng.random() < 0.2 + 0.7 * (remaining / self.span)
+            completed_at = created + remaining * rng.random() ** 2 if is_completed else None
+
+            comment_times = sorted(
+                created + remaining * rng.random() ** 3
+                for _ in range(self.comment_count(rng))
+            )
+            for commented in comment_times:
+                comments.append((
+                    _uuid(rng), task_id, self.user_id(rng, 1.5),
+                    ' '.join(rng.sample(SENTENCES, rng.randint(1, 3))), commented, commented,
+                ))
+            last_activity = comment_times[-1] if comment_times else created
+
+            tasks.append((
+                task_id, _uuid(rng),
+                f'{rng.choice(VERBS)} {rng.choice(NOUNS)} #{task_id}',
+                ' '.join(rng.sample(SENTENCES, rng.randint(0, 4))),
+                self.user_id(rng, 2),
+                None if rng.random() < UNASSIGNED_RATIO else self.user_id(rng, 3),
+                is_completed, completed_at, len(comment_times), last_activity,
+                created, max(last_activity, completed_at or created),
+            ))
+        return tasks, comments
+
+    def comment_count(self, rng):
+        if self.comments_per_task == 'zipf':
+            # Pareto tail: most tasks get no or few comments, a few get hundreds.
+            return min(int(rng.paretovariate(1.2)) - 1, MAX_COMMENTS)
+        return self.comments_per_task
+
+    def user_id(self, rng, exponent):
+        # Power law over user numbers: low numbers are picked far more often.
+        index = min(int(self.users * rng.random() ** exponent), self.users - 1)
+        return self.user_base + index + 1
+
+    @staticmethod
+    def write_users(rows):
+        """
+        Write user rows in one transaction.
+        """
+        with transaction.atomic(), connection.cursor() as cursor:
+            copy_rows(cursor, User._meta.db_table, USER_COLUMNS, rows,
+                      force_not_null=('first_name', 'last_name'))
+
+    @staticmethod
+    def write_tasks(tasks, comments):
+        """
+        Write task rows and their comment rows in one transaction, and add
+        them to the change log.
+        """
+        with transaction.atomic(), connection.cursor() as cursor:
+            copy_rows(cursor, Task._meta.db_table, TASK_COLUMNS, tasks,
+                      force_not_null=('description',))
+            copy_rows(cursor, Comment._meta.db_table, COMMENT_COLUMNS, comments)
+            copy_rows(cursor, ChangeLogEntry._meta.db_table, CHANGE_LOG_COLUMNS, [
+                *((ChangeLogEntry.TASK, row[1], False) for row in tasks),
+                *((ChangeLogEntry.COMMENT, row[0], False) for row in comments),
+            ])
+
+    @staticmethod
+    def reset_sequences():
+        """
+        Move the user and task id sequences past the generated ids.
+        """
+        with connection.cursor() as cursor:
+            for model in (User, Task):
+                cursor.execute(
+                    f"SELECT setval(pg_get_serial_sequence(%s, 'id'), "
+                    f"(SELECT COALESCE(MAX(id), 1) FROM {model._meta.db_table}))",
+                    [model._meta.db_table],
+                )
+
+
+def drop_indexes(tables):
+    """
+    Drop the secondary indexes of ``tables`` and return their definitions.
+
+    Primary keys and indexes backing unique or other constraints are kept.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT i.indexrelid::regclass::text, pg_get_indexdef(i.indexrelid)
+            FROM pg_index i
+            WHERE i.indrelid = ANY(%s::regclass[])
+              AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = i.indexrelid)
+            ORDER BY 1
+        """, [list(tables)])
+        indexes = cursor.fetchall()
+        for name, _ in indexes:
+            cursor.execute(f'DROP INDEX {name}')
+    return [definition for _, definition in indexes]
+
+
+def create_indexes(definitions):
+    """
+    Recreate indexes from ``drop_indexes()`` definitions.
+    """
+    with connection.cursor() as cursor:
+        # Django's foreign keys are deferred; inside an outer transaction
+        # their pending checks would block CREATE INDEX.
+        cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+        for definition in definitions:
+            cursor.execute(definition)
+
+
+def _uuid(rng):
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
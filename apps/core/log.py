@@ -0,0 +1,144 @@
+"""
+Logging off the request path: a bounded queue handler, a background
+listener writing to the real handlers, JSON formatting and sampling.
+"""
+import json
+import logging
+import os
+import queue
+import random
+from logging.handlers import QueueHandler, QueueListener
+
+from .metrics import registry
+
+# Attributes every LogRecord has; anything else came from ``extra``.
+RECORD_ATTRIBUTES = frozenset(vars(logging.makeLogRecord({}))) | {'message', 'asctime'}
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Format records as one JSON object per line, with ``extra`` fields as
+    additional keys.
+    """
+
+    def format(self, record):
+        data = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in RECORD_ATTRIBUTES and key not in data:
+                data[key] = value
+        if record.exc_info:
+            data['exc_info'] = self.formatException(record.exc_info)
+        if record.stack_info:
+            data['stack_info'] = self.formatStack(record.stack_info)
+        return json.dumps(data, default=str)
+
+    def formatTime(self, record, datefmt=None):
+        return super().formatTime(record, '%Y-%m-%dT%H:%M:%S') + f'.{record.msecs:03.0f}'
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep ``rate`` of the records below WARNING of the loggers in ``rates``
+    (``{'apps.core.timing': 0.1}``); a rate also applies to child loggers.
+    """
+
+    def __init__(self, rates=None):
+        super().__init__()
+        self.rates = dict(rates or {})
+        self._cache = {}
+
+    def rate(self, name):
+        try:
+            return self._cache[name]
+        except KeyError:
+            pass
+        rate, logger = 1.0, name
+        while logger:
+            if logger in self.rates:
+                rate = self.rates[logger]
+                break
+            logger = logger.rpartition('.')[0]
+        self._cache[name] = rate
+        return rate
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.rate(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+
+class AsyncQueueHandler(QueueHandler):
+    """
+    Queue handler whose records are formatted and written by its
+    :class:`BackgroundListener` thread.
+
+    Records are put on the queue unformatted, so arguments of ``%``-style
+    calls must not change after logging. When the bounded queue is full,
+    ``overflow = 'drop'`` (the default) discards records below ERROR and
+    reports how many were lost once there is room again; ``'block'`` waits.
+    """
+    overflow = 'drop'
+
+    def __init__(self, queue):
+        super().__init__(queue)
+        self.dropped = 0
+        os.register_at_fork(after_in_child=self._after_fork)
+
+    def prepare(self, record):
+        return record
+
+    def enqueue(self, record):
+        if self.overflow == 'block' or record.levelno >= logging.ERROR:
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            registry.inc('log_records_dropped_total')
+            return
+        if self.dropped:
+            dropped, self.dropped = self.dropped, 0
+            try:
+                self.queue.put_nowait(logging.makeLogRecord({
+                    'name': __name__, 'levelno': logging.WARNING, 'levelname': 'WARNING',
+                    'msg': f'Dropped {dropped} log records, the log queue was full',
+                }))
+            except queue.Full:
+                self.dropped += dropped
+
+    def _after_fork(self):
+        # The parent's listener thread does not exist here, and its queue
+        # lock may have been held during the fork.
+        self.queue = queue.Queue(self.queue.maxsize)
+        listener = getattr(self, 'listener', None)
+        if listener is not None and listener._thread is not None:
+            listener.queue = self.queue
+            listener.start()
+
+    def close(self):
+        # Runs at logging.shutdown() before the target handlers are closed,
+        # so queued records are written first.
+        listener = getattr(self, 'listener', None)
+        if listener is not None and listener._thread is not None:
+            listener.stop()
+        super().close()
+
+
+class BackgroundListener(QueueListener):
+    """
+    Queue listener that starts its thread when created by ``dictConfig``.
+    """
+
+    def __init__(self, queue, *handlers, respect_handler_level=False):
+        super().__init__(queue, *handlers, respect_handler_level=respect_handler_level)
+        self.start()
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
@@ -1,18 +1,164 @@
 """
 Management command to seed database with test data.
 """
-from django.core.management.base import BaseCommand
+import argparse
+import datetime
+import time
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
 from django.contrib.auth import get_user_model
+from apps.core.generator import DataGenerator, create_indexes, drop_indexes
+from apps.core.processes import process_pool
+from apps.tasks.cache import TaskListCache
 from apps.tasks.models import Task, Comment
-from django.db import transaction
+from apps.tasks.services import ChangeLogService, CommentService
+from django.db import connection, transaction
 
 User = get_user_model()
 
+COUNT_SUFFIXES = {'k': 1_000, 'm': 1_000_000}
+
+
+def count(value):
+    """
+    Parse a row count such as ``5000``, ``100k`` or ``20M``.
+    """
+    multiplier = COUNT_SUFFIXES.get(value[-1:].lower(), 1)
+    try:
+        number = int(float(value[:-1] if multiplier > 1 else value) * multiplier)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'invalid count {value!r}')
+    if number < 0:
+        raise argparse.ArgumentTypeError(f'invalid count {value!r}')
+    return number
+
+
+def comments_per_task(value):
+    return value if value == 'zipf' else count(value)
+
+
+def write_chunk(generator, table, start, stop):
+    """
+    Generate and write one chunk; returns the number of rows written.
+    """
+    if table == 'users':
+        rows = generator.user_rows(start, stop)
+        generator.write_users(rows)
+        return len(rows)
+    tasks, comments = generator.task_rows(start, stop)
+    generator.write_tasks(tasks, comments)
+    return len(tasks) + len(comments)
+
 
 class Command(BaseCommand):
-    help = 'Seed database with test data (users, tasks, comments)'
+    help = (
+        'Seed database with test data (users, tasks, comments), or generate a '
+        'large synthetic dataset with --users/--tasks'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=count, default=0,
+                            help='Generate this many users, e.g. 100k')
+        parser.add_argument('--tasks', type=count, default=0,
+                            help='Generate this many tasks, e.g. 20M')
+        parser.add_argument('--comments-per-task', type=comments_per_task, default='zipf',
+                            help='Comments per generated task: a number or zipf (default)')
+        parser.add_argument('--seed', type=int, default=0,
+                            help='Random seed of generated data (default: 0)')
+        parser.add_argument('--days', type=int, default=730,
+                            help='Days of history covered by generated data (default: 730)')
+        parser.add_argument('--end-date', type=datetime.date.fromisoformat,
+                            help='Last day of generated history (default: today); '
+                                 'fix it to reproduce a dataset exactly')
+        parser.add_argument('--batch-size', type=count, default=10000,
+                            help='Rows generated and copied per transaction (default: 10000)')
+        parser.add_argument('--workers', type=int, default=1,
+                            help='Worker processes writing chunks in parallel (default: 1)')
+        parser.add_argument('--drop-indexes', action='store_true',
+                            help='Drop secondary indexes during the load and rebuild them after')
+        parser.add_argument('--password',
+                            help='Password of all generated users (default: unusable)')
 
-    def handle(self, *args, **kwargs):
+    def handle(self, *args, **options):
+        if options['users'] or options['tasks']:
+            self.generate(options)
+        else:
+            self.seed_examples()
+
+    def generate(self, options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be a positive integer.')
+        if options['workers'] < 1:
+            raise CommandError('--workers must be a positive integer.')
+        if options['days'] < 1:
+            raise CommandError('--days must be a positive integer.')
+        if options['tasks'] and not options['users']:
+            raise CommandError('--tasks needs --users to pick creators and assignees from.')
+
+        user_base, task_base = DataGenerator.next_ids()
+        generator = DataGenerator(
+            options['users'], options['tasks'], options['comments_per_task'],
+            seed=options['seed'], days=options['days'], password=options['password'],
+            end=options['end_date'] and datetime.datetime.combine(
+                options['end_date'], datetime.time(), datetime.UTC
+            ),
+            user_base=user_base, task_base=task_base,
+        )
+        batch_size = options['batch_size']
+        started = time.monotonic()
+        tables = [User._meta.db_table, Task._meta.db_table, Comment._meta.db_table]
+        indexes = drop_indexes(tables) if options['drop_indexes'] else []
+        try:
+            # Tasks reference users, so all user chunks are written first.
+            self.write_chunks(generator, 'users', options['users'], batch_size, options['workers'])
+            written = self.write_chunks(generator, 'tasks', options['tasks'], batch_size,
+                                        options['workers'])
+        finally:
+            if indexes:
+                self.stdout.write(f'Rebuilding {len(indexes)} indexes...')
+                create_indexes(indexes)
+        DataGenerator.reset_sequences()
+        with connection.cursor() as cursor:
+            cursor.execute(f'ANALYZE {", ".join(tables)}')
+        TaskListCache.invalidate()
+        # COPY bypasses TaskService, which maintains the statistics.
+        call_command('rebuild_task_stats', stdout=self.stdout)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Generated {options["users"]} users, {options["tasks"]} tasks and '
+            f'{written - options["tasks"]} comments in {time.monotonic() - started:.1f}s'
+        ))
+
+    def write_chunks(self, generator, table, total, batch_size, workers):
+        """
+        Write ``total`` generated rows of ``table`` in chunks of ``batch_size``
+        and return the number of rows written, comments included.
+        """
+        chunks = [(start, min(start + batch_size, total)) for start in range(0, total, batch_size)]
+        if not chunks:
+            return 0
+        if workers == 1:
+            results = (write_chunk(generator, table, start, stop) for start, stop in chunks)
+        else:
+            pool = process_pool(workers)
+            results = pool.map(
+                write_chunk, *zip(*[(generator, table, start, stop) for start, stop in chunks])
+            )
+        started = time.monotonic()
+        written = 0
+        try:
+            for written_chunk in results:
+                written += written_chunk
+                self.stdout.write(
+                    f'{table}: {written} rows ({written / (time.monotonic() - started):.0f} rows/s)'
+                )
+        finally:
+            if workers > 1:
+                pool.shutdown(cancel_futures=True)
+        return written
+
+    def seed_examples(self):
         self.stdout.write(self.style.SUCCESS('Starting database seeding...'))
         self.stdout.write('')
 
@@ -156,6 +302,7 @@ class Command(BaseCommand):
             tasks = []
             for task_data in tasks_data:
                 task = Task.objects.create(**task_data)
+                ChangeLogService.record([(task, False)])
                 tasks.append(task)
 
                 status_icon = '✓' if task.is_completed else '○'
@@ -215,13 +362,18 @@ class Command(BaseCommand):
             ]
 
             for comment_data in comments_data:
-                comment = Comment.objects.create(**comment_data)
+                comment = CommentService.create_comment(
+                    {'text': comment_data['text']},
+                    author=comment_data['author'],
+                    task=comment_data['task'],
+                )
                 self.stdout.write(
                     f"  ✓ Task: {comment.task.title[:30]:30} "
                     f"Author: {comment.author.username:12} "
                     f"Comment: {comment.text[:40]}..."
                 )
 
+        call_command('rebuild_task_stats', stdout=self.stdout)
         self.stdout.write('')
         self.stdout.write(self.style.SUCCESS('=' * 60))
         self.stdout.write(self.style.SUCCESS('Database seeding completed successfully!'))
@@ -0,0 +1,250 @@
+"""
+In-process request and business metrics, aggregated across worker
+processes and rendered in the Prometheus text format.
+"""
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds in seconds; +Inf is implied.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+METRICS = {
+    'http_request_duration_seconds': ('histogram', 'Request latency by view, method and status.'),
+    'db_queries_total': ('counter', 'SQL queries run by requests, by view.'),
+    'db_query_duration_seconds_total': ('counter', 'Time spent in SQL by requests, by view.'),
+    'tasks_created_total': ('counter', 'Tasks created through TaskService.'),
+    'comments_created_total': ('counter', 'Comments created through CommentService.'),
+    'log_records_dropped_total': ('counter', 'Log records dropped because the log queue was full.'),
+    'task_list_cache_hits_total': ('counter', 'Task list pages served from the response cache.'),
+    'task_list_cache_misses_total': ('counter', 'Task list pages not found in the response cache.'),
+    'auth_user_cache_hits_total': ('counter', 'Authenticated users found in UserCache, by level.'),
+    'auth_user_cache_misses_total': ('counter', 'Authenticated users loaded from the database.'),
+}
+
+
+class MetricsRegistry:
+    """
+    Counters and histograms of this process.
+
+    Recording only updates dictionaries under a lock. With ``METRICS_DIR``
+    set, a daemon thread writes them to ``<METRICS_DIR>/<pid>.json`` every
+    ``METRICS_FLUSH_INTERVAL`` seconds, and :meth:`collect` adds up the
+    files of all processes. Files of exited workers are kept, so counters
+    never go backwards; empty the directory before the server starts.
+    """
+
+    def __init__(self):
+        self._reset()
+        # Forked workers start empty and need their own flush thread.
+        os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        self._lock = threading.Lock()
+        self._flushing = False
+        self._counters = {}
+        self._histograms = {}
+
+    def _start_flushing(self):
+        self._flushing = True
+        if settings.METRICS_DIR:
+            threading.Thread(target=self._flush_loop, daemon=True, name='metrics-flush').start()
+
+    def inc(self, name, labels=(), amount=1):
+        """
+        Add ``amount`` to counter ``name``.
+
+        Args:
+            name: Metric name from METRICS
+            labels: Tuple of (label, value) pairs
+            amount: Increment
+        """
+        key = (name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def value(self, name, labels=()):
+        """
+        Return the value of counter ``name`` in this process.
+        """
+        with self._lock:
+            return self._counters.get((name, labels), 0)
+
+    def record(self, name, labels, value, counters):
+        """
+        Record ``value`` in histogram ``name`` and add ``counters``, a
+        sequence of ``(name, labels, amount)``, under one lock.
+
+        Args:
+            name: Histogram name from METRICS
+            labels: Tuple of (label, value) pairs
+            value: Observed value in seconds
+            counters: Counter increments
+        """
+        if not self._flushing:
+            self._start_flushing()
+        key = (name, labels)
+        bucket = bisect_left(LATENCY_BUCKETS, value)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = [[0] * (len(LATENCY_BUCKETS) + 1), 0.0]
+            histogram[0][bucket] += 1
+            histogram[1] += value
+            for counter in counters:
+                key = counter[:2]
+                self._counters[key] = self._counters.get(key, 0) + counter[2]
+
+    def snapshot(self):
+        """
+        Return this process's metrics as a JSON-serializable dict.
+        """
+        with self._lock:
+            return {
+                'counters': [[name, list(labels), value]
+                             for (name, labels), value in self._counters.items()],
+                'histograms': [[name, list(labels), list(buckets), total]
+                               for (name, labels), (buckets, total) in self._histograms.items()],
+            }
+
+    def flush(self):
+        """
+        Write this process's metrics to its file in ``METRICS_DIR``.
+        """
+        if not settings.METRICS_DIR:
+            return
+        directory = Path(settings.METRICS_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f'{os.getpid()}.json'
+        tmp = path.with_suffix('.tmp')
+        tmp.write_text(json.dumps(self.snapshot()))
+        os.replace(tmp, path)
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(settings.METRICS_FLUSH_INTERVAL)
+            try:
+                self.flush()
+            except OSError as exc:
+                logger.warning('Could not write metrics to %s: %s', settings.METRICS_DIR, exc)
+
+    def collect(self):
+        """
+        Return the metrics of all processes added up, as
+        ``(counters, histograms)`` dicts keyed by ``(name, labels)``.
+        """
+        snapshots = [self.snapshot()]
+        if settings.METRICS_DIR:
+            own = f'{os.getpid()}.json'
+            for path in Path(settings.METRICS_DIR).glob('*.json'):
+                if path.name == own:
+                    continue
+                try:
+                    snapshots.append(json.loads(path.read_text()))
+                except (OSError, ValueError):
+                    # Removed or replaced while reading.
+                    continue
+
+        counters, histograms = {}, {}
+        for snapshot in snapshots:
+            for name, labels, value in snapshot['counters']:
+                key = (name, tuple(map(tuple, labels)))
+                counters[key] = counters.get(key, 0) + value
+            for name, labels, buckets, total in snapshot['histograms']:
+                key = (name, tuple(map(tuple, labels)))
+                merged = histograms.setdefault(key, [[0] * len(buckets), 0.0])
+                merged[0] = [a + b for a, b in zip(merged[0], buckets)]
+                merged[1] += total
+        return counters, histograms
+
+    def render(self):
+        """
+        Return all metrics in the Prometheus text exposition format.
+        """
+        counters, histograms = self.collect()
+        lines = []
+        for name, (kind, description) in METRICS.items():
+            lines += [f'# HELP {name} {description}', f'# TYPE {name} {kind}']
+            if kind == 'counter':
+                for (metric, labels), value in sorted(counters.items()):
+                    if metric == name:
+                        lines.append(f'{name}{format_labels(labels)} {format_value(value)}')
+                continue
+            for (metric, labels), (buckets, total) in sorted(histograms.items()):
+                if metric != name:
+                    continue
+                cumulative = 0
+                for bound, count in zip((*LATENCY_BUCKETS, '+Inf'), buckets):
+                    cumulative += count
+                    lines.append(
+                        f'{name}_bucket{format_labels((*labels, ("le", str(bound))))} {cumulative}'
+                    )
+                lines.append(f'{name}_sum{format_labels(labels)} {format_value(total)}')
+                lines.append(f'{name}_count{format_labels(labels)} {cumulative}')
+        return '\n'.join(lines) + '\n'
+
+
+def format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(
+        f'{label}="{escape(value)}"' for label, value in labels
+    ) + '}'
+
+
+def escape(value):
+    return str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+def format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def view_name(request):
+    """
+    Return ``ViewClass.action`` of the view that served ``request``, e.g.
+    ``TaskViewSet.list``, or ``unmatched`` for unresolved paths.
+    """
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unmatched'
+    view = getattr(match.func, 'cls', None) or getattr(match.func, 'view_class', None)
+    if view is None:
+        return match.view_name or match.func.__name__
+    actions = getattr(match.func, 'actions', None) or {}
+    method = request.method.lower()
+    return f'{view.__name__}.{actions.get(method, method)}'
+
+
+registry = MetricsRegistry()
+atexit.register(registry.flush)
+
+
+def record_request(request, response, seconds, queries, sql_seconds):
+    """
+    Record latency and SQL use of one request.
+
+    Args:
+        request: HttpRequest
+        response: HttpResponse
+        seconds: Total request time
+        queries: Number of SQL queries
+        sql_seconds: Time spent in SQL
+    """
+    view = view_name(request)
+    counters = ()
+    if queries:
+        counters = (('db_queries_total', (('view', view),), queries),
+                    ('db_query_duration_seconds_total', (('view', view),), sql_seconds))
+    registry.record('http_request_duration_seconds', (
+        ('view', view), ('method', request.method), ('status', str(response.status_code)),
+    ), seconds, counters)
@@ -0,0 +1,505 @@
+"""
+Pagination classes shared by the API viewsets.
+"""
+import base64
+import binascii
+import contextlib
+import datetime
+import json
+import operator
+from functools import reduce
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.filters import OrderingFilter
+from rest_framework.pagination import (
+    BasePagination,
+    LimitOffsetPagination,
+    _positive_int,
+)
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class CursorJSONEncoder(DjangoJSONEncoder):
+    """
+    JSON encoder for cursor positions.
+    Keeps full microsecond precision, which DjangoJSONEncoder truncates.
+    """
+
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination.
+
+    Pages are addressed by an opaque cursor holding the ordering key of the
+    row at the page boundary, so every page is fetched with an index range
+    scan of ``limit + 1`` rows no matter how deep it is. The key is the
+    requested ordering with ``id`` appended as a tie-breaker, which keeps the
+    order total and pages stable while rows are being inserted.
+
+    Ordering fields must be non-nullable.
+    """
+    cursor_query_param = 'cursor'
+    cursor_query_description = 'Opaque keyset cursor; pass it empty for the first page.'
+    limit_query_param = 'limit'
+    limit_query_description = 'Number of results to return per page.'
+    default_limit = api_settings.PAGE_SIZE
+    max_limit = None
+    tiebreaker = 'id'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request, view)
+        return self.set_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request, view)
+        return self.set_page([row async for row in queryset])
+
+    def get_page_queryset(self, queryset, request, view):
+        """
+        Return the seek query of the requested page, with one extra row.
+        """
+        self.request = request
+        self.limit = self.get_limit(request)
+        self.ordering = self.get_ordering(request, queryset, view)
+        position, self.reverse = self.decode_cursor(request, queryset)
+        self.has_cursor = position is not None
+
+        order_by = self.ordering
+        if self.reverse:
+            order_by = [_invert(field) for field in order_by]
+        queryset = queryset.order_by(*order_by)
+        if position is not None:
+            queryset = queryset.filter(self.get_seek_filter(position))
+        return queryset[:self.limit + 1]
+
+    def set_page(self, results):
+        self.has_more = len(results) > self.limit
+        results = results[:self.limit]
+        if self.reverse:
+            results.reverse()
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {
+                    'type': 'string',
+                    'nullable': True,
+                    'format': 'uri',
+                    'example': f'http://api.example.org/accounts/?{self.cursor_query_param}=cD00ODY%3D',
+                },
+                'previous': {
+                    'type': 'string',
+                    'nullable': True,
+                    'format': 'uri',
+                    'example': f'http://api.example.org/accounts/?{self.cursor_query_param}=cj0xJnA9NDg3',
+                },
+                'results': schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': self.cursor_query_description,
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.limit_query_param,
+                'required': False,
+                'in': 'query',
+                'description': self.limit_query_description,
+                'schema': {'type': 'integer'},
+            },
+        ]
+
+    def get_limit(self, request):
+        with contextlib.suppress(KeyError, ValueError):
+            return _positive_int(
+                request.query_params[self.limit_query_param],
+                strict=True,
+                cutoff=self.max_limit,
+            )
+        return self.default_limit
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Return the keyset ordering: the ordering resolved by the view's
+        OrderingFilter (or the queryset/model default) plus the tie-breaker.
+        """
+        ordering = None
+        for backend in getattr(view, 'filter_backends', []):
+            if issubclass(backend, OrderingFilter):
+                ordering = backend().get_ordering(request, queryset, view)
+                break
+        if not ordering:
+            ordering = queryset.query.order_by or queryset.model._meta.ordering
+
+        ordering = [
+            field for field in ordering
+            if field.lstrip('-') not in ('pk', self.tiebreaker)
+        ]
+        descending = bool(ordering) and ordering[-1].startswith('-')
+        tiebreaker = f'-{self.tiebreaker}' if descending else self.tiebreaker
+        return ordering + [tiebreaker]
+
+    def get_seek_filter(self, position):
+        """
+        Build the predicate selecting rows strictly after ``position``.
+
+        The row comparison is expanded into ``a > x OR (a = x AND b > y) ...``
+        so that mixed sort directions work, and a redundant bound on the
+        leading column lets Postgres start an index range scan.
+        """
+        clauses = []
+        equal = Q()
+        for field, value in zip(self.ordering, position):
+            name = field.lstrip('-')
+            lookup = 'lt' if self._is_descending(field) else 'gt'
+            clauses.append(equal & Q(**{f'{name}__{lookup}': value}))
+            equal &= Q(**{name: value})
+
+        leading = self.ordering[0]
+        bound = 'lte' if self._is_descending(leading) else 'gte'
+        return Q(**{f'{leading.lstrip("-")}__{bound}': position[0]}) & reduce(
+            operator.or_, clauses
+        )
+
+    def get_next_link(self):
+        if not self.page:
+            return None
+        if self.reverse or self.has_more:
+            return self.encode_cursor(self.page[-1], reverse=False)
+        return None
+
+    def get_previous_link(self):
+        if not self.page:
+            return None
+        if self.reverse and not self.has_more:
+            return None
+        if not self.reverse and not self.has_cursor:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def encode_cursor(self, row, reverse):
+        payload = {
+            'o': self.ordering,
+            'p': [_get_value(row, field.lstrip('-')) for field in self.ordering],
+            'r': reverse,
+        }
+        token = base64.urlsafe_b64encode(
+            json.dumps(payload, cls=CursorJSONEncoder).encode('utf-8')
+        ).decode('ascii')
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        return replace_query_param(url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request, queryset):
+        """
+        Return ``(position, reverse)`` for the request cursor, or
+        ``(None, False)`` for the first page.
+        """
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token.encode('ascii')))
+            position, reverse = payload['p'], bool(payload['r'])
+            if payload['o'] != self.ordering or len(position) != len(self.ordering):
+                raise ValueError
+            position = [
+                _to_python(queryset, field.lstrip('-'), value)
+                for field, value in zip(self.ordering, position)
+            ]
+        except (TypeError, KeyError, ValueError, ValidationError,
+                binascii.Error, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def _is_descending(self, field):
+        return field.startswith('-') != self.reverse
+
+
+class CountStrategyLimitOffsetPagination(LimitOffsetPagination):
+    """
+    Limit/offset pagination with a configurable total count strategy.
+
+    Strategies (``PAGINATION_COUNT_STRATEGY`` setting):
+
+    - ``exact``: always run ``COUNT(*)``.
+    - ``auto``: count exactly up to ``PAGINATION_EXACT_COUNT_THRESHOLD`` rows
+      (the count query is capped by ``LIMIT``) and use the planner estimate
+      above it.
+    - ``estimate``: always use the planner estimate.
+    - ``none``: do not count; ``count`` is null.
+
+    Clients may downgrade the strategy of a request with ``?count=estimate``
+    or ``?count=none``. ``count_type`` in the response tells whether the
+    count is ``exact``, ``estimated`` or ``none``. The next link is derived
+    from fetching one extra row, so it is correct with any strategy.
+    """
+    count_query_param = 'count'
+    count_query_description = 'Count strategy for this request: "estimate" or "none".'
+    client_count_strategies = ('estimate', 'none')
+    count_strategy = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+
+        self.offset = self.get_offset(request)
+        results = self.set_page(list(queryset[self.offset:self.offset + self.limit + 1]))
+        self.set_count(*self.get_count_with_type(queryset, results))
+        return results
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+
+        self.offset = self.get_offset(request)
+        results = self.set_page(
+            [row async for row in queryset[self.offset:self.offset + self.limit + 1]]
+        )
+        self.set_count(*await self.aget_count_with_type(queryset, results))
+        return results
+
+    def set_page(self, results):
+        self.has_next = len(results) > self.limit
+        return results[:self.limit]
+
+    def set_count(self, count, count_type):
+        self.count, self.count_type = count, count_type
+        if (self.count is not None and self.count > self.limit
+                and self.template is not None):
+            self.display_page_controls = True
+
+    def get_paginated_response(self, data):
+        return Response({
+            'count': self.count,
+            'count_type': self.count_type,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema['properties']['count']['nullable'] = True
+        response_schema['properties']['count_type'] = {
+            'type': 'string',
+            'enum': ['exact', 'estimated', 'none'],
+        }
+        return response_schema
+
+    def get_schema_operation_parameters(self, view):
+        return super().get_schema_operation_parameters(view) + [
+            {
+                'name': self.count_query_param,
+                'required': False,
+                'in': 'query',
+                'description': self.count_query_description,
+                'schema': {'type': 'string', 'enum': list(self.client_count_strategies)},
+            },
+        ]
+
+    def get_count_strategy(self, request):
+        strategy = request.query_params.get(self.count_query_param)
+        if strategy in self.client_count_strategies:
+            return strategy
+        return self.count_strategy or settings.PAGINATION_COUNT_STRATEGY
+
+    def get_count_with_type(self, queryset, results):
+        """
+        Return ``(count, count_type)`` for the paginated queryset.
+        """
+        if not self.has_next and (results or not self.offset):
+            # The last page is in hand, so the total is known for free.
+            return self.offset + len(results), 'exact'
+
+        strategy = self.get_count_strategy(self.request)
+        if strategy == 'none':
+            return None, 'none'
+        if strategy == 'exact':
+            return self.get_count(queryset), 'exact'
+
+        queryset = queryset.order_by()
+        if strategy == 'auto':
+            threshold = settings.PAGINATION_EXACT_COUNT_THRESHOLD
+            count = queryset[:threshold + 1].count()
+            if count <= threshold:
+                return count, 'exact'
+            return max(estimate_count(queryset), threshold + 1), 'estimated'
+        return estimate_count(queryset), 'estimated'
+
+    async def aget_count_with_type(self, queryset, results):
+        """
+        Async variant of :meth:`get_count_with_type`.
+        """
+        if not self.has_next and (results or not self.offset):
+            return self.offset + len(results), 'exact'
+
+        strategy = self.get_count_strategy(self.request)
+        if strategy == 'none':
+            return None, 'none'
+        if strategy == 'exact':
+            return await queryset.acount(), 'exact'
+
+        queryset = queryset.order_by()
+        if strategy == 'auto':
+            threshold = settings.PAGINATION_EXACT_COUNT_THRESHOLD
+            count = await queryset[:threshold + 1].acount()
+            if count <= threshold:
+                return count, 'exact'
+            return max(await aestimate_count(queryset), threshold + 1), 'estimated'
+        return await aestimate_count(queryset), 'estimated'
+
+    def get_etag_parts(self):
+        """
+        Return the page state that list ETags must cover besides its rows.
+        """
+        return self.count, self.count_type, self.has_next
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        return replace_query_param(url, self.offset_query_param, self.offset + self.limit)
+
+
+class LimitOffsetKeysetPagination(CountStrategyLimitOffsetPagination):
+    """
+    Limit/offset pagination with an opt-in keyset mode.
+
+    Requests carrying a ``cursor`` parameter (empty for the first page) are
+    paginated by :class:`KeysetPagination`; all other requests keep the
+    limit/offset behaviour and response shape.
+    """
+    keyset_class = KeysetPagination
+    keyset = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.keyset_class.cursor_query_param in request.query_params:
+            self.keyset = self.keyset_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        if self.keyset_class.cursor_query_param in request.query_params:
+            self.keyset = self.keyset_class()
+            return await self.keyset.apaginate_queryset(queryset, request, view)
+        return await super().apaginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_etag_parts(self):
+        if self.keyset is not None:
+            return (self.keyset.has_more,)
+        return super().get_etag_parts()
+
+    def get_schema_operation_parameters(self, view):
+        parameters = super().get_schema_operation_parameters(view)
+        return parameters + [
+            parameter
+            for parameter in self.keyset_class().get_schema_operation_parameters(view)
+            if parameter['name'] != self.limit_query_param
+        ]
+
+
+def estimate_count(queryset):
+    """
+    Return the Postgres planner's row estimate for ``queryset``.
+
+    Unfiltered querysets use ``pg_class.reltuples`` of the table; filtered
+    ones use the top-level ``Plan Rows`` of ``EXPLAIN (FORMAT JSON)``.
+    """
+    connection = connections[queryset.db]
+    with connection.cursor() as cursor:
+        if not queryset.query.where:
+            cursor.execute(
+                'SELECT reltuples FROM pg_class WHERE oid = %s::regclass',
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+            # reltuples is -1 until the table is first vacuumed or analyzed.
+            if row is not None and row[0] >= 0:
+                return int(row[0])
+
+        sql, params = queryset.query.sql_with_params()
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+aestimate_count = sync_to_async(estimate_count)
+
+
+def _invert(field):
+    return field[1:] if field.startswith('-') else f'-{field}'
+
+
+def _get_value(row, path):
+    """
+    Read ``path`` (``__``-separated) from a model instance or a values() dict.
+    """
+    if isinstance(row, dict):
+        return row[path]
+    return reduce(getattr, path.split('__'), row)
+
+
+def _to_python(queryset, path, value):
+    """
+    Coerce a decoded cursor value with the model field or annotation it
+    belongs to, so the seek filter compares values of the column's type.
+    """
+    annotation = queryset.query.annotations.get(path)
+    if annotation is not None:
+        return annotation.output_field.to_python(value)
+    opts = queryset.model._meta
+    field = None
+    for name in path.split('__'):
+        try:
+            field = opts.get_field(name)
+        except FieldDoesNotExist:
+            raise ValueError(f"Cannot order a cursor by {path!r}.")
+        if field.is_relation and field.related_model is not None:
+            opts = field.related_model._meta
+    if field.is_relation:
+        field = field.target_field
+    return field.to_python(value)
@@ -0,0 +1,31 @@
+"""
+Helpers for management commands that spread work over worker processes.
+"""
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+
+def process_pool(workers):
+    """
+    Return a ProcessPoolExecutor whose workers use the current database.
+
+    Workers are spawned rather than forked (forking a process with threads
+    can deadlock) and set up Django themselves; the database name is passed
+    on so workers started from tests write to the test database.
+    """
+    from django.db import connection
+
+    return ProcessPoolExecutor(
+        workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_setup_worker,
+        initargs=(connection.settings_dict['NAME'],),
+    )
+
+
+def _setup_worker(database_name):
+    # Runs before any task is unpickled, so this module imports no models.
+    import django
+    django.setup()
+    from django.db import connection
+    connection.settings_dict['NAME'] = database_name
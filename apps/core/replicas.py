@@ -0,0 +1,193 @@
+"""
+Read replica routing: API reads go to a healthy replica, writes and the
+reads of recent writers go to the primary.
+"""
+import logging
+import random
+import threading
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from rest_framework.permissions import SAFE_METHODS
+
+logger = logging.getLogger(__name__)
+
+_replica = ContextVar('read_replica', default=None)
+
+LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+"""
+
+
+def current_replica():
+    """
+    Return the replica alias serving reads of the current request, or None.
+    """
+    return _replica.get()
+
+
+class ReplicaRouter:
+    """
+    Database router sending reads to the replica chosen for the current
+    request by :class:`ReplicaReadMixin`, and everything else to the
+    primary.
+
+    Reads inside a transaction on the primary stay there, so they see the
+    transaction's writes.
+    """
+
+    def db_for_read(self, model, **hints):
+        alias = _replica.get()
+        if alias is not None and not connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return alias
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        # Explicit, or instances read from a replica would be saved there.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
+
+
+class ReplicaHealth:
+    """
+    Per-process health of the replicas.
+
+    A replica is usable when it answers and its replay lag is at most
+    ``REPLICA_MAX_LAG_SECONDS``. Each replica is checked at most every
+    ``REPLICA_CHECK_INTERVAL`` seconds, by the first request that needs it;
+    other requests use the last result meanwhile.
+    """
+    _lock = threading.Lock()
+    _state = {}
+
+    @classmethod
+    def usable(cls):
+        """
+        Return the aliases of the usable replicas.
+        """
+        now = time.monotonic()
+        usable = []
+        for alias in settings.DATABASE_REPLICAS:
+            checked_at, ok = cls._state.get(alias, (None, False))
+            if (checked_at is None or now - checked_at >= settings.REPLICA_CHECK_INTERVAL) \
+                    and cls._lock.acquire(blocking=checked_at is None):
+                try:
+                    ok = cls.check(alias)
+                    cls._state[alias] = (time.monotonic(), ok)
+                finally:
+                    cls._lock.release()
+            if ok:
+                usable.append(alias)
+        return usable
+
+    @staticmethod
+    def check(alias):
+        """
+        Check one replica.
+
+        Args:
+            alias: Database alias of the replica
+
+        Returns:
+            True if the replica answers within the allowed lag
+        """
+        try:
+            with connections[alias].cursor() as cursor:
+                cursor.execute(LAG_SQL)
+                lag = float(cursor.fetchone()[0])
+        except DatabaseError as exc:
+            connections[alias].close()
+            logger.warning("Replica %s is unavailable: %s", alias, exc)
+            return False
+        if lag > settings.REPLICA_MAX_LAG_SECONDS:
+            logger.warning("Replica %s is %.1fs behind, reading from the primary", alias, lag)
+            return False
+        return True
+
+    @classmethod
+    def reset(cls):
+        with cls._lock:
+            cls._state.clear()
+
+
+class PrimaryPin:
+    """
+    Users who wrote recently, pinned to the primary for
+    ``REPLICA_PIN_SECONDS`` so their reads include their own writes.
+
+    Pins live in the default cache, which must be shared between worker
+    processes for pins to hold across them.
+    """
+    key_prefix = 'db:primary_pin'
+
+    @classmethod
+    def pin(cls, user):
+        cache.set(f'{cls.key_prefix}:{user.pk}', True, timeout=settings.REPLICA_PIN_SECONDS)
+
+    @classmethod
+    def is_pinned(cls, user):
+        return cache.get(f'{cls.key_prefix}:{user.pk}') is not None
+
+
+class ReplicaReadMixin:
+    """
+    View mixin reading safe requests from a replica.
+
+    A replica is chosen once per request, so its queries do not mix
+    replicas with different lag. Successful unsafe requests pin the user
+    to the primary. With no replicas configured, nothing changes.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        _replica.set(None)
+        super().initial(request, *args, **kwargs)
+        _replica.set(self.choose_replica(request))
+
+    async def ainitial(self, request, *args, **kwargs):
+        """
+        Async counterpart of ``initial()``, used by ``AsyncViewSetMixin``.
+
+        The pin lookup and replica health check run in a thread, since they
+        use the cache and database connections, which would block the event
+        loop.
+        """
+        _replica.set(None)
+        super().initial(request, *args, **kwargs)
+        _replica.set(await sync_to_async(self.choose_replica)(request))
+
+    def choose_replica(self, request):
+        """
+        Return the alias of the replica serving ``request``, or None to
+        read from the primary.
+        """
+        if (settings.DATABASE_REPLICAS and request.method in SAFE_METHODS
+                and not (request.user.is_authenticated and PrimaryPin.is_pinned(request.user))):
+            replicas = ReplicaHealth.usable()
+            if replicas:
+                return random.choice(replicas)
+        return None
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        # initial() may have run in a sync_to_async thread whose context
+        # was copied back, so the variable is cleared rather than reset.
+        _replica.set(None)
+        if (settings.DATABASE_REPLICAS and request.method not in SAFE_METHODS
+                and response.status_code < 400 and request.user.is_authenticated):
+            PrimaryPin.pin(request.user)
+        return super().finalize_response(request, response, *args, **kwargs)
@@ -0,0 +1,26 @@
+"""
+Helpers for fast read-only serialization of ``values()`` rows.
+
+Row serializers format plain dicts instead of model instances and skip
+DRF's per-field machinery, while producing the same output as the
+corresponding ModelSerializer.
+"""
+from rest_framework import serializers
+
+# A single unbound DRF field keeps datetime output identical to
+# ModelSerializer (timezone conversion, DATETIME_FORMAT, trailing 'Z').
+_datetime_field = serializers.DateTimeField()
+
+
+def format_datetime(value):
+    """
+    Format a datetime exactly like ``serializers.DateTimeField``.
+    """
+    return _datetime_field.to_representation(value)
+
+
+def format_uuid(value):
+    """
+    Format a UUID exactly like ``serializers.UUIDField``.
+    """
+    return None if value is None else str(value)
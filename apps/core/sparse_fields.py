@@ -0,0 +1,185 @@
+"""
+Sparse fieldsets: ``?fields=`` / ``?exclude=`` selection of response fields.
+
+Both parameters take comma-separated field names; nested serializer
+fields are addressed with a dot (``assignee.uuid``). The selection trims
+serializer output and is used to prune the database query as well.
+"""
+from functools import cache
+
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+
+class SparseFieldset:
+    """
+    Selected fields of one serializer.
+
+    ``available`` maps every readable field name to ``None`` for plain
+    fields or to the list of subfield names for nested serializers.
+    """
+    fields_param = 'fields'
+    exclude_param = 'exclude'
+
+    def __init__(self, available, fields=None, exclude=()):
+        # Maps selected names to None (whole field) or a subfield list.
+        selected = {}
+        for name in fields if fields is not None else available:
+            base, _, sub = name.partition('.')
+            if not sub:
+                selected[base] = None
+            elif selected.get(base, []) is not None:
+                selected.setdefault(base, []).append(sub)
+        for name in exclude:
+            base, _, sub = name.partition('.')
+            if base not in selected:
+                continue
+            if not sub:
+                del selected[base]
+                continue
+            if selected[base] is None:
+                selected[base] = list(available[base])
+            selected[base] = [field for field in selected[base] if field != sub]
+
+        self.fields = [name for name in available if name in selected]
+        self._subfields = {}
+        for name in self.fields:
+            if available[name] is not None:
+                chosen = selected[name]
+                self._subfields[name] = [
+                    field for field in available[name] if chosen is None or field in chosen
+                ]
+
+    @classmethod
+    def from_request(cls, request, serializer_class):
+        """
+        Parse the selection for ``serializer_class`` from query parameters.
+
+        Returns:
+            SparseFieldset instance, or None when no selection was requested
+
+        Raises:
+            ValidationError: If a parameter names an unknown field
+        """
+        fields = _split(request.query_params.get(cls.fields_param))
+        exclude = _split(request.query_params.get(cls.exclude_param))
+        if fields is None and exclude is None:
+            return None
+
+        available = get_available_fields(serializer_class)
+        errors = {}
+        for param, names in ((cls.fields_param, fields), (cls.exclude_param, exclude)):
+            unknown = [name for name in names or () if not _is_available(name, available)]
+            if unknown:
+                errors[param] = [f"Unknown field(s): {', '.join(unknown)}."]
+        if errors:
+            raise serializers.ValidationError(errors)
+        return cls(available, fields, exclude or ())
+
+    def subfields(self, name):
+        """
+        Return the selected subfields of nested field ``name``.
+        """
+        return self._subfields[name]
+
+    def prune_queryset(self, queryset, always=()):
+        """
+        Restrict ``queryset`` to the columns and joins the selection needs.
+
+        Nested fields become ``select_related`` joins loading only their
+        selected columns; relations that are not selected are not joined.
+        ``always`` lists columns loaded regardless of the selection.
+        """
+        columns = ['id', *always]
+        relations = []
+        for name in self.fields:
+            columns.append(name)
+            if name in self._subfields:
+                relations.append(name)
+                columns.extend(f'{name}__{field}' for field in ['id', *self._subfields[name]])
+        queryset = queryset.select_related(None)
+        if relations:
+            # select_related() without arguments would follow every relation.
+            queryset = queryset.select_related(*relations)
+        return queryset.only(*columns)
+
+
+class SparseFieldsetMixin:
+    """
+    Serializer mixin dropping fields not selected by ``context['fieldset']``.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fieldset = self.context.get('fieldset')
+        if fieldset is None:
+            return
+        for name, field in list(self.fields.items()):
+            if field.write_only:
+                continue
+            if name not in fieldset.fields:
+                del self.fields[name]
+            elif isinstance(field, serializers.BaseSerializer):
+                subfields = fieldset.subfields(name)
+                for sub in list(field.fields):
+                    if sub not in subfields:
+                        del field.fields[sub]
+
+
+class SparseFieldsetViewMixin:
+    """
+    ViewSet mixin resolving the sparse fieldset of safe requests.
+
+    The fieldset is passed to serializers through their context, so
+    serializers using SparseFieldsetMixin trim themselves.
+    """
+
+    def get_fieldset(self):
+        """
+        Return the request's SparseFieldset, or None for full output.
+        Only safe requests are trimmed; writes always validate every field.
+        """
+        if not hasattr(self, '_fieldset'):
+            self._fieldset = None
+            if self.request.method in SAFE_METHODS:
+                self._fieldset = SparseFieldset.from_request(
+                    self.request, self.get_serializer_class()
+                )
+        return self._fieldset
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['fieldset'] = self.get_fieldset()
+        return context
+
+
+@cache
+def get_available_fields(serializer_class):
+    """
+    Return the readable fields of ``serializer_class`` for SparseFieldset.
+    The result is cached per class and must not be modified.
+    """
+    available = {}
+    for name, field in serializer_class().fields.items():
+        if field.write_only:
+            continue
+        if isinstance(field, serializers.BaseSerializer):
+            available[name] = [
+                sub for sub, subfield in field.fields.items() if not subfield.write_only
+            ]
+        else:
+            available[name] = None
+    return available
+
+
+def _split(value):
+    if value is None:
+        return None
+    return [name.strip() for name in value.split(',') if name.strip()]
+
+
+def _is_available(name, available):
+    base, _, sub = name.partition('.')
+    if base not in available:
+        return False
+    return not sub or (available[base] is not None and sub in available[base])
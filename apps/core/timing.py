@@ -0,0 +1,204 @@
+"""
+Per-request timing of authentication, SQL, serialization and rendering,
+reported in a ``Server-Timing`` header and a structured log record.
+"""
+import cProfile
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils import timezone
+from django.utils.text import slugify
+
+from .metrics import record_request
+
+logger = logging.getLogger(__name__)
+
+_current = ContextVar('request_timings', default=None)
+
+
+class RequestTimings:
+    """
+    Timings of the phases of one request.
+
+    Phases are measured exclusive of SQL and of phases nested in them, so
+    ``db``, the phases and the ``app`` remainder add up to the total.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.phases = {}
+        self._stack = []
+
+    def enter(self, name):
+        self._stack.append([name, time.perf_counter(), self.sql_seconds, 0.0])
+
+    def exit(self):
+        name, started, sql_at_start, nested = self._stack.pop()
+        duration = time.perf_counter() - started - (self.sql_seconds - sql_at_start)
+        self.phases[name] = self.phases.get(name, 0.0) + duration - nested
+        if self._stack:
+            self._stack[-1][3] += duration
+
+    def exit_all(self):
+        while self._stack:
+            self.exit()
+
+    def get_metrics(self):
+        """
+        Return ``(name, milliseconds)`` pairs: db, each phase, app and total.
+        """
+        total = time.perf_counter() - self.started
+        app = total - self.sql_seconds - sum(self.phases.values())
+        return [
+            ('db', self.sql_seconds * 1000),
+            *((name, seconds * 1000) for name, seconds in self.phases.items()),
+            ('app', max(app, 0.0) * 1000),
+            ('total', total * 1000),
+        ]
+
+
+@contextmanager
+def timed(name):
+    """
+    Time the block as phase ``name`` of the current request, if any.
+    """
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    timings.enter(name)
+    try:
+        yield
+    finally:
+        timings.exit()
+
+
+def sql_timer(execute, sql, params, many, context):
+    """
+    Database execute wrapper adding queries to the current request.
+    """
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.queries += 1
+        timings.sql_seconds += time.perf_counter() - started
+
+
+def install_sql_timer(sender, connection, **kwargs):
+    """
+    ``connection_created`` receiver adding :func:`sql_timer` to every
+    connection, including those of ``sync_to_async`` threads under ASGI.
+    """
+    if sql_timer not in connection.execute_wrappers:
+        connection.execute_wrappers.append(sql_timer)
+
+
+class ServerTimingMiddleware:
+    """
+    Time each request and report it in a ``Server-Timing`` header
+    (``SERVER_TIMING_HEADER``) and an INFO log record with the timings as fields.
+
+    Requests are sampled for profiling at ``REQUEST_PROFILE_SAMPLE_RATE``
+    when ``REQUEST_PROFILE_DIR`` is set; profiles of sampled requests
+    slower than ``REQUEST_PROFILE_MIN_MS`` are written there as ``.prof``
+    files (``python -m pstats <file>``). Under ASGI only code on the event
+    loop thread is profiled. Streaming bodies are sent after the timings
+    are taken and are not included.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        timings, profiler, token = self.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, timings, profiler)
+
+    async def __acall__(self, request):
+        timings, profiler, token = self.start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, timings, profiler)
+
+    def process_template_response(self, request, response):
+        # Runs right before DRF renders the response; the render phase
+        # ends when the response comes back through __call__.
+        timings = _current.get()
+        if timings is not None:
+            timings.enter('render')
+        return response
+
+    @staticmethod
+    def start():
+        timings = RequestTimings()
+        profiler = None
+        if (settings.REQUEST_PROFILE_DIR
+                and random.random() < settings.REQUEST_PROFILE_SAMPLE_RATE):
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # Another profiler is active in this thread.
+                profiler = None
+        return timings, profiler, _current.set(timings)
+
+    def finish(self, request, response, timings, profiler):
+        timings.exit_all()
+        metrics = timings.get_metrics()
+        record_request(request, response, metrics[-1][1] / 1000,
+                       timings.queries, timings.sql_seconds)
+        if profiler is not None:
+            profiler.disable()
+            if metrics[-1][1] >= settings.REQUEST_PROFILE_MIN_MS:
+                self.save_profile(profiler, request, metrics[-1][1])
+
+        if settings.SERVER_TIMING_HEADER:
+            response['Server-Timing'] = ', '.join(
+                f'{name};dur={ms:.1f}' + (f';desc="{timings.queries} queries"' if name == 'db' else '')
+                for name, ms in metrics
+            )
+        # The timings go in separate record fields, which JsonFormatter
+        # emits as JSON keys.
+        fields = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'db_queries': timings.queries,
+        }
+        fields.update((f'{name}_ms', round(ms, 1)) for name, ms in metrics)
+        logger.info('%s %s %s in %.1f ms', request.method, request.path,
+                    response.status_code, metrics[-1][1], extra=fields)
+        return response
+
+    @staticmethod
+    def save_profile(profiler, request, total_ms):
+        directory = Path(settings.REQUEST_PROFILE_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+        name = (f'{timezone.now():%Y%m%dT%H%M%S%f}-{request.method}-'
+                f'{slugify(request.path.replace("/", " "))[:80]}-{total_ms:.0f}ms.prof')
+        profiler.dump_stats(directory / name)
+        logger.info('Saved profile of %s %s to %s', request.method, request.path, directory / name)
@@ -3,6 +3,8 @@ Admin configuration for Task and Comment models.
 """
 from django.contrib import admin
 from .models import Task, Comment
+from .search import build_search_query
+from .services import CommentService
 
 
 @admin.register(Task)
@@ -11,11 +13,13 @@ class TaskAdmin(admin.ModelAdmin):
     Task admin interface.
     """
     list_display = ['title', 'uuid', 'creator', 'assignee', 'is_completed',
-                    'created_at']
+                    'comment_count', 'created_at']
     list_filter = ['is_completed', 'created_at', 'updated_at']
-    search_fields = ['title', 'description', 'uuid', 'creator__username',
-                     'assignee__username']
-    readonly_fields = ['uuid', 'created_at', 'updated_at', 'completed_at']
+    # Title and description are matched through the full-text index in
+    # get_search_results instead of icontains scans.
+    search_fields = ['uuid', 'creator__username', 'assignee__username']
+    readonly_fields = ['uuid', 'created_at', 'updated_at', 'completed_at',
+                       'comment_count', 'last_activity_at']
     raw_id_fields = ['creator', 'assignee']
     
     fieldsets = (
@@ -28,16 +32,28 @@ class TaskAdmin(admin.ModelAdmin):
         ('Status', {
             'fields': ('is_completed', 'completed_at')
         }),
+        ('Activity', {
+            'fields': ('comment_count', 'last_activity_at')
+        }),
         ('Timestamps', {
             'fields': ('created_at', 'updated_at')
         }),
     )
 
+    def get_search_results(self, request, queryset, search_term):
+        results, may_have_duplicates = super().get_search_results(
+            request, queryset, search_term
+        )
+        if search_term:
+            results |= queryset.filter(search_vector=build_search_query(search_term))
+        return results, may_have_duplicates
+
 
 @admin.register(Comment)
 class CommentAdmin(admin.ModelAdmin):
     """
     Comment admin interface.
+    Deletes go through CommentService to keep task counters in sync.
     """
     list_display = ['__str__', 'uuid', 'task', 'author', 'created_at']
     list_filter = ['created_at']
@@ -52,4 +68,10 @@ class CommentAdmin(admin.ModelAdmin):
         ('Timestamps', {
             'fields': ('created_at', 'updated_at')
         }),
-    )
\ No newline at end of file
+    )
+
+    def delete_model(self, request, obj):
+        CommentService.delete_comment(obj)
+
+    def delete_queryset(self, request, queryset):
+        CommentService.delete_comments(queryset)
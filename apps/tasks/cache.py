@@ -0,0 +1,97 @@
+"""
+Versioned response cache for task list pages.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+from apps.core.metrics import registry as metrics
+from apps.core.replicas import current_replica
+
+
+class TaskListCache:
+    """
+    Cache of serialized task list pages.
+
+    Entries are keyed by a global generation number, the requesting user and
+    the normalized query parameters (filters, ordering, pagination).
+    Writes invalidate every cached page at once by bumping the generation
+    (see TaskService and CommentService); stale entries are never looked up
+    again and simply expire after ``TASK_LIST_CACHE_TIMEOUT`` seconds.
+
+    Writes that bypass the services (admin, shell, raw SQL) are only picked
+    up once the timeout elapses. Hits and misses are counted in the
+    ``task_list_cache_hits_total`` and ``task_list_cache_misses_total``
+    metrics.
+    """
+    key_prefix = 'tasks:list'
+    generation_key = f'{key_prefix}:generation'
+
+    @staticmethod
+    def get_cache():
+        return caches[settings.TASK_LIST_CACHE_ALIAS]
+
+    @staticmethod
+    def is_enabled():
+        return settings.TASK_LIST_CACHE_TIMEOUT > 0
+
+    @classmethod
+    def get_generation(cls):
+        """
+        Return the current generation, initializing it if missing.
+
+        A missing counter (cold or evicted cache) starts from the current
+        time in nanoseconds, so it never reuses an earlier generation.
+        """
+        cache = cls.get_cache()
+        generation = cache.get(cls.generation_key)
+        if generation is None:
+            cache.add(cls.generation_key, time.time_ns(), timeout=None)
+            generation = cache.get(cls.generation_key)
+        return generation
+
+    @classmethod
+    def invalidate(cls):
+        """
+        Bump the generation, orphaning every cached page.
+        """
+        cache = cls.get_cache()
+        try:
+            cache.incr(cls.generation_key)
+        except ValueError:
+            cache.add(cls.generation_key, time.time_ns(), timeout=None)
+
+    @classmethod
+    def make_key(cls, request):
+        """
+        Build the cache key for a list request.
+        """
+        params = sorted(
+            (name, sorted(values)) for name, values in request.query_params.lists()
+        )
+        digest = hashlib.md5(repr(params).encode('utf-8'), usedforsecurity=False).hexdigest()
+        return f'{cls.key_prefix}:{cls.get_generation()}:{request.user.pk}:{digest}'
+
+    @classmethod
+    def get(cls, key):
+        """
+        Return the cached entry for ``key`` or None, counting hits and misses.
+        """
+        entry = cls.get_cache().get(key)
+        metrics.inc(
+            'task_list_cache_hits_total' if entry is not None else 'task_list_cache_misses_total'
+        )
+        return entry
+
+    @classmethod
+    def set(cls, key, entry):
+        """
+        Store ``entry``. Pages read from a replica may miss recent writes, so
+        they are kept for at most ``REPLICA_MAX_LAG_SECONDS``.
+        """
+        timeout = settings.TASK_LIST_CACHE_TIMEOUT
+        if current_replica() is not None:
+            timeout = min(timeout, settings.REPLICA_MAX_LAG_SECONDS)
+        cls.get_cache().set(key, entry, timeout=timeout)
@@ -2,39 +2,124 @@
 Filter backends for Task API.
 """
 import django_filters
-from apps.users.models import User
-from .models import Task
+from django.contrib.postgres.search import SearchHeadline, SearchRank
+from django.db.models import Exists, F, FloatField, OuterRef, Q
+from django.db.models.functions import Cast
+from rest_framework.filters import BaseFilterBackend, OrderingFilter
+from .models import Task, Comment
+from .search import SEARCH_CONFIG, build_search_query, comment_search_vector
+
+
+class UUIDInFilter(django_filters.BaseInFilter, django_filters.UUIDFilter):
+    """
+    Filter accepting one or more comma-separated UUIDs.
+    """
 
 
 class TaskFilter(django_filters.FilterSet):
     """
     Filter class for Task model.
-    Filters by creator UUID, assignee UUID, and completion status.
+    Filters by creator UUID(s), assignee UUID(s), unassigned tasks,
+    completion status and comment activity ranges. UUID filters are joins
+    on the user table inside the main query, so filtering costs no extra
+    round trips.
     """
-    creator = django_filters.UUIDFilter(method='filter_by_creator_uuid')
-    assignee = django_filters.UUIDFilter(method='filter_by_assignee_uuid')
+    creator = UUIDInFilter(field_name='creator__uuid', lookup_expr='in')
+    assignee = UUIDInFilter(field_name='assignee__uuid', lookup_expr='in')
+    assignee__isnull = django_filters.BooleanFilter(
+        field_name='assignee',
+        lookup_expr='isnull',
+    )
     is_completed = django_filters.BooleanFilter(field_name='is_completed')
-    
+    comment_count__gte = django_filters.NumberFilter(
+        field_name='comment_count',
+        lookup_expr='gte',
+    )
+    comment_count__lte = django_filters.NumberFilter(
+        field_name='comment_count',
+        lookup_expr='lte',
+    )
+    last_activity_at__gte = django_filters.IsoDateTimeFilter(
+        field_name='last_activity_at',
+        lookup_expr='gte',
+    )
+    last_activity_at__lte = django_filters.IsoDateTimeFilter(
+        field_name='last_activity_at',
+        lookup_expr='lte',
+    )
+
     class Meta:
         model = Task
-        fields = ['creator', 'assignee', 'is_completed']
-    
-    def filter_by_creator_uuid(self, queryset, name, value):
-        """
-        Filter tasks by creator UUID.
-        """
-        try:
-            user = User.objects.get(uuid=value)
-            return queryset.filter(creator=user)
-        except User.DoesNotExist:
-            return queryset.none()
-    
-    def filter_by_assignee_uuid(self, queryset, name, value):
-        """
-        Filter tasks by assignee UUID.
-        """
-        try:
-            user = User.objects.get(uuid=value)
-            return queryset.filter(assignee=user)
-        except User.DoesNotExist:
-            return queryset.none()
+        fields = [
+            'creator',
+            'assignee',
+            'assignee__isnull',
+            'is_completed',
+            'comment_count__gte',
+            'comment_count__lte',
+            'last_activity_at__gte',
+            'last_activity_at__lte',
+        ]
+
+
+class TaskSearchFilter(BaseFilterBackend):
+    """
+    Full-text search over tasks (``?q=``).
+
+    Matches the GIN-indexed ``Task.search_vector`` (title and description)
+    and, with ``?search_comments=true``, tasks having a matching comment,
+    checked with EXISTS against the comment text index. Matches are
+    annotated with ``search_rank``; ``?highlight=true`` also annotates a
+    ``search_snippet`` of the description with matches in ``<mark>``.
+    """
+    search_param = 'q'
+    comments_param = 'search_comments'
+    highlight_param = 'highlight'
+
+    def get_search_text(self, request):
+        return request.query_params.get(self.search_param, '').strip()
+
+    def filter_queryset(self, request, queryset, view):
+        text = self.get_search_text(request)
+        if not text:
+            return queryset
+
+        query = build_search_query(text)
+        match = Q(search_vector=query)
+        if _is_true(request.query_params.get(self.comments_param)):
+            comments = Comment.objects.annotate(
+                text_vector=comment_search_vector(),
+            ).filter(task=OuterRef('pk'), text_vector=query)
+            match |= Exists(comments)
+
+        # ts_rank returns float4. Casting to float8 makes the value survive
+        # the round trip through a keyset cursor exactly, so the cursor's
+        # equality and range predicates match the row it came from.
+        queryset = queryset.filter(match).annotate(
+            search_rank=Cast(SearchRank(F('search_vector'), query), FloatField()),
+        )
+        if _is_true(request.query_params.get(self.highlight_param)):
+            queryset = queryset.annotate(search_snippet=SearchHeadline(
+                'description',
+                query,
+                config=SEARCH_CONFIG,
+                start_sel='<mark>',
+                stop_sel='</mark>',
+                max_fragments=2,
+            ))
+        return queryset
+
+
+class TaskOrderingFilter(OrderingFilter):
+    """
+    OrderingFilter defaulting to relevance while a search is active.
+    """
+
+    def get_default_ordering(self, view):
+        if TaskSearchFilter().get_search_text(view.request):
+            return ['-search_rank', '-id']
+        return super().get_default_ordering(view)
+
+
+def _is_true(value):
+    return value is not None and value.lower() in ('1', 'true', 'yes')
@@ -0,0 +1,241 @@
+"""
+Bulk task import through Postgres COPY.
+"""
+import csv
+import json
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from apps.core.bulk_copy import copy_rows
+from .models import ChangeLogEntry, Task
+
+User = get_user_model()
+
+STAGING_TABLE = 'import_tasks_staging'
+
+STAGING_COLUMNS = (
+    'seq', 'uuid', 'title', 'description', 'creator_id', 'assignee_id',
+    'is_completed', 'completed_at', 'created_at',
+)
+
+TRUE_VALUES = {'true', 't', '1', 'yes', 'y'}
+FALSE_VALUES = {'false', 'f', '0', 'no', 'n', ''}
+
+
+class InvalidRecord(ValueError):
+    """
+    Raised for an input record that cannot be imported.
+    """
+
+
+def read_records(stream, file_format):
+    """
+    Yield input records of an NDJSON or CSV text stream one at a time.
+
+    NDJSON lines and CSV rows are parsed lazily, so the input is never held
+    in memory. Blank NDJSON lines are skipped; unparsable ones are yielded
+    as InvalidRecord instances so they are counted like other bad records.
+    """
+    if file_format == 'csv':
+        yield from csv.DictReader(stream)
+        return
+    for line in stream:
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield InvalidRecord(f'Invalid JSON: {e}')
+            continue
+        yield record if isinstance(record, dict) else InvalidRecord('Not a JSON object')
+
+
+class TaskImporter:
+    """
+    Load task records into the tasks table.
+
+    Records use the shape of the task export (NDJSON items or flattened CSV
+    rows): ``uuid``, ``title``, ``description``, ``creator``, ``assignee``,
+    ``is_completed``, ``completed_at`` and ``created_at``. Users are given
+    by uuid or username, either as plain values, as ``{"uuid": ...}``
+    objects or as ``creator.uuid`` / ``creator.username`` columns, and are
+    resolved through a map of all users built once.
+
+    Each batch is written with ``COPY`` into a temporary staging table and
+    merged with one ``INSERT ... ON CONFLICT (uuid) DO UPDATE``, which also
+    adds the tasks to the change log, in its own transaction. Updates keep
+    comment counters and ``last_activity_at``; when a uuid repeats within
+    a batch the last record wins. Records without a uuid get one derived
+    from ``source`` and their position, so importing the same input again
+    updates them instead of duplicating them.
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self.users = self.build_user_map()
+        self.now = timezone.now()
+
+    @staticmethod
+    def build_user_map():
+        """
+        Return a dict mapping user uuids and usernames to user ids.
+        """
+        users = {}
+        for user_id, user_uuid, username in User.objects.values_list(
+            'id', 'uuid', 'username'
+        ).iterator(chunk_size=10000):
+            users[str(user_uuid)] = user_id
+            users[username] = user_id
+        return users
+
+    def parse_record(self, record, seq):
+        """
+        Convert an input record into a staging row.
+
+        Args:
+            record: Input record (dict)
+            seq: Position of the record in the input
+
+        Returns:
+            Tuple of STAGING_COLUMNS values
+
+        Raises:
+            InvalidRecord: If a value is missing or invalid
+        """
+        if isinstance(record, InvalidRecord):
+            raise record
+
+        title = record.get('title') or ''
+        if not title.strip():
+            raise InvalidRecord('title is required')
+        if len(title) > Task._meta.get_field('title').max_length:
+            raise InvalidRecord('title is too long')
+
+        task_uuid = record.get('uuid') or uuid.uuid5(uuid.NAMESPACE_URL, f'{self.source}#{seq}')
+        try:
+            task_uuid = uuid.UUID(str(task_uuid))
+        except ValueError:
+            raise InvalidRecord(f'Invalid uuid {task_uuid!r}')
+
+        creator_id = self._resolve_user(record, 'creator')
+        if creator_id is None:
+            raise InvalidRecord('creator is required')
+        is_completed = _parse_bool(record.get('is_completed'), 'is_completed')
+        completed_at = _parse_datetime(record.get('completed_at'), 'completed_at')
+        if is_completed and completed_at is None:
+            completed_at = self.now
+        elif not is_completed:
+            completed_at = None
+
+        return (
+            seq,
+            task_uuid,
+            title,
+            record.get('description') or '',
+            creator_id,
+            self._resolve_user(record, 'assignee'),
+            is_completed,
+            completed_at,
+            _parse_datetime(record.get('created_at'), 'created_at') or self.now,
+        )
+
+    @staticmethod
+    def load_batch(rows):
+        """
+        Upsert staging ``rows`` into the tasks table in one transaction.
+
+        Returns:
+            ``(inserted, updated)`` row counts
+        """
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f"""
+                CREATE TEMPORARY TABLE IF NOT EXISTS {STAGING_TABLE} (
+                    seq bigint NOT NULL,
+                    uuid uuid NOT NULL,
+                    title varchar(255) NOT NULL,
+                    description text NOT NULL,
+                    creator_id integer NOT NULL,
+                    assignee_id integer,
+                    is_completed boolean NOT NULL,
+                    completed_at timestamptz,
+                    created_at timestamptz NOT NULL
+                )
+            """)
+            # Emptied explicitly: ON COMMIT would not fire when the import
+            # runs inside an outer transaction.
+            cursor.execute(f'TRUNCATE {STAGING_TABLE}')
+            copy_rows(cursor, STAGING_TABLE, STAGING_COLUMNS, rows,
+                      force_not_null=('title', 'description'))
+            cursor.execute(f"""
+                WITH upserted AS (
+                    INSERT INTO {Task._meta.db_table} (
+                        uuid, title, description, creator_id, assignee_id,
+                        is_completed, completed_at, comment_count,
+                        last_activity_at, created_at, updated_at
+                    )
+                    SELECT DISTINCT ON (uuid)
+                        uuid, title, description, creator_id, assignee_id,
+                        is_completed, completed_at, 0,
+                        created_at, created_at, %s
+                    FROM {STAGING_TABLE}
+                    ORDER BY uuid, seq DESC
+                    ON CONFLICT (uuid) DO UPDATE SET
+                        title = EXCLUDED.title,
+                        description = EXCLUDED.description,
+                        creator_id = EXCLUDED.creator_id,
+                        assignee_id = EXCLUDED.assignee_id,
+                        is_completed = EXCLUDED.is_completed,
+                        completed_at = EXCLUDED.completed_at,
+                        created_at = EXCLUDED.created_at,
+                        updated_at = EXCLUDED.updated_at
+                    RETURNING uuid, xmax = 0 AS inserted
+                ), logged AS (
+                    INSERT INTO {ChangeLogEntry._meta.db_table} (kind, uuid, deleted)
+                    SELECT %s, uuid, false FROM upserted
+                )
+                SELECT count(*) FILTER (WHERE inserted), count(*) FILTER (WHERE NOT inserted)
+                FROM upserted
+            """, [timezone.now(), ChangeLogEntry.TASK])
+            inserted, updated = cursor.fetchone()
+        return inserted, updated
+
+    def _resolve_user(self, record, name):
+        value = record.get(name)
+        if isinstance(value, dict):
+            value = value.get('uuid') or value.get('username')
+        if not value:
+            value = record.get(f'{name}.uuid') or record.get(f'{name}.username')
+        if not value:
+            return None
+        user_id = self.users.get(str(value))
+        if user_id is None:
+            raise InvalidRecord(f'Unknown {name} {value!r}')
+        return user_id
+
+
+def _parse_bool(value, name):
+    if isinstance(value, bool):
+        return value
+    text = '' if value is None else str(value).strip().lower()
+    if text in TRUE_VALUES:
+        return True
+    if text in FALSE_VALUES:
+        return False
+    raise InvalidRecord(f'Invalid {name} {value!r}')
+
+
+def _parse_datetime(value, name):
+    if value in (None, ''):
+        return None
+    try:
+        parsed = parse_datetime(str(value))
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise InvalidRecord(f'Invalid {name} {value!r}')
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
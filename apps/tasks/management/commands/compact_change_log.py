@@ -0,0 +1,35 @@
+"""
+Management command to compact the change log behind the sync endpoint.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from apps.tasks.services import ChangeLogService
+
+
+class Command(BaseCommand):
+    help = ('Remove change log entries superseded by newer ones, and deletions older '
+            'than the retention; clients that synced before those must start over')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--retention-days',
+            type=int,
+            default=settings.CHANGE_LOG_RETENTION_DAYS,
+            help='Days deletions are kept (default: CHANGE_LOG_RETENTION_DAYS, '
+                 f'{settings.CHANGE_LOG_RETENTION_DAYS})',
+        )
+
+    def handle(self, *args, **options):
+        retention_days = options['retention_days']
+        if retention_days < 0:
+            raise CommandError('--retention-days must not be negative.')
+
+        superseded, deletions = ChangeLogService.compact(
+            timezone.now() - timedelta(days=retention_days)
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Removed {superseded} superseded and {deletions} deletion entries'
+        ))
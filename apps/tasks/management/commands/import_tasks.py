@@ -0,0 +1,142 @@
+"""
+Management command to bulk import tasks from NDJSON or CSV files.
+"""
+import json
+import os
+import sys
+import time
+from itertools import islice
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from apps.tasks.cache import TaskListCache
+from apps.tasks.importer import InvalidRecord, TaskImporter, read_records
+
+FORMATS = {'.ndjson': 'ndjson', '.jsonl': 'ndjson', '.csv': 'csv'}
+
+
+class Command(BaseCommand):
+    help = 'Import tasks from an NDJSON or CSV file with COPY, upserting on uuid'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Input file, or - to read standard input')
+        parser.add_argument(
+            '--format',
+            choices=['ndjson', 'csv'],
+            help='Input format (default: from the file extension)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=50000,
+            help='Number of records loaded per transaction (default: 50000)',
+        )
+        parser.add_argument(
+            '--checkpoint',
+            help='Checkpoint file used to resume an interrupted import '
+                 '(default: <path>.checkpoint)',
+        )
+        parser.add_argument(
+            '--restart',
+            action='store_true',
+            help='Ignore an existing checkpoint and start from the first record',
+        )
+        parser.add_argument(
+            '--skip-invalid',
+            action='store_true',
+            help='Report and skip invalid records instead of stopping',
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size must be a positive integer.')
+        file_format = options['format'] or FORMATS.get(os.path.splitext(path)[1].lower())
+        if file_format is None:
+            raise CommandError('Cannot tell the input format, use --format.')
+        checkpoint = options['checkpoint'] or (None if path == '-' else f'{path}.checkpoint')
+
+        state = {'records': 0, 'inserted': 0, 'updated': 0, 'skipped': 0}
+        if checkpoint and not options['restart'] and os.path.exists(checkpoint):
+            state = self.read_checkpoint(checkpoint)
+            self.stdout.write(f'Resuming after record {state["records"]}')
+
+        try:
+            stream = sys.stdin if path == '-' else open(path, newline='', encoding='utf-8')
+        except OSError as e:
+            raise CommandError(f'Cannot open {path}: {e}')
+        changed = state['inserted'] + state['updated']
+        try:
+            with stream:
+                self.run_import(stream, file_format, path, batch_size, checkpoint,
+                                state, options['skip_invalid'])
+        finally:
+            # Batches committed before a failure are visible too.
+            if state['inserted'] + state['updated'] > changed:
+                TaskListCache.invalidate()
+                # COPY bypasses TaskService, which maintains the statistics.
+                call_command('rebuild_task_stats', stdout=self.stdout)
+
+        if checkpoint and os.path.exists(checkpoint):
+            os.remove(checkpoint)
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {state["records"]} records: {state["inserted"]} inserted, '
+            f'{state["updated"]} updated, {state["skipped"]} skipped'
+        ))
+
+    def run_import(self, stream, file_format, source, batch_size, checkpoint,
+                   state, skip_invalid):
+        importer = TaskImporter(source)
+        started = time.monotonic()
+        resumed_at = seq = state['records']
+        batch = []
+
+        def flush():
+            inserted, updated = importer.load_batch(batch) if batch else (0, 0)
+            state['records'] = seq
+            state['inserted'] += inserted
+            state['updated'] += updated
+            if checkpoint:
+                self.write_checkpoint(checkpoint, state)
+            rate = (seq - resumed_at) / max(time.monotonic() - started, 1e-6)
+            self.stdout.write(
+                f'{seq} records: {state["inserted"]} inserted, {state["updated"]} updated, '
+                f'{state["skipped"]} skipped ({rate:.0f} records/s)'
+            )
+            batch.clear()
+
+        # Records before the checkpoint were committed by an earlier run;
+        # they are read again but not parsed or loaded.
+        for record in islice(read_records(stream, file_format), resumed_at, None):
+            seq += 1
+            try:
+                batch.append(importer.parse_record(record, seq))
+            except InvalidRecord as e:
+                if not skip_invalid:
+                    raise CommandError(
+                        f'Record {seq}: {e}. Records before the current batch are '
+                        f'imported; fix the input and run the command again to resume.'
+                    )
+                state['skipped'] += 1
+                self.stderr.write(f'Skipped record {seq}: {e}')
+            if seq - state['records'] >= batch_size:
+                flush()
+        if seq > state['records']:
+            flush()
+
+    @staticmethod
+    def read_checkpoint(checkpoint):
+        try:
+            with open(checkpoint, encoding='utf-8') as f:
+                state = json.load(f)
+            return {key: int(state[key]) for key in ('records', 'inserted', 'updated', 'skipped')}
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            raise CommandError(f'Invalid checkpoint {checkpoint}: {e}. Use --restart to ignore it.')
+
+    @staticmethod
+    def write_checkpoint(checkpoint, state):
+        # Write then rename, so an interruption never leaves a partial file.
+        with open(f'{checkpoint}.tmp', 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(f'{checkpoint}.tmp', checkpoint)
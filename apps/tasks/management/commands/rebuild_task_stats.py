@@ -0,0 +1,35 @@
+"""
+Management command to rebuild per-user task statistics from tasks.
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Max
+from apps.tasks.services import TaskStatsService
+from apps.users.models import User
+
+
+class Command(BaseCommand):
+    help = 'Recompute UserTaskStats from the tasks table, repairing drifted rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of user ids rebuilt per transaction (default: 1000)',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size must be a positive integer.')
+
+        max_id = User.objects.aggregate(max_id=Max('id'))['max_id'] or 0
+        corrected = 0
+        # Each batch locks the statistics table against task writes only
+        # for its own short transaction.
+        for start in range(1, max_id + 1, batch_size):
+            with transaction.atomic():
+                corrected += TaskStatsService.rebuild(start, start + batch_size)
+
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt task statistics, corrected {corrected} users'))
@@ -0,0 +1,40 @@
+"""
+Management command to repair drifted task comment counters.
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Max
+from apps.tasks.cache import TaskListCache
+from apps.tasks.models import Task
+from apps.tasks.services import TaskService
+
+
+class Command(BaseCommand):
+    help = 'Recompute Task.comment_count and Task.last_activity_at from comments'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of task ids checked per transaction (default: 1000)',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size must be a positive integer.')
+
+        max_id = Task.objects.aggregate(max_id=Max('id'))['max_id'] or 0
+        updated = 0
+        # Batches are id ranges, each in its own short transaction, so rows
+        # are never locked for the duration of the whole run.
+        for start in range(1, max_id + 1, batch_size):
+            with transaction.atomic():
+                updated += TaskService.recompute_counters(
+                    Task.objects.filter(id__gte=start, id__lt=start + batch_size)
+                )
+
+        if updated:
+            TaskListCache.invalidate()
+        self.stdout.write(self.style.SUCCESS(f'Recomputed counters of {updated} tasks'))
@@ -0,0 +1,31 @@
+# Generated by Django 6.0.9 on 2026-10-17 12:06
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0002_keyset_pagination_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='task',
+            name='tasks_creator_e587e6_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='tasks_assigne_462a05_idx',
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['creator', '-created_at', '-id'], name='tasks_creator_249540_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['assignee', '-created_at', '-id'], name='tasks_assigne_d3ac09_idx'),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 6.0.9 on 2026-10-17 12:10
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0003_task_filter_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='comment',
+            name='comments_task_id_90b309_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='tasks_is_comp_a2f0eb_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='tasks_is_comp_2c1315_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='tasks_creator_249540_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='tasks_assigne_d3ac09_idx',
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['task', '-created_at', '-id'], include=('updated_at',), name='comments_task_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['creator', '-created_at', '-id'], include=('updated_at',), name='tasks_creator_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['assignee', '-created_at', '-id'], include=('updated_at',), name='tasks_assignee_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['is_completed', 'id'], include=('updated_at',), name='tasks_is_completed_id_idx'),
+        ),
+    ]
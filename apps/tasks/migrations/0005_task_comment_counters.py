@@ -0,0 +1,50 @@
+# Generated by Django 6.0.9 on 2026-10-17 12:26
+
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0004_conditional_get_covering_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, help_text='Number of comments on the task'),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='last_activity_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, help_text="Time of the task's creation or its latest comment"),
+            preserve_default=False,
+        ),
+        migrations.RunSQL(
+            sql="""
+                UPDATE tasks SET last_activity_at = created_at;
+                UPDATE tasks SET
+                    comment_count = stats.comment_count,
+                    last_activity_at = GREATEST(tasks.created_at, stats.last_comment_at)
+                FROM (
+                    SELECT task_id, COUNT(*) AS comment_count,
+                           MAX(created_at) AS last_comment_at
+                    FROM comments GROUP BY task_id
+                ) AS stats
+                WHERE stats.task_id = tasks.id;
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['comment_count', 'id'], name='tasks_comment_1e5573_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['last_activity_at', 'id'], name='tasks_last_ac_ccb63d_idx'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 6.0.9 on 2026-10-17 14:39
+
+import apps.tasks.models
+import django.contrib.postgres.fields
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def fill_user_task_stats(apps, schema_editor):
+    from apps.tasks.services import TaskStatsService
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute('SELECT COALESCE(MAX(id), 0) + 1 FROM users')
+        stop = cursor.fetchone()[0]
+    TaskStatsService.rebuild(0, stop)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0007_task_created_at_default'),
+        ('users', '0002_user_search_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserTaskStats',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='task_stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('open_count', models.IntegerField(default=0, help_text='Assigned tasks not completed')),
+                ('completed_count', models.IntegerField(default=0, help_text='Assigned tasks completed')),
+                ('completion_buckets', django.contrib.postgres.fields.ArrayField(base_field=models.IntegerField(), default=apps.tasks.models.empty_completion_buckets, help_text='Completed tasks per COMPLETION_BUCKET_BOUNDS bucket')),
+            ],
+            options={
+                'verbose_name': 'User task statistics',
+                'verbose_name_plural': 'User task statistics',
+                'db_table': 'user_task_stats',
+            },
+        ),
+        migrations.RunPython(fill_user_task_stats, migrations.RunPython.noop),
+    ]
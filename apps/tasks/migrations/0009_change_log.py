@@ -0,0 +1,58 @@
+# Generated by Django 6.0.9 on 2026-10-17 14:51
+
+import django.db.models.expressions
+import django.db.models.functions.datetime
+from django.db import migrations, models
+
+
+def log_existing_rows(apps, schema_editor):
+    # A sync without a cursor reads the whole log, so it starts with an
+    # entry for every existing task and comment.
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("""
+            INSERT INTO change_log (kind, uuid, deleted)
+            SELECT 'task', uuid, false FROM tasks
+            UNION ALL
+            SELECT 'comment', uuid, false FROM comments
+        """)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0008_user_task_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeLogHorizon',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('txid', models.BigIntegerField()),
+                ('entry_id', models.BigIntegerField()),
+                ('compacted_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Change log horizon',
+                'db_table': 'change_log_horizon',
+            },
+        ),
+        migrations.CreateModel(
+            name='ChangeLogEntry',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('txid', models.BigIntegerField(db_default=django.db.models.expressions.RawSQL('pg_current_xact_id()::text::bigint', []), editable=False, help_text='Id of the transaction that wrote the entry')),
+                ('kind', models.CharField(choices=[('task', 'Task'), ('comment', 'Comment')], max_length=7)),
+                ('uuid', models.UUIDField(help_text='UUID of the changed task or comment')),
+                ('deleted', models.BooleanField(default=False, help_text='Whether the row was deleted')),
+                ('created_at', models.DateTimeField(db_default=django.db.models.functions.datetime.Now(), editable=False)),
+            ],
+            options={
+                'verbose_name': 'Change log entry',
+                'verbose_name_plural': 'Change log entries',
+                'db_table': 'change_log',
+                'indexes': [models.Index(fields=['txid', 'id'], name='change_log_position_idx')],
+            },
+        ),
+        migrations.RunPython(log_existing_rows, migrations.RunPython.noop),
+    ]
@@ -1,9 +1,18 @@
 """
-Task and Comment models.
+Task, Comment, per-user task statistics and change log models.
 """
+from bisect import bisect_right
+
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Now
 from django.conf import settings
+from django.utils import timezone
 from apps.core.models import BaseModel
+from .search import comment_search_vector, task_search_vector
 
 
 class Task(BaseModel):
@@ -12,6 +21,9 @@ class Task(BaseModel):
     """
     title = models.CharField(max_length=255, help_text="Task title")
     description = models.TextField(blank=True, help_text="Task description")
+    # A default instead of auto_now_add, so save() and bulk writers can copy
+    # the creation time into last_activity_at before the row is inserted.
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
     
     creator = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -35,6 +47,21 @@ class Task(BaseModel):
         blank=True,
         help_text="Timestamp when task was marked as completed"
     )
+    # Denormalized from comments and maintained by CommentService; the
+    # recompute_task_counters command repairs drift.
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of comments on the task"
+    )
+    last_activity_at = models.DateTimeField(
+        help_text="Time of the task's creation or its latest comment"
+    )
+    # Maintained by PostgreSQL on every write of title or description.
+    search_vector = models.GeneratedField(
+        expression=task_search_vector(),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
     
     class Meta:
         db_table = 'tasks'
@@ -42,15 +69,38 @@ class Task(BaseModel):
         verbose_name_plural = 'Tasks'
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['creator']),
-            models.Index(fields=['assignee']),
-            models.Index(fields=['is_completed']),
-            models.Index(fields=['-created_at']),
+            # Filter column plus default ordering, so filtered lists are
+            # served by a single index range scan. updated_at is included
+            # so conditional GET fingerprints are index-only scans.
+            models.Index(fields=['creator', '-created_at', '-id'],
+                         include=['updated_at'],
+                         name='tasks_creator_created_idx'),
+            models.Index(fields=['assignee', '-created_at', '-id'],
+                         include=['updated_at'],
+                         name='tasks_assignee_created_idx'),
+            models.Index(fields=['is_completed', 'id'],
+                         include=['updated_at'],
+                         name='tasks_is_completed_id_idx'),
+            # Composite (ordering field, id) indexes back keyset pagination.
+            models.Index(fields=['-created_at', '-id']),
+            models.Index(fields=['updated_at', 'id']),
+            models.Index(fields=['title', 'id']),
+            models.Index(fields=['comment_count', 'id']),
+            models.Index(fields=['last_activity_at', 'id']),
+            GinIndex(fields=['search_vector'], name='tasks_search_vector_idx'),
         ]
     
     def __str__(self):
         return f"{self.title} ({self.uuid})"
 
+    def save(self, *args, **kwargs):
+        """
+        Start last_activity_at at the creation time of a new task.
+        """
+        if self._state.adding and self.last_activity_at is None:
+            self.last_activity_at = self.created_at
+        super().save(*args, **kwargs)
+
 
 class Comment(BaseModel):
     """
@@ -76,10 +126,150 @@ class Comment(BaseModel):
         verbose_name_plural = 'Comments'
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['task']),
+            models.Index(fields=['task', '-created_at', '-id'],
+                         include=['updated_at'],
+                         name='comments_task_created_idx'),
             models.Index(fields=['author']),
             models.Index(fields=['-created_at']),
+            GinIndex(comment_search_vector(), name='comments_text_search_idx'),
         ]
     
     def __str__(self):
-        return f"Comment by {self.author.username} on {self.task.title}"
\ No newline at end of file
+        return f"Comment by {self.author.username} on {self.task.title}"
+
+
+# Upper bounds in seconds of the completion time buckets: under a minute,
+# then 25% wider each up to about two years, then everything above.
+COMPLETION_BUCKET_BOUNDS = tuple(round(60 * 1.25 ** power) for power in range(63))
+
+
+def empty_completion_buckets():
+    return [0] * (len(COMPLETION_BUCKET_BOUNDS) + 1)
+
+
+class UserTaskStats(models.Model):
+    """
+    Counts of the tasks assigned to a user, maintained by TaskStatsService
+    in the transactions that change tasks; the rebuild_task_stats command
+    repairs drift.
+
+    Completion times (completed_at - created_at) are kept as a histogram,
+    so the median is an estimate within the width of one bucket.
+    """
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='task_stats',
+    )
+    open_count = models.IntegerField(default=0, help_text="Assigned tasks not completed")
+    completed_count = models.IntegerField(default=0, help_text="Assigned tasks completed")
+    completion_buckets = ArrayField(
+        models.IntegerField(),
+        default=empty_completion_buckets,
+        help_text="Completed tasks per COMPLETION_BUCKET_BOUNDS bucket",
+    )
+
+    class Meta:
+        db_table = 'user_task_stats'
+        verbose_name = 'User task statistics'
+        verbose_name_plural = 'User task statistics'
+
+    def __str__(self):
+        return f"Task statistics of user {self.user_id}"
+
+    @staticmethod
+    def completion_bucket(task):
+        """
+        Return the completion time bucket of a completed task, or None.
+        """
+        if not task.is_completed or task.completed_at is None:
+            return None
+        seconds = max((task.completed_at - task.created_at).total_seconds(), 0)
+        return bisect_right(COMPLETION_BUCKET_BOUNDS, seconds)
+
+    def median_completion_seconds(self):
+        """
+        Estimate the median completion time in seconds from the histogram,
+        interpolating geometrically inside the median bucket.
+
+        Returns:
+            Seconds, or None without completed tasks
+        """
+        total = sum(self.completion_buckets)
+        if not total:
+            return None
+        seen = 0
+        for index, count in enumerate(self.completion_buckets):
+            if count and seen + count >= total / 2:
+                break
+            seen += count
+        fraction = (total / 2 - seen) / count
+        if index == len(COMPLETION_BUCKET_BOUNDS):
+            return float(COMPLETION_BUCKET_BOUNDS[-1])
+        upper = COMPLETION_BUCKET_BOUNDS[index]
+        if index == 0:
+            return upper * fraction
+        lower = COMPLETION_BUCKET_BOUNDS[index - 1]
+        return lower * (upper / lower) ** fraction
+
+
+# Id of the writing transaction, as a bigint (xid8 has no direct cast).
+CURRENT_TXID_SQL = 'pg_current_xact_id()::text::bigint'
+
+
+class ChangeLogEntry(models.Model):
+    """
+    Append-only log of task and comment changes, read by the sync endpoint.
+
+    Entries are written by the services in the transaction of the change
+    and only name the changed row; the sync endpoint serves its current
+    state. Entries are ordered by (txid, id) and only served once every
+    transaction with a smaller txid has ended, so a transaction that
+    commits late never lands behind a position a client already passed.
+    """
+    TASK = 'task'
+    COMMENT = 'comment'
+    KIND_CHOICES = [(TASK, 'Task'), (COMMENT, 'Comment')]
+
+    id = models.BigAutoField(primary_key=True)
+    txid = models.BigIntegerField(
+        db_default=RawSQL(CURRENT_TXID_SQL, []),
+        editable=False,
+        help_text="Id of the transaction that wrote the entry",
+    )
+    kind = models.CharField(max_length=7, choices=KIND_CHOICES)
+    uuid = models.UUIDField(help_text="UUID of the changed task or comment")
+    deleted = models.BooleanField(default=False, help_text="Whether the row was deleted")
+    created_at = models.DateTimeField(db_default=Now(), editable=False)
+
+    class Meta:
+        db_table = 'change_log'
+        verbose_name = 'Change log entry'
+        verbose_name_plural = 'Change log entries'
+        indexes = [
+            models.Index(fields=['txid', 'id'], name='change_log_position_idx'),
+        ]
+
+    def __str__(self):
+        action = 'deleted' if self.deleted else 'changed'
+        return f"{self.kind} {self.uuid} {action}"
+
+
+class ChangeLogHorizon(models.Model):
+    """
+    Position of the newest entry removed by change log compaction; sync
+    cursors before it have missed deletions and must start over.
+
+    The table holds at most one row.
+    """
+    txid = models.BigIntegerField()
+    entry_id = models.BigIntegerField()
+    compacted_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'change_log_horizon'
+        verbose_name = 'Change log horizon'
+
+    def __str__(self):
+        return f"Change log compacted up to {self.txid}.{self.entry_id}"
@@ -0,0 +1,37 @@
+"""
+PostgreSQL full-text search helpers for tasks and comments.
+"""
+from django.contrib.postgres.search import SearchQuery, SearchVector
+
+# Text search configuration of the task search vector column and the
+# comment text index. Queries must use the same configuration to match,
+# and changing it requires a migration.
+SEARCH_CONFIG = 'english'
+
+
+def task_search_vector():
+    """
+    Return the expression stored in ``Task.search_vector``.
+    Title matches weigh more than description matches in ranking.
+    """
+    return (
+        SearchVector('title', weight='A', config=SEARCH_CONFIG)
+        + SearchVector('description', weight='B', config=SEARCH_CONFIG)
+    )
+
+
+def comment_search_vector():
+    """
+    Return the comment text vector.
+    Identical to the expression of the comment GIN index, so lookups
+    against it can use the index.
+    """
+    return SearchVector('text', config=SEARCH_CONFIG)
+
+
+def build_search_query(text):
+    """
+    Parse user input with ``websearch_to_tsquery``, which accepts quoted
+    phrases, ``or`` and ``-word`` and never raises a syntax error.
+    """
+    return SearchQuery(text, search_type='websearch', config=SEARCH_CONFIG)
@@ -2,13 +2,18 @@
 Serializers for Task and Comment models.
 """
 from rest_framework import serializers
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
 from django.utils import timezone
-from apps.users.serializers import UserSerializer
+from apps.core.serializers import format_datetime, format_uuid
+from apps.core.sparse_fields import SparseFieldsetMixin
+from apps.core.timing import timed
+from apps.users.serializers import UserSerializer, UserRowSerializer
 from apps.users.models import User
-from .models import Task, Comment
+from .models import Task, Comment, UserTaskStats
 
 
-class TaskSerializer(serializers.ModelSerializer):
+class TaskSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Serializer for Task model.
     Handles UUID-based assignee field for API requests.
@@ -32,6 +37,8 @@ class TaskSerializer(serializers.ModelSerializer):
             'assignee_uuid',
             'is_completed',
             'completed_at',
+            'comment_count',
+            'last_activity_at',
             'created_at',
             'updated_at',
         ]
@@ -40,6 +47,8 @@ class TaskSerializer(serializers.ModelSerializer):
             'creator',
             'assignee',
             'completed_at',
+            'comment_count',
+            'last_activity_at',
             'created_at',
             'updated_at',
         ]
@@ -58,7 +67,140 @@ class TaskSerializer(serializers.ModelSerializer):
         return attrs
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class TaskBulkCreateSerializer(TaskSerializer):
+    """
+    Serializer for one create item of a bulk request.
+    Assignees are resolved for all items at once by TaskBulkSerializer.
+    """
+
+    def validate(self, attrs):
+        return attrs
+
+
+class TaskBulkUpdateSerializer(TaskBulkCreateSerializer):
+    """
+    Serializer for one patch item of a bulk request, addressed by uuid.
+    """
+    uuid = serializers.UUIDField()
+
+    class Meta(TaskBulkCreateSerializer.Meta):
+        extra_kwargs = {'title': {'required': False}}
+
+
+class TaskBulkSerializer(serializers.Serializer):
+    """
+    Serializer for bulk task operations.
+
+    Validates every item in one pass: assignees of all items are fetched
+    with one query and target tasks of all patches and deletes with another
+    (locked FOR UPDATE), so the request must be validated inside the
+    transaction that applies it. Errors are reported per item, aligned with
+    the submitted lists.
+    """
+    max_items = 1000
+
+    create = TaskBulkCreateSerializer(many=True, required=False, max_length=max_items)
+    update = TaskBulkUpdateSerializer(many=True, required=False, max_length=max_items)
+    delete = serializers.ListField(
+        child=serializers.UUIDField(),
+        required=False,
+        max_length=max_items,
+    )
+
+    def validate(self, attrs):
+        """
+        Resolve assignees and target tasks and collect per-item errors.
+        """
+        creates = attrs.get('create', [])
+        updates = attrs.get('update', [])
+        deletes = attrs.get('delete', [])
+        if not (creates or updates or deletes):
+            raise serializers.ValidationError("At least one operation is required.")
+
+        assignees = User.objects.in_bulk(
+            {item['assignee_uuid'] for item in creates + updates
+             if item.get('assignee_uuid') is not None},
+            field_name='uuid',
+        )
+        tasks = Task.objects.select_related('creator', 'assignee').select_for_update(
+            of=('self',)
+        ).in_bulk(
+            [item['uuid'] for item in updates] + deletes,
+            field_name='uuid',
+        )
+        user = self.context['request'].user
+        seen = set()
+
+        create_errors = [self._resolve_assignee(item, assignees) for item in creates]
+
+        update_errors = []
+        for item in updates:
+            task_uuid = item.pop('uuid')
+            item_errors = self._resolve_task(task_uuid, tasks, seen)
+            if not item_errors:
+                item['task'] = tasks[task_uuid]
+            item_errors.update(self._resolve_assignee(item, assignees))
+            update_errors.append(item_errors)
+
+        delete_errors = []
+        resolved_deletes = []
+        for task_uuid in deletes:
+            item_errors = self._resolve_task(task_uuid, tasks, seen)
+            if not item_errors:
+                task = tasks[task_uuid]
+                if user.pk in (task.creator_id, task.assignee_id):
+                    resolved_deletes.append(task)
+                else:
+                    item_errors['uuid'] = [
+                        "You do not have permission to delete this task."
+                    ]
+            delete_errors.append(item_errors)
+
+        errors = {
+            operation: item_errors
+            for operation, item_errors in (
+                ('create', create_errors),
+                ('update', update_errors),
+                ('delete', delete_errors),
+            )
+            if any(item_errors)
+        }
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        attrs['delete'] = resolved_deletes
+        return attrs
+
+    @staticmethod
+    def _resolve_assignee(item, assignees):
+        assignee_uuid = item.pop('assignee_uuid', None)
+        if assignee_uuid is None:
+            return {}
+        if assignee_uuid not in assignees:
+            return {'assignee_uuid': ["User with this UUID does not exist."]}
+        item['assignee'] = assignees[assignee_uuid]
+        return {}
+
+    @staticmethod
+    def _resolve_task(task_uuid, tasks, seen):
+        if task_uuid in seen:
+            return {'uuid': ["Task appears more than once in this request."]}
+        seen.add(task_uuid)
+        if task_uuid not in tasks:
+            return {'uuid': ["Task with this UUID does not exist."]}
+        return {}
+
+
+class TaskBulkResultSerializer(serializers.Serializer):
+    """
+    Serializer for the result of bulk task operations.
+    """
+    created = TaskSerializer(many=True)
+    updated = TaskSerializer(many=True)
+    deleted = serializers.ListField(child=serializers.UUIDField())
+
+
+class CommentSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Serializer for Comment model.
     """
@@ -76,3 +218,238 @@ class CommentSerializer(serializers.ModelSerializer):
             'updated_at',
         ]
         read_only_fields = ['uuid', 'task_uuid', 'author', 'created_at', 'updated_at']
+
+
+class SyncResultSerializer(serializers.Serializer):
+    """
+    Serializer for a page of changes from the sync endpoint.
+    """
+    cursor = serializers.CharField(help_text="Pass as since to read the next changes")
+    more = serializers.BooleanField(help_text="Whether more changes follow")
+    reset = serializers.BooleanField(
+        help_text="since was compacted away: drop the local copy, "
+                  "this page starts a full sync"
+    )
+    tasks = TaskSerializer(many=True)
+    comments = CommentSerializer(many=True)
+    deleted_tasks = serializers.ListField(child=serializers.UUIDField())
+    deleted_comments = serializers.ListField(child=serializers.UUIDField())
+
+
+class UserTaskStatsSerializer(serializers.ModelSerializer):
+    """
+    Serializer for UserTaskStats. Users without a statistics row are
+    serialized from an unsaved instance, i.e. with zero counts.
+    """
+    user = serializers.UUIDField(source='user.uuid', read_only=True)
+    median_completion_seconds = serializers.FloatField(allow_null=True, read_only=True)
+
+    class Meta:
+        model = UserTaskStats
+        fields = [
+            'user',
+            'open_count',
+            'completed_count',
+            'median_completion_seconds',
+        ]
+        read_only_fields = fields
+
+
+class RowSerializer:
+    """
+    Base class for fast read-only serializers of ``values()`` rows.
+
+    Subclasses describe their output fields in ``formatters`` (field name to
+    a callable formatting it from a row) and ``user_fields`` (nested users
+    rendered by UserRowSerializer), in output order given by
+    ``serializer_class``. A SparseFieldset limits both the output and the
+    columns fetched by :meth:`get_queryset`. ``extra_fields`` are queryset
+    annotations passed through unformatted after the regular fields.
+    """
+    serializer_class = None
+    formatters = {}
+    columns = {}
+    user_fields = ()
+
+    def __init__(self, rows, fieldset=None, extra_fields=()):
+        self.rows = rows
+        fields = self.get_fields(fieldset)
+        self.users = {
+            name: UserRowSerializer(fieldset.subfields(name) if fieldset else None)
+            for name in self.user_fields
+            if name in fields
+        }
+        self._getters = [
+            (name, self._get_user_getter(name) if name in self.users else self.formatters[name])
+            for name in fields
+        ]
+        self._getters.extend((name, _column(name)) for name in extra_fields)
+
+    @classmethod
+    def get_fields(cls, fieldset=None):
+        """
+        Return the output field names selected by ``fieldset``.
+        """
+        if fieldset is not None:
+            return fieldset.fields
+        return [
+            name for name in cls.serializer_class.Meta.fields
+            if name in cls.formatters or name in cls.user_fields
+        ]
+
+    @classmethod
+    def get_queryset(cls, queryset, fieldset=None, extra_fields=()):
+        """
+        Turn a queryset into a ``values()`` queryset of flat rows.
+
+        Only columns of selected fields are fetched, plus ``id`` and the
+        ordering columns that keyset pagination reads from the rows. User
+        tables are joined only for selected user fields.
+        """
+        ordering = queryset.query.order_by or queryset.model._meta.ordering
+        value_fields = {'id': None}
+        value_fields.update(
+            (field.lstrip('-'), None) for field in ordering if isinstance(field, str)
+        )
+        for name in cls.get_fields(fieldset):
+            if name in cls.user_fields:
+                subfields = fieldset.subfields(name) if fieldset else None
+                value_fields.update(
+                    (field, None) for field in UserRowSerializer.get_value_fields(name, subfields)
+                )
+            else:
+                value_fields[cls.columns.get(name, name)] = None
+        value_fields.update((name, None) for name in extra_fields)
+        return queryset.values(*value_fields)
+
+    @property
+    def data(self):
+        with timed('serialize'):
+            return [self.to_representation(row) for row in self.rows]
+
+    def to_representation(self, row):
+        return {name: getter(row) for name, getter in self._getters}
+
+    def get_flat_fields(self):
+        """
+        Return the output field names with nested users flattened to
+        ``<field>.<subfield>``, as in :meth:`to_flat_representation`.
+        """
+        names = []
+        for name, _ in self._getters:
+            if name in self.users:
+                names.extend(f'{name}.{field}' for field in self.users[name].fields)
+            else:
+                names.append(name)
+        return names
+
+    def to_flat_representation(self, row):
+        """
+        Return the values of ``row`` as a flat list; a missing user fills
+        its columns with None.
+        """
+        values = []
+        for name, getter in self._getters:
+            value = getter(row)
+            if name in self.users:
+                fields = self.users[name].fields
+                values.extend(
+                    [None] * len(fields) if value is None else (value[field] for field in fields)
+                )
+            else:
+                values.append(value)
+        return values
+
+    def _get_user_getter(self, name):
+        users = self.users[name]
+        return lambda row: users.to_representation(row, name)
+
+
+def _column(name, formatter=None):
+    """
+    Return a row getter for ``name``, optionally passed through ``formatter``.
+    """
+    if formatter is None:
+        return lambda row: row[name]
+    return lambda row: formatter(row[name])
+
+
+class TaskRowSerializer(RowSerializer):
+    """
+    Fast read-only serializer for task listings.
+
+    Produces the same output as TaskSerializer from flat ``values()`` rows
+    fetched by :meth:`get_queryset`.
+    """
+    serializer_class = TaskSerializer
+    formatters = {
+        'uuid': _column('uuid', format_uuid),
+        'title': _column('title'),
+        'description': _column('description'),
+        'is_completed': _column('is_completed'),
+        'completed_at': _column('completed_at', format_datetime),
+        'comment_count': _column('comment_count'),
+        'last_activity_at': _column('last_activity_at', format_datetime),
+        'created_at': _column('created_at', format_datetime),
+        'updated_at': _column('updated_at', format_datetime),
+    }
+    user_fields = ('creator', 'assignee')
+
+
+class CommentRowSerializer(RowSerializer):
+    """
+    Fast read-only serializer for comment listings.
+
+    Produces the same output as CommentSerializer from flat ``values()``
+    rows fetched by :meth:`get_queryset`.
+    """
+    serializer_class = CommentSerializer
+    formatters = {
+        'uuid': _column('uuid', format_uuid),
+        'task_uuid': _column('task__uuid', format_uuid),
+        'text': _column('text'),
+        'created_at': _column('created_at', format_datetime),
+        'updated_at': _column('updated_at', format_datetime),
+    }
+    columns = {'task_uuid': 'task__uuid'}
+    user_fields = ('author',)
+
+    @classmethod
+    def get_recent(cls, task_ids, limit):
+        """
+        Return the ``limit`` newest comments of each task, keyed by task id.
+
+        All tasks are served by one query ranking comments with
+        ``ROW_NUMBER() OVER (PARTITION BY task_id ORDER BY created_at DESC)``,
+        so the result is bounded by ``limit`` per task however many comments
+        a task has.
+        """
+        return cls.group_recent(task_ids, cls.get_recent_queryset(task_ids, limit))
+
+    @classmethod
+    async def aget_recent(cls, task_ids, limit):
+        """
+        Async variant of :meth:`get_recent`.
+        """
+        queryset = cls.get_recent_queryset(task_ids, limit)
+        return cls.group_recent(task_ids, [row async for row in queryset])
+
+    @classmethod
+    def get_recent_queryset(cls, task_ids, limit):
+        queryset = Comment.objects.filter(task_id__in=task_ids).annotate(
+            position=Window(
+                RowNumber(),
+                partition_by=F('task_id'),
+                order_by=[F('created_at').desc(), F('id').desc()],
+            ),
+        ).filter(position__lte=limit).order_by('task_id', '-created_at', '-id')
+        return cls.get_queryset(queryset)
+
+    @classmethod
+    def group_recent(cls, task_ids, rows):
+        # Rows carry task_id because get_queryset keeps the ordering columns.
+        serializer = cls(rows)
+        comments = {task_id: [] for task_id in task_ids}
+        for row in serializer.rows:
+            comments[row['task_id']].append(serializer.to_representation(row))
+        return comments
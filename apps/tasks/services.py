@@ -2,8 +2,25 @@
 Service layer for business logic related to tasks and comments.
 """
 import logging
+from functools import partial
+from django.db import connection, transaction
+from django.db.models import Count, F, Max, OuterRef, Q, Subquery, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Coalesce, Greatest
 from django.utils import timezone
-from .models import Task, Comment
+from apps.core.metrics import registry as metrics
+from apps.webhooks.models import COMMENT_CREATED, TASK_COMPLETED, TASK_CREATED
+from apps.webhooks.services import WebhookService
+from .cache import TaskListCache
+from .models import (
+    COMPLETION_BUCKET_BOUNDS,
+    ChangeLogEntry,
+    ChangeLogHorizon,
+    Comment,
+    Task,
+    UserTaskStats,
+    empty_completion_buckets,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -28,15 +45,22 @@ class TaskService:
         # Remove assignee_uuid from validated_data
         validated_data.pop('assignee_uuid', None)
         validated_data['creator'] = creator
-        task = Task.objects.create(**validated_data)
-        logger.info(f"User uuid {creator.uuid} created task uuid {task.uuid}")
+        with transaction.atomic():
+            task = Task.objects.create(**validated_data)
+            TaskStatsService.apply([(None, TaskStatsService.contribution(task))])
+            ChangeLogService.record([(task, False)])
+            WebhookService.enqueue([(TASK_CREATED, WebhookService.task_payload(task))])
+        transaction.on_commit(TaskListCache.invalidate)
+        transaction.on_commit(partial(metrics.inc, 'tasks_created_total'))
+        logger.info("User uuid %s created task uuid %s", creator.uuid, task.uuid)
         return task
     
     @staticmethod
     def update_task(task, validated_data):
         """
         Update an existing task.
-        Automatically sets completed_at when is_completed changes to True.
+        Automatically sets completed_at when is_completed changes to True,
+        and queues a task.completed webhook event.
 
         Args:
             task: Task instance to update
@@ -47,7 +71,33 @@ class TaskService:
         """
         # Remove assignee_uuid from validated_data
         validated_data.pop('assignee_uuid', None)
+        completing = validated_data.get('is_completed') and not task.is_completed
+        TaskService.apply_completion_rules(task, validated_data)
 
+        # Update task fields
+        for field, value in validated_data.items():
+            setattr(task, field, value)
+
+        with transaction.atomic():
+            before = TaskStatsService.stored_contribution(task)
+            task.save()
+            TaskStatsService.apply([(before, TaskStatsService.contribution(task))])
+            ChangeLogService.record([(task, False)])
+            if completing:
+                WebhookService.enqueue([(TASK_COMPLETED, WebhookService.task_payload(task))])
+        transaction.on_commit(TaskListCache.invalidate)
+        logger.info("Task uuid %s updated", task.uuid)
+        return task
+
+    @staticmethod
+    def apply_completion_rules(task, validated_data):
+        """
+        Set or clear completed_at in validated_data when is_completed changes.
+
+        Args:
+            task: Task instance before the update
+            validated_data: Validated data from serializer, modified in place
+        """
         # Check if is_completed is changing from False to True
         if 'is_completed' in validated_data:
             new_is_completed = validated_data['is_completed']
@@ -60,13 +110,138 @@ class TaskService:
             elif not new_is_completed and old_is_completed:
                 validated_data['completed_at'] = None
 
-        # Update task fields
-        for field, value in validated_data.items():
-            setattr(task, field, value)
+    @staticmethod
+    def bulk_apply(validated_data, user):
+        """
+        Apply bulk create, update and delete operations in one transaction.
 
-        task.save()
-        logger.info(f"Task uuid {task.uuid} updated")
-        return task
+        Rows are written with one bulk_create, one bulk_update and one
+        DELETE; completed_at and webhook events follow the same rules as
+        create_task and update_task.
+
+        Args:
+            validated_data: Validated data from TaskBulkSerializer, with
+                assignees and target tasks already resolved
+            user: User instance performing the operations
+
+        Returns:
+            Dict with created and updated Task lists and deleted task UUIDs
+        """
+        creates = validated_data.get('create', [])
+        updates = validated_data.get('update', [])
+        deletes = validated_data.get('delete', [])
+
+        with transaction.atomic():
+            tasks = [Task(creator=user, **item) for item in creates]
+            for task in tasks:
+                # bulk_create bypasses Task.save().
+                task.last_activity_at = task.created_at
+            created = Task.objects.bulk_create(tasks, batch_size=500)
+            changes = [(None, TaskStatsService.contribution(task)) for task in created]
+
+            now = timezone.now()
+            updated = []
+            completed = []
+            update_fields = set()
+            for item in updates:
+                task = item.pop('task')
+                before = TaskStatsService.contribution(task)
+                if item.get('is_completed') and not task.is_completed:
+                    completed.append(task)
+                TaskService.apply_completion_rules(task, item)
+                for field, value in item.items():
+                    setattr(task, field, value)
+                update_fields.update(item)
+                task.updated_at = now
+                updated.append(task)
+                changes.append((before, TaskStatsService.contribution(task)))
+            if updated:
+                Task.objects.bulk_update(
+                    updated,
+                    fields=sorted(update_fields | {'updated_at'}),
+                    batch_size=500,
+                )
+
+            if created or updated:
+                ChangeLogService.record([(task, False) for task in created + updated])
+            WebhookService.enqueue(
+                [(TASK_CREATED, WebhookService.task_payload(task)) for task in created]
+                + [(TASK_COMPLETED, WebhookService.task_payload(task)) for task in completed]
+            )
+
+            deleted = [task.uuid for task in deletes]
+            if deletes:
+                deleted_tasks = Task.objects.filter(pk__in=[task.pk for task in deletes])
+                ChangeLogService.record_task_deletion(deleted_tasks)
+                deleted_tasks.delete()
+            changes += [(TaskStatsService.contribution(task), None) for task in deletes]
+            TaskStatsService.apply(changes)
+
+            transaction.on_commit(TaskListCache.invalidate)
+            if created:
+                transaction.on_commit(
+                    partial(metrics.inc, 'tasks_created_total', amount=len(created))
+                )
+
+        logger.info(
+            "User uuid %s bulk created %d, updated %d, deleted %d tasks",
+            user.uuid, len(created), len(updated), len(deleted),
+        )
+        return {'created': created, 'updated': updated, 'deleted': deleted}
+
+    @staticmethod
+    def delete_task(task):
+        """
+        Delete a task together with its comments.
+
+        Args:
+            task: Task instance to delete
+        """
+        with transaction.atomic():
+            TaskStatsService.apply([(TaskStatsService.stored_contribution(task), None)])
+            ChangeLogService.record_task_deletion(Task.objects.filter(pk=task.pk))
+            task.delete()
+        transaction.on_commit(TaskListCache.invalidate)
+
+    @staticmethod
+    def recompute_counters(queryset):
+        """
+        Recompute comment_count and last_activity_at from the comments table.
+
+        Only tasks whose stored values drifted are written, in one UPDATE,
+        and added to the change log.
+
+        Args:
+            queryset: Task queryset limiting the tasks to check
+
+        Returns:
+            Number of tasks updated
+        """
+        comments = Comment.objects.filter(task=OuterRef('pk')).order_by().values('task')
+        comment_count = Coalesce(
+            Subquery(comments.annotate(total=Count('pk')).values('total')), 0
+        )
+        # GREATEST ignores NULLs on PostgreSQL, so tasks without comments
+        # fall back to created_at.
+        last_activity_at = Greatest(
+            F('created_at'),
+            Subquery(comments.annotate(latest=Max('created_at')).values('latest')),
+        )
+        drifted = queryset.annotate(
+            actual_count=comment_count,
+            actual_activity=last_activity_at,
+        ).filter(
+            ~Q(comment_count=F('actual_count')) | ~Q(last_activity_at=F('actual_activity'))
+        )
+        changed = Task.objects.filter(pk__in=list(drifted.values_list('pk', flat=True)))
+        updated = changed.update(
+            comment_count=comment_count,
+            last_activity_at=last_activity_at,
+            updated_at=timezone.now(),
+        )
+        if updated:
+            ChangeLogService.record_rows([changed])
+        return updated
 
 
 class CommentService:
@@ -78,6 +253,8 @@ class CommentService:
     def create_comment(validated_data, author, task):
         """
         Create a new comment.
+        The task's comment_count and last_activity_at are updated with
+        F-expressions in the same transaction.
 
         Args:
             validated_data: Validated data from serializer
@@ -89,6 +266,381 @@ class CommentService:
         """
         validated_data['author'] = author
         validated_data['task'] = task
-        comment = Comment.objects.create(**validated_data)
-        logger.info(f"User uuid {author.uuid} created comment uuid {comment.uuid} on task uuid {task.uuid}")
-        return comment
\ No newline at end of file
+        with transaction.atomic():
+            comment = Comment.objects.create(**validated_data)
+            Task.objects.filter(pk=task.pk).update(
+                comment_count=F('comment_count') + 1,
+                last_activity_at=Greatest(F('last_activity_at'), Value(comment.created_at)),
+                updated_at=comment.created_at,
+            )
+            ChangeLogService.record([(comment, False), (task, False)])
+            WebhookService.enqueue([(COMMENT_CREATED, WebhookService.comment_payload(comment))])
+        transaction.on_commit(TaskListCache.invalidate)
+        transaction.on_commit(partial(metrics.inc, 'comments_created_total'))
+        logger.info("User uuid %s created comment uuid %s on task uuid %s",
+                    author.uuid, comment.uuid, task.uuid)
+        return comment
+
+    @staticmethod
+    def delete_comment(comment):
+        """
+        Delete a comment and update the task's comment counters.
+
+        Args:
+            comment: Comment instance to delete
+        """
+        latest = Comment.objects.filter(task=OuterRef('pk')).order_by('-created_at')
+        with transaction.atomic():
+            comment.delete()
+            Task.objects.filter(pk=comment.task_id).update(
+                comment_count=Greatest(F('comment_count') - 1, 0),
+                # GREATEST ignores the NULL of a task without comments.
+                last_activity_at=Greatest(
+                    F('created_at'), Subquery(latest.values('created_at')[:1])
+                ),
+                updated_at=timezone.now(),
+            )
+            ChangeLogService.record([(comment, True), (comment.task, False)])
+        transaction.on_commit(TaskListCache.invalidate)
+        logger.info("Comment uuid %s deleted", comment.uuid)
+
+    @staticmethod
+    def delete_comments(queryset):
+        """
+        Delete several comments and recompute the counters of their tasks.
+
+        Args:
+            queryset: Comment queryset to delete
+        """
+        with transaction.atomic():
+            task_ids = set(queryset.values_list('task_id', flat=True))
+            ChangeLogService.record_rows([queryset], deleted=True)
+            queryset.delete()
+            TaskService.recompute_counters(Task.objects.filter(pk__in=task_ids))
+        transaction.on_commit(TaskListCache.invalidate)
+        logger.info("Comments deleted on %d tasks", len(task_ids))
+
+
+class TaskStatsService:
+    """
+    Service maintaining UserTaskStats, the per-assignee task counts.
+
+    Callers describe each task change as a ``(before, after)`` pair of
+    contributions (see :meth:`contribution`); the differences are added to
+    the statistics rows in one statement, in the caller's transaction.
+    """
+
+    # Adds delta rows to the statistics, creating missing rows.
+    UPSERT_SQL = """
+        INSERT INTO user_task_stats AS stats
+            (user_id, open_count, completed_count, completion_buckets)
+        VALUES {values}
+        ON CONFLICT (user_id) DO UPDATE SET
+            open_count = stats.open_count + EXCLUDED.open_count,
+            completed_count = stats.completed_count + EXCLUDED.completed_count,
+            completion_buckets = ARRAY(
+                SELECT old + delta
+                FROM unnest(stats.completion_buckets, EXCLUDED.completion_buckets)
+                    WITH ORDINALITY AS bucket(old, delta, position)
+                ORDER BY position
+            )
+    """
+    # Recomputes the statistics of assignees in [start, stop) from tasks,
+    # writes the rows that differ and returns them. width_bucket() counts
+    # the bounds <= the completion time, like bisect_right() in Python.
+    REBUILD_SQL = """
+        WITH completions AS (
+            SELECT assignee_id AS user_id,
+                   width_bucket(GREATEST(EXTRACT(EPOCH FROM completed_at - created_at), 0),
+                                %(bounds)s::numeric[]) AS bucket,
+                   COUNT(*) AS total
+            FROM tasks
+            WHERE assignee_id >= %(start)s AND assignee_id < %(stop)s
+                AND is_completed AND completed_at IS NOT NULL
+            GROUP BY 1, 2
+        ), fresh AS (
+            SELECT assignee_id AS user_id,
+                   COUNT(*) FILTER (WHERE NOT is_completed) AS open_count,
+                   COUNT(*) FILTER (WHERE is_completed) AS completed_count,
+                   ARRAY(
+                       SELECT COALESCE(completions.total, 0)::integer
+                       FROM generate_series(0, %(last)s) AS bucket(position)
+                       LEFT JOIN completions ON completions.user_id = tasks.assignee_id
+                           AND completions.bucket = bucket.position
+                       ORDER BY bucket.position
+                   ) AS completion_buckets
+            FROM tasks
+            WHERE assignee_id >= %(start)s AND assignee_id < %(stop)s
+            GROUP BY assignee_id
+        ), drifted AS (
+            SELECT user_id,
+                   COALESCE(fresh.open_count, 0) AS open_count,
+                   COALESCE(fresh.completed_count, 0) AS completed_count,
+                   COALESCE(fresh.completion_buckets, %(zeros)s::integer[]) AS completion_buckets
+            FROM fresh
+            FULL JOIN (
+                SELECT * FROM user_task_stats WHERE user_id >= %(start)s AND user_id < %(stop)s
+            ) AS stored USING (user_id)
+            WHERE (COALESCE(fresh.open_count, 0), COALESCE(fresh.completed_count, 0),
+                   COALESCE(fresh.completion_buckets, %(zeros)s::integer[]))
+                IS DISTINCT FROM
+                  (COALESCE(stored.open_count, 0), COALESCE(stored.completed_count, 0),
+                   COALESCE(stored.completion_buckets, %(zeros)s::integer[]))
+        )
+        INSERT INTO user_task_stats (user_id, open_count, completed_count, completion_buckets)
+        SELECT * FROM drifted
+        ON CONFLICT (user_id) DO UPDATE SET
+            open_count = EXCLUDED.open_count,
+            completed_count = EXCLUDED.completed_count,
+            completion_buckets = EXCLUDED.completion_buckets
+        RETURNING user_id
+    """
+
+    @staticmethod
+    def contribution(task):
+        """
+        Return what ``task`` adds to its assignee's statistics.
+
+        Args:
+            task: Task instance
+
+        Returns:
+            Tuple (assignee id, is_completed, completion bucket or None), or
+            None for unassigned tasks
+        """
+        if task.assignee_id is None:
+            return None
+        return (task.assignee_id, task.is_completed, UserTaskStats.completion_bucket(task))
+
+    @staticmethod
+    def stored_contribution(task):
+        """
+        Return the contribution of ``task`` as stored, locking its row until
+        the end of the transaction so concurrent changes are applied in turn.
+
+        Args:
+            task: Task instance, possibly modified but not saved
+
+        Returns:
+            Contribution as returned by :meth:`contribution`, or None if the
+            task no longer exists
+        """
+        stored = Task.objects.select_for_update().only(
+            'assignee_id', 'is_completed', 'completed_at', 'created_at'
+        ).filter(pk=task.pk).first()
+        if stored is None:
+            return None
+        return TaskStatsService.contribution(stored)
+
+    @staticmethod
+    def apply(changes):
+        """
+        Add task changes to the statistics.
+
+        Args:
+            changes: Iterable of (before, after) contributions; None stands
+                for a task that did not exist or is not assigned
+        """
+        deltas = {}
+        for before, after in changes:
+            if before == after:
+                continue
+            for contribution, sign in ((before, -1), (after, 1)):
+                if contribution is None:
+                    continue
+                user_id, is_completed, bucket = contribution
+                delta = deltas.setdefault(user_id, [0, 0, empty_completion_buckets()])
+                delta[1 if is_completed else 0] += sign
+                if bucket is not None:
+                    delta[2][bucket] += sign
+        deltas = {user_id: delta for user_id, delta in deltas.items() if any(delta[:2]) or any(delta[2])}
+        if not deltas:
+            return
+
+        # Rows in user id order, so concurrent writers lock them in the
+        # same order.
+        params = []
+        for user_id, (opened, completed, buckets) in sorted(deltas.items()):
+            params += [user_id, opened, completed, buckets]
+        values = ', '.join(['(%s, %s, %s, %s::integer[])'] * len(deltas))
+        with connection.cursor() as cursor:
+            cursor.execute(TaskStatsService.UPSERT_SQL.format(values=values), params)
+
+    @staticmethod
+    def rebuild(start, stop):
+        """
+        Recompute the statistics of users with ids in [start, stop) from
+        the tasks table, writing only rows that drifted.
+
+        The table is locked against concurrent writers for the duration of
+        the caller's transaction, so no change is counted twice or lost.
+
+        Args:
+            start: First user id
+            stop: User id after the last one
+
+        Returns:
+            Number of users whose statistics were corrected
+        """
+        with connection.cursor() as cursor:
+            cursor.execute('LOCK TABLE user_task_stats IN SHARE ROW EXCLUSIVE MODE')
+            cursor.execute(TaskStatsService.REBUILD_SQL, {
+                'start': start,
+                'stop': stop,
+                'bounds': list(COMPLETION_BUCKET_BOUNDS),
+                'last': len(COMPLETION_BUCKET_BOUNDS),
+                'zeros': empty_completion_buckets(),
+            })
+            return cursor.rowcount
+
+
+class ChangeLogService:
+    """
+    Service writing and reading the change log behind the sync endpoint.
+
+    Positions in the log are ``(txid, id)`` tuples; ``(0, 0)`` is the start.
+    """
+    KINDS = {Task: ChangeLogEntry.TASK, Comment: ChangeLogEntry.COMMENT}
+    START = (0, 0)
+
+    # Transactions with smaller ids have all ended, so no entry can still
+    # appear before a position below it.
+    VISIBLE_TXID_SQL = 'pg_snapshot_xmin(pg_current_snapshot())::text::bigint'
+    # Entries followed by a newer entry for the same row.
+    SUPERSEDED_SQL = """
+        DELETE FROM change_log WHERE id IN (
+            SELECT id FROM (
+                SELECT id, row_number() OVER (
+                    PARTITION BY kind, uuid ORDER BY txid DESC, id DESC
+                ) AS rank
+                FROM change_log
+            ) AS ranked
+            WHERE rank > 1
+        )
+    """
+    # Deletions older than the cutoff; returns their count and the last
+    # position removed.
+    TOMBSTONES_SQL = """
+        WITH removed AS (
+            DELETE FROM change_log WHERE deleted AND created_at < %s RETURNING txid, id
+        )
+        SELECT (SELECT count(*) FROM removed), txid, id
+        FROM removed
+        ORDER BY txid DESC, id DESC
+        LIMIT 1
+    """
+
+    @staticmethod
+    def record(changes):
+        """
+        Log changes of single rows, with one INSERT.
+
+        Args:
+            changes: Iterable of (model instance, deleted) pairs
+        """
+        ChangeLogEntry.objects.bulk_create([
+            ChangeLogEntry(kind=ChangeLogService.KINDS[type(instance)], uuid=instance.uuid,
+                           deleted=deleted)
+            for instance, deleted in changes
+        ])
+
+    @staticmethod
+    def record_rows(querysets, deleted=False):
+        """
+        Log a change of every row of task and comment querysets, with one
+        INSERT ... SELECT.
+
+        Args:
+            querysets: Task or Comment querysets
+            deleted: Whether the rows are about to be deleted
+        """
+        selects = [
+            queryset.order_by().annotate(
+                change_kind=Value(ChangeLogService.KINDS[queryset.model])
+            ).values('change_kind', 'uuid')
+            for queryset in querysets
+        ]
+        sql, params = selects[0].union(*selects[1:], all=True).query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO change_log (kind, uuid, deleted) '
+                f'SELECT change_kind, uuid, %s FROM ({sql}) AS changed',
+                [deleted, *params],
+            )
+
+    @staticmethod
+    def record_task_deletion(tasks):
+        """
+        Log the deletion of tasks and of their comments.
+
+        Args:
+            tasks: Task queryset about to be deleted
+        """
+        ChangeLogService.record_rows(
+            [Comment.objects.filter(task__in=tasks.values('pk')), tasks], deleted=True
+        )
+
+    @staticmethod
+    def read(position, limit):
+        """
+        Read the entries after ``position`` whose transactions are visible
+        to every later reader.
+
+        Args:
+            position: (txid, id) tuple
+            limit: Maximum number of entries
+
+        Returns:
+            Tuple (list of (txid, id, kind, uuid, deleted) tuples, whether
+            more entries follow)
+        """
+        txid, entry_id = position
+        entries = list(
+            ChangeLogEntry.objects.filter(
+                Q(txid__gt=txid) | Q(id__gt=entry_id),
+                txid__gte=txid,
+                txid__lt=RawSQL(ChangeLogService.VISIBLE_TXID_SQL, []),
+            ).order_by('txid', 'id').values_list(
+                'txid', 'id', 'kind', 'uuid', 'deleted'
+            )[:limit + 1]
+        )
+        return entries[:limit], len(entries) > limit
+
+    @staticmethod
+    def horizon():
+        """
+        Return the last position removed by compaction, or None.
+        """
+        horizon = ChangeLogHorizon.objects.values_list('txid', 'entry_id').first()
+        return tuple(horizon) if horizon else None
+
+    @staticmethod
+    def compact(deletions_before):
+        """
+        Remove superseded entries, and deletions older than
+        ``deletions_before``; cursors before a removed deletion then need
+        a full sync.
+
+        Args:
+            deletions_before: Datetime; older deletion entries are removed
+
+        Returns:
+            Tuple (superseded entries removed, deletion entries removed)
+        """
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(ChangeLogService.SUPERSEDED_SQL)
+            superseded = cursor.rowcount
+            cursor.execute(ChangeLogService.TOMBSTONES_SQL, [deletions_before])
+            row = cursor.fetchone()
+            if row is None:
+                return superseded, 0
+            removed, txid, entry_id = row
+            horizon = ChangeLogHorizon.objects.select_for_update().first()
+            if horizon is None:
+                ChangeLogHorizon.objects.create(pk=1, txid=txid, entry_id=entry_id)
+            elif (txid, entry_id) > (horizon.txid, horizon.entry_id):
+                horizon.txid, horizon.entry_id = txid, entry_id
+                horizon.save()
+        logger.info("Change log compacted: %d superseded and %d deletion entries removed",
+                    superseded, removed)
+        return superseded, removed
@@ -1,15 +1,16 @@
 """
-URL routing for tasks and comments.
+URL routing for tasks, comments and sync.
 """
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from rest_framework_nested import routers
 
-from .views import TaskViewSet, CommentViewSet
+from .views import TaskViewSet, CommentViewSet, SyncViewSet
 
 # Main router for tasks
 router = DefaultRouter()
 router.register(r'tasks', TaskViewSet, basename='task')
+router.register(r'sync', SyncViewSet, basename='sync')
 
 # Nested router for comments under tasks
 tasks_router = routers.NestedDefaultRouter(router, r'tasks', lookup='task')
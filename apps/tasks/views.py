@@ -2,52 +2,430 @@
 ViewSets for Task and Comment APIs.
 """
 import logging
+from functools import partial
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
 from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import OrderingFilter
+from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 
-from .models import Task, Comment
-from .serializers import TaskSerializer, CommentSerializer
-from .services import TaskService, CommentService
+from apps.core.async_views import AsyncViewSetMixin
+from apps.core.conditional import ConditionalGetMixin, set_validator_headers
+from apps.core.export import EXPORT_RENDERERS, astream_export, stream_export
+from apps.core.pagination import LimitOffsetKeysetPagination
+from apps.core.replicas import ReplicaReadMixin
+from apps.core.sparse_fields import SparseFieldsetViewMixin
+from .cache import TaskListCache
+from .models import ChangeLogEntry, Task, Comment
+from .serializers import (
+    TaskSerializer,
+    CommentSerializer,
+    TaskRowSerializer,
+    CommentRowSerializer,
+    TaskBulkSerializer,
+    TaskBulkResultSerializer,
+    SyncResultSerializer,
+)
+from .services import ChangeLogService, TaskService, CommentService
 from .permissions import IsTaskOwnerOrAssignee
-from .filters import TaskFilter
+from .filters import TaskFilter, TaskOrderingFilter, TaskSearchFilter
 
 logger = logging.getLogger(__name__)
 
+FILTER_PARAMETERS = [
+    OpenApiParameter(name='creator', type=str,
+                     description='Filter by creator UUID(s), comma-separated'),
+    OpenApiParameter(name='assignee', type=str,
+                     description='Filter by assignee UUID(s), comma-separated'),
+    OpenApiParameter(name='assignee__isnull', type=bool,
+                     description='Filter unassigned (true) or assigned (false) tasks'),
+    OpenApiParameter(name='is_completed', type=bool,
+                     description='Filter by completion status'),
+    OpenApiParameter(name='comment_count__gte', type=int,
+                     description='Minimum number of comments'),
+    OpenApiParameter(name='comment_count__lte', type=int,
+                     description='Maximum number of comments'),
+    OpenApiParameter(name='last_activity_at__gte', type=str,
+                     description='Last activity at or after (ISO 8601)'),
+    OpenApiParameter(name='last_activity_at__lte', type=str,
+                     description='Last activity at or before (ISO 8601)'),
+    OpenApiParameter(name='ordering', type=str,
+                     description='Order by field (e.g., -created_at); '
+                                 'defaults to relevance when searching'),
+    OpenApiParameter(name='q', type=str,
+                     description='Full-text search in title and description '
+                                 '(websearch syntax: "phrase", or, -word)'),
+    OpenApiParameter(name='search_comments', type=bool,
+                     description='Also match tasks by comment text'),
+    OpenApiParameter(name='highlight', type=bool,
+                     description='Add search_snippet with matches in <mark>'),
+]
 
-class TaskViewSet(viewsets.ModelViewSet):
+SPARSE_FIELDSET_PARAMETERS = [
+    OpenApiParameter(name='fields', type=str,
+                     description='Comma-separated fields to return; nested as assignee.uuid'),
+    OpenApiParameter(name='exclude', type=str,
+                     description='Comma-separated fields to omit; nested as assignee.email'),
+]
+
+INCLUDE_PARAMETERS = [
+    OpenApiParameter(name='include', type=str,
+                     description='Embed related data; supported: comments'),
+    OpenApiParameter(name='comments_limit', type=int,
+                     description='Newest comments embedded per task (default 3, max 20)'),
+]
+
+
+class TaskViewSet(AsyncViewSetMixin, ReplicaReadMixin, SparseFieldsetViewMixin,
+                  ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet for Task CRUD operations.
     Uses UUID for lookup instead of primary key.
+    Retrieve supports conditional GET by ETag and Last-Modified, list by
+    ETag. Both support sparse fieldsets (?fields= / ?exclude=) and
+    embedding the newest comments of each task
+    (?include=comments&comments_limit=N). Under ASGI, list and retrieve
+    are served by the async ``alist`` and ``aretrieve``.
     """
     queryset = Task.objects.select_related('creator', 'assignee').all()
     serializer_class = TaskSerializer
     permission_classes = [IsAuthenticated, IsTaskOwnerOrAssignee]
     lookup_field = 'uuid'
-    filter_backends = [DjangoFilterBackend, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, TaskSearchFilter, TaskOrderingFilter]
     filterset_class = TaskFilter
-    ordering_fields = ['created_at', 'updated_at', 'title', 'is_completed']
+    pagination_class = LimitOffsetKeysetPagination
+    ordering_fields = ['created_at', 'updated_at', 'title', 'is_completed',
+                       'comment_count', 'last_activity_at']
     ordering = ['-created_at']
+    default_comments_limit = 3
+    max_comments_limit = 20
+    export_chunk_size = 2000
     
     @extend_schema(
         parameters=[
-            OpenApiParameter(name='creator', type=str,
-                             description='Filter by creator UUID'),
-            OpenApiParameter(name='assignee', type=str,
-                             description='Filter by assignee UUID'),
-            OpenApiParameter(name='is_completed', type=bool,
-                             description='Filter by completion status'),
-            OpenApiParameter(name='ordering', type=str,
-                             description='Order by field (e.g., -created_at)'),
+            *FILTER_PARAMETERS,
+            *SPARSE_FIELDSET_PARAMETERS,
+            *INCLUDE_PARAMETERS,
         ]
     )
     def list(self, request, *args, **kwargs):
-        """List all tasks with filtering and pagination."""
-        return super().list(request, *args, **kwargs)
+        """
+        List all tasks with filtering and pagination.
+        Pages are served from TaskListCache while no task has changed.
+        """
+        cache_key = cached = None
+        if TaskListCache.is_enabled():
+            cache_key = TaskListCache.make_key(request)
+            cached = TaskListCache.get(cache_key)
+
+        if cached is not None:
+            data, etag = cached
+        else:
+            queryset = self.filter_queryset(self.get_queryset())
+            extra_fields = self.get_extra_fields(queryset)
+            rows, page_state = self.get_list_rows(queryset, extra_fields)
+            etag = self.get_list_etag(queryset, rows, page_state or ())
+
+        response = self.get_not_modified_response(etag)
+        if response is None:
+            if cached is None:
+                data = self.get_list_data(rows, extra_fields, page_state is not None)
+                if cache_key is not None:
+                    TaskListCache.set(cache_key, (data, etag))
+            response = set_validator_headers(Response(data), etag)
+
+        if cache_key is not None:
+            response['X-Cache'] = 'MISS' if cached is None else 'HIT'
+        return response
+
+    async def alist(self, request, *args, **kwargs):
+        """
+        Async variant of :meth:`list`.
+        """
+        cache_key = cached = None
+        if TaskListCache.is_enabled():
+            cache_key = await sync_to_async(TaskListCache.make_key)(request)
+            cached = await sync_to_async(TaskListCache.get)(cache_key)
+
+        if cached is not None:
+            data, etag = cached
+        else:
+            queryset = self.filter_queryset(self.get_queryset())
+            extra_fields = self.get_extra_fields(queryset)
+            rows, page_state = await self.aget_list_rows(queryset, extra_fields)
+            etag = await self.aget_list_etag(queryset, rows, page_state or ())
+
+        response = self.get_not_modified_response(etag)
+        if response is None:
+            if cached is None:
+                data = await self.aget_list_data(rows, extra_fields, page_state is not None)
+                if cache_key is not None:
+                    await sync_to_async(TaskListCache.set)(cache_key, (data, etag))
+            response = set_validator_headers(Response(data), etag)
+
+        if cache_key is not None:
+            response['X-Cache'] = 'MISS' if cached is None else 'HIT'
+        return response
+
+    @staticmethod
+    def get_extra_fields(queryset):
+        """
+        Return the annotations of ``queryset`` that list rows pass through.
+        """
+        return [name for name in ('search_snippet',) if name in queryset.query.annotations]
+
+    def get_list_rows(self, queryset, extra_fields):
+        """
+        Fetch the requested page of ``queryset`` as TaskRowSerializer rows.
+
+        Returns:
+            ``(rows, page_state)``; page_state is the paginator's ETag
+            parts, or None when the list is not paginated
+        """
+        queryset = TaskRowSerializer.get_queryset(queryset, self.get_fieldset(), extra_fields)
+        page = self.paginate_queryset(queryset)
+        if page is None:
+            return list(queryset), None
+        return page, self.paginator.get_etag_parts()
+
+    async def aget_list_rows(self, queryset, extra_fields):
+        """
+        Async variant of :meth:`get_list_rows`.
+        """
+        queryset = TaskRowSerializer.get_queryset(queryset, self.get_fieldset(), extra_fields)
+        page = await self.apaginate_queryset(queryset)
+        if page is None:
+            return [row async for row in queryset], None
+        return page, self.paginator.get_etag_parts()
+
+    def get_list_data(self, rows, extra_fields, paginated):
+        """
+        Serialize page ``rows`` with TaskRowSerializer.
+        """
+        data = self.embed_comments(
+            rows, TaskRowSerializer(rows, self.get_fieldset(), extra_fields).data
+        )
+        if paginated:
+            return self.get_paginated_response(data).data
+        return data
+
+    async def aget_list_data(self, rows, extra_fields, paginated):
+        """
+        Async variant of :meth:`get_list_data`.
+        """
+        data = await self.aembed_comments(
+            rows, TaskRowSerializer(rows, self.get_fieldset(), extra_fields).data
+        )
+        if paginated:
+            return self.get_paginated_response(data).data
+        return data
+
+    def get_comments_limit(self):
+        """
+        Return how many comments to embed per task, or None unless
+        ``?include=comments`` was requested.
+
+        Raises:
+            ValidationError: If include or comments_limit is invalid
+        """
+        include = self.request.query_params.get('include')
+        if include is None:
+            return None
+        names = [name.strip() for name in include.split(',') if name.strip()]
+        unknown = [name for name in names if name != 'comments']
+        if unknown:
+            raise ValidationError({'include': [f"Unknown include(s): {', '.join(unknown)}."]})
+        if not names:
+            return None
+
+        limit = self.request.query_params.get('comments_limit', self.default_comments_limit)
+        try:
+            limit = int(limit)
+        except (TypeError, ValueError):
+            limit = None
+        if limit is None or not 1 <= limit <= self.max_comments_limit:
+            raise ValidationError({'comments_limit': [
+                f"Must be an integer between 1 and {self.max_comments_limit}."
+            ]})
+        return limit
+
+    def embed_comments(self, rows, data):
+        """
+        Add the newest comments of each task to serialized ``data``.
+
+        ``rows`` are the matching task rows (dicts with ``id``). All tasks
+        share one windowed comment query.
+        """
+        limit = self.get_comments_limit()
+        if limit is None:
+            return data
+        comments = CommentRowSerializer.get_recent([row['id'] for row in rows], limit)
+        return _attach_comments(rows, data, comments)
+
+    async def aembed_comments(self, rows, data):
+        """
+        Async variant of :meth:`embed_comments`.
+        """
+        limit = self.get_comments_limit()
+        if limit is None:
+            return data
+        comments = await CommentRowSerializer.aget_recent([row['id'] for row in rows], limit)
+        return _attach_comments(rows, data, comments)
+
+    def get_object_validators(self, instance):
+        """
+        Return validators covering embedded comments when they are included.
+        """
+        validators = super().get_object_validators(instance)
+        if self.get_comments_limit() is None:
+            return validators
+        return self.add_related_validators(validators, Comment.objects.filter(task=instance))
+
+    async def aget_object_validators(self, instance):
+        """
+        Async variant of :meth:`get_object_validators`.
+        """
+        validators = super().get_object_validators(instance)
+        if self.get_comments_limit() is None:
+            return validators
+        return await self.aadd_related_validators(
+            validators, Comment.objects.filter(task=instance)
+        )
+
+    def get_list_etag(self, queryset, rows, page_state=()):
+        """
+        Return a list ETag covering embedded comments when they are included.
+        Only comments of the tasks on the page are fingerprinted.
+        """
+        etag = super().get_list_etag(queryset, rows, page_state)
+        if self.get_comments_limit() is None:
+            return etag
+        etag, _ = self.add_related_validators(
+            (etag, None), Comment.objects.filter(task_id__in=[row['id'] for row in rows])
+        )
+        return etag
+
+    async def aget_list_etag(self, queryset, rows, page_state=()):
+        """
+        Async variant of :meth:`get_list_etag`.
+        """
+        etag = await super().aget_list_etag(queryset, rows, page_state)
+        if self.get_comments_limit() is None:
+            return etag
+        etag, _ = await self.aadd_related_validators(
+            (etag, None), Comment.objects.filter(task_id__in=[row['id'] for row in rows])
+        )
+        return etag
+
+    def get_queryset(self):
+        """
+        Load only the columns and joins a sparse task retrieve needs.
+        """
+        queryset = super().get_queryset()
+        fieldset = self.get_fieldset()
+        if self.action == 'retrieve' and fieldset is not None:
+            queryset = fieldset.prune_queryset(queryset, always=['uuid', 'updated_at'])
+        return queryset
+
+    @extend_schema(parameters=[*SPARSE_FIELDSET_PARAMETERS, *INCLUDE_PARAMETERS])
+    def retrieve(self, request, *args, **kwargs):
+        """Retrieve a task, answering 304 when the client copy is current."""
+        instance = self.get_object()
+        etag, last_modified = self.get_object_validators(instance)
+        not_modified = self.get_not_modified_response(etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+        data = self.get_serializer(instance).data
+        self.embed_comments([{'id': instance.pk}], [data])
+        response = Response(data)
+        return set_validator_headers(response, etag, last_modified)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        """
+        Async variant of :meth:`retrieve`.
+        """
+        instance = await self.aget_object()
+        etag, last_modified = await self.aget_object_validators(instance)
+        not_modified = self.get_not_modified_response(etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+        data = self.get_serializer(instance).data
+        await self.aembed_comments([{'id': instance.pk}], [data])
+        response = Response(data)
+        return set_validator_headers(response, etag, last_modified)
     
+    @extend_schema(
+        request=TaskBulkSerializer,
+        responses={200: TaskBulkResultSerializer},
+        description="Create, patch and delete tasks in one request and one transaction",
+    )
+    @action(detail=False, methods=['post'], url_path='bulk',
+            serializer_class=TaskBulkSerializer)
+    def bulk(self, request):
+        """
+        Apply arrays of create, update (patch) and delete operations.
+        Nothing is written unless every item is valid; errors are reported
+        per item.
+        """
+        serializer = self.get_serializer(data=request.data)
+        with transaction.atomic():
+            serializer.is_valid(raise_exception=True)
+            result = TaskService.bulk_apply(serializer.validated_data, request.user)
+        return Response(TaskBulkResultSerializer(result).data, status=status.HTTP_200_OK)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(name='format', type=str, enum=['ndjson', 'csv'],
+                             description='Export format (default ndjson)'),
+            *FILTER_PARAMETERS,
+            *SPARSE_FIELDSET_PARAMETERS,
+        ],
+        responses={
+            (200, 'application/x-ndjson'): OpenApiTypes.STR,
+            (200, 'text/csv'): OpenApiTypes.STR,
+        },
+        description="Stream every task matching the list filters as NDJSON or CSV",
+    )
+    @action(detail=False, methods=['get'], url_path='export',
+            renderer_classes=EXPORT_RENDERERS, pagination_class=None)
+    def export(self, request):
+        """
+        Stream all tasks matching the list filters and ordering, one line
+        per task, without pagination. CSV flattens users to
+        ``creator.<field>`` columns.
+        """
+        return stream_export(*self.get_export_arguments())
+
+    async def aexport(self, request):
+        """
+        Async variant of :meth:`export`.
+        """
+        return astream_export(*self.get_export_arguments())
+
+    def get_export_arguments(self):
+        """
+        Return the arguments of stream_export() for the request.
+        """
+        fieldset = self.get_fieldset()
+        queryset = self.filter_queryset(self.get_queryset())
+        extra_fields = self.get_extra_fields(queryset)
+        queryset = TaskRowSerializer.get_queryset(queryset, fieldset, extra_fields)
+        export_format = self.request.accepted_renderer.format
+        logger.info("User uuid %s exporting tasks as %s", self.request.user.uuid, export_format)
+        return (
+            queryset,
+            partial(TaskRowSerializer, fieldset=fieldset, extra_fields=extra_fields),
+            export_format,
+            self.export_chunk_size,
+            'tasks',
+        )
+
     def perform_create(self, serializer):
         """
         Create a new task using TaskService.
@@ -65,7 +443,7 @@ class TaskViewSet(viewsets.ModelViewSet):
         """
         validated_data = serializer.validated_data
         task = self.get_object()
-        logger.info(f"User uuid {self.request.user.uuid} updating task uuid {task.uuid}")
+        logger.info("User uuid %s updating task uuid %s", self.request.user.uuid, task.uuid)
         task = TaskService.update_task(task, validated_data)
         serializer.instance = task
 
@@ -73,19 +451,26 @@ class TaskViewSet(viewsets.ModelViewSet):
         """
         Delete a task.
         """
-        logger.info(f"User uuid {self.request.user.uuid} deleted task uuid {instance.uuid}")
-        super().perform_destroy(instance)
+        logger.info("User uuid %s deleted task uuid %s", self.request.user.uuid, instance.uuid)
+        TaskService.delete_task(instance)
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(AsyncViewSetMixin, ReplicaReadMixin, SparseFieldsetViewMixin,
+                     ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet for Comment operations.
     Only supports create and list operations.
     Nested under tasks/{task_uuid}/comments/
+    List supports conditional GET (ETag) and sparse
+    fieldsets (?fields= / ?exclude=), and is served by the async ``alist``
+    under ASGI.
     """
     serializer_class = CommentSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = LimitOffsetKeysetPagination
     lookup_field = 'uuid'
+    ordering_fields = ['created_at']
+    ordering = ['-created_at']
     http_method_names = ['get', 'post', 'head',
                          'options']  # Only allow GET and POST
     
@@ -96,6 +481,55 @@ class CommentViewSet(viewsets.ModelViewSet):
         task_uuid = self.kwargs.get('task_uuid')
         return Comment.objects.filter(task__uuid=task_uuid).select_related(
             'author', 'task')
+
+    @extend_schema(parameters=SPARSE_FIELDSET_PARAMETERS)
+    def list(self, request, *args, **kwargs):
+        """List comments of a task with pagination."""
+        queryset = self.filter_queryset(self.get_queryset())
+        fieldset = self.get_fieldset()
+        rows = CommentRowSerializer.get_queryset(queryset, fieldset)
+        page = self.paginate_queryset(rows)
+        if page is None:
+            rows = list(rows)
+            etag = self.get_list_etag(queryset, rows)
+        else:
+            rows = page
+            etag = self.get_list_etag(queryset, rows, self.paginator.get_etag_parts())
+        not_modified = self.get_not_modified_response(etag)
+        if not_modified is not None:
+            return not_modified
+
+        data = CommentRowSerializer(rows, fieldset).data
+        if page is not None:
+            response = self.get_paginated_response(data)
+        else:
+            response = Response(data)
+        return set_validator_headers(response, etag)
+
+    async def alist(self, request, *args, **kwargs):
+        """
+        Async variant of :meth:`list`.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        fieldset = self.get_fieldset()
+        rows = CommentRowSerializer.get_queryset(queryset, fieldset)
+        page = await self.apaginate_queryset(rows)
+        if page is None:
+            rows = [row async for row in rows]
+            etag = await self.aget_list_etag(queryset, rows)
+        else:
+            rows = page
+            etag = await self.aget_list_etag(queryset, rows, self.paginator.get_etag_parts())
+        not_modified = self.get_not_modified_response(etag)
+        if not_modified is not None:
+            return not_modified
+
+        data = CommentRowSerializer(rows, fieldset).data
+        if page is not None:
+            response = self.get_paginated_response(data)
+        else:
+            response = Response(data)
+        return set_validator_headers(response, etag)
     
     def perform_create(self, serializer):
         """
@@ -119,3 +553,121 @@ class CommentViewSet(viewsets.ModelViewSet):
             task=task
         )
         serializer.instance = comment
+
+
+class SyncViewSet(ReplicaReadMixin, viewsets.ViewSet):
+    """
+    ViewSet for delta sync of tasks and comments.
+
+    GET /api/sync/?since=<cursor> reads the change log after the cursor
+    and returns the current state of the changed tasks and comments and
+    the uuids of the deleted ones, each once however often it changed.
+    Without since it reads the whole log, i.e. performs a full sync.
+    Deleting a task deletes its comments, which are reported too.
+    """
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(name='since', type=str,
+                             description='Cursor of the previous response; omit for a full sync'),
+            OpenApiParameter(name='limit', type=int,
+                             description='Maximum number of change log entries read '
+                                         '(default 500, max 5000)'),
+        ],
+        responses={200: SyncResultSerializer},
+        description="Get the tasks and comments changed or deleted since a cursor",
+    )
+    def list(self, request):
+        """
+        Return the next page of changes after ``since``.
+
+        Raises:
+            ValidationError: If since or limit is invalid
+        """
+        position = self.get_position(request)
+        limit = self.get_limit(request)
+        entries, more = ChangeLogService.read(position, limit)
+        # Read after the entries, so a compaction that removed some of them
+        # is seen here too.
+        horizon = ChangeLogService.horizon()
+        reset = position != ChangeLogService.START and horizon is not None and position < horizon
+        if reset:
+            position = ChangeLogService.START
+            entries, more = ChangeLogService.read(position, limit)
+
+        latest = {}
+        for _, _, kind, uuid, deleted in entries:
+            latest[kind, uuid] = deleted
+        tasks, deleted_tasks = self.get_changed_rows(
+            TaskRowSerializer, Task.objects.all(), ChangeLogEntry.TASK, latest)
+        comments, deleted_comments = self.get_changed_rows(
+            CommentRowSerializer, Comment.objects.all(), ChangeLogEntry.COMMENT, latest)
+        txid, entry_id = entries[-1][:2] if entries else position
+        return Response({
+            'cursor': f'{txid}.{entry_id}',
+            'more': more,
+            'reset': reset,
+            'tasks': tasks,
+            'comments': comments,
+            'deleted_tasks': deleted_tasks,
+            'deleted_comments': deleted_comments,
+        })
+
+    @staticmethod
+    def get_changed_rows(row_serializer, queryset, kind, latest):
+        """
+        Serialize the rows of ``kind`` changed in ``latest``, with one query.
+
+        Args:
+            row_serializer: RowSerializer class for the rows
+            queryset: Queryset of the model of ``kind``
+            kind: ChangeLogEntry kind
+            latest: Dict mapping (kind, uuid) to whether the last entry is a
+                deletion
+
+        Returns:
+            Tuple (serialized rows, uuids of rows that no longer exist)
+        """
+        changed = {uuid for (entry_kind, uuid), deleted in latest.items()
+                   if entry_kind == kind and not deleted}
+        gone = {uuid for (entry_kind, uuid), deleted in latest.items()
+                if entry_kind == kind and deleted}
+        rows = []
+        if changed:
+            rows = list(row_serializer.get_queryset(queryset.filter(uuid__in=changed)))
+            # Deleted after the entries that were read.
+            gone |= changed - {row['uuid'] for row in rows}
+        return row_serializer(rows).data, sorted(str(uuid) for uuid in gone)
+
+    @staticmethod
+    def get_position(request):
+        since = request.query_params.get('since')
+        if not since:
+            return ChangeLogService.START
+        try:
+            txid, entry_id = map(int, since.split('.'))
+            if txid < 0 or entry_id < 0:
+                raise ValueError
+        except ValueError:
+            raise ValidationError({'since': ["Invalid cursor."]})
+        return txid, entry_id
+
+    @staticmethod
+    def get_limit(request):
+        limit = request.query_params.get('limit', settings.SYNC_PAGE_SIZE)
+        try:
+            limit = int(limit)
+        except (TypeError, ValueError):
+            limit = None
+        if limit is None or not 1 <= limit <= settings.SYNC_MAX_PAGE_SIZE:
+            raise ValidationError({'limit': [
+                f"Must be an integer between 1 and {settings.SYNC_MAX_PAGE_SIZE}."
+            ]})
+        return limit
+
+
+def _attach_comments(rows, data, comments):
+    for row, item in zip(rows, data):
+        item['comments'] = comments[row['id']]
+    return data
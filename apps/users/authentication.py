@@ -0,0 +1,287 @@
+"""
+JWT authentication backed by a cache of authenticated users.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import gettext_lazy as _
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+from apps.core.metrics import registry as metrics
+from apps.core.timing import timed
+
+
+class UserCache:
+    """
+    Cache of users resolved by :class:`CachedJWTAuthentication`.
+
+    The first level is a per-process LRU of ``AUTH_USER_CACHE_SIZE`` users
+    kept for ``AUTH_USER_CACHE_TIMEOUT`` seconds. When
+    ``AUTH_USER_CACHE_ALIAS`` names a Django cache, misses fall through to
+    it before the database, so a user loaded by one worker is shared by all.
+
+    Saving or deleting a User invalidates both levels (see
+    ``apps.users.signals``). Other processes only drop their LRU copy when
+    it expires, so the LRU timeout bounds how long a deactivated user or
+    changed password can still authenticate there. Writes that bypass
+    ``save()`` (``QuerySet.update()``, raw SQL) are also only picked up on
+    expiry. Entries hold field values, not model instances, so requests
+    never share a User object. Only the fields authentication, permissions
+    and UserSerializer read are cached; the password hash is replaced by the
+    digest the token revocation check compares, so no credential material
+    reaches the shared cache. Hits (labelled ``local`` or ``shared``) and
+    misses are counted in the ``auth_user_cache_hits_total`` and
+    ``auth_user_cache_misses_total`` metrics.
+    """
+    key_prefix = 'users:auth'
+    fields = ('id', 'uuid', 'username', 'email', 'first_name', 'last_name',
+              'is_active', 'is_staff', 'is_superuser')
+
+    _lock = threading.Lock()
+    _entries = OrderedDict()
+
+    @staticmethod
+    def is_enabled():
+        return settings.AUTH_USER_CACHE_TIMEOUT > 0
+
+    @staticmethod
+    def get_shared_cache():
+        alias = settings.AUTH_USER_CACHE_ALIAS
+        return caches[alias] if alias else None
+
+    @classmethod
+    def make_key(cls, user_id):
+        return f'{cls.key_prefix}:{user_id}'
+
+    @classmethod
+    def get(cls, user_id):
+        """
+        Return a fresh User instance for ``user_id`` or None, counting hits
+        and misses.
+        """
+        user_id = str(user_id)
+        user = cls._get_local(user_id)
+        if user is not None:
+            return user
+        shared = cls.get_shared_cache()
+        values = shared.get(cls.make_key(user_id)) if shared is not None else None
+        return cls._get_shared(user_id, values)
+
+    @classmethod
+    async def aget(cls, user_id):
+        """
+        Async variant of :meth:`get`.
+        """
+        user_id = str(user_id)
+        user = cls._get_local(user_id)
+        if user is not None:
+            return user
+        shared = cls.get_shared_cache()
+        values = await shared.aget(cls.make_key(user_id)) if shared is not None else None
+        return cls._get_shared(user_id, values)
+
+    @classmethod
+    def set(cls, user):
+        """
+        Cache ``user`` in both levels.
+        """
+        user_id, values = cls._store_user(user)
+        shared = cls.get_shared_cache()
+        if shared is not None:
+            shared.set(
+                cls.make_key(user_id), values, timeout=settings.AUTH_USER_CACHE_SHARED_TIMEOUT
+            )
+
+    @classmethod
+    async def aset(cls, user):
+        """
+        Async variant of :meth:`set`.
+        """
+        user_id, values = cls._store_user(user)
+        shared = cls.get_shared_cache()
+        if shared is not None:
+            await shared.aset(
+                cls.make_key(user_id), values, timeout=settings.AUTH_USER_CACHE_SHARED_TIMEOUT
+            )
+
+    @classmethod
+    def invalidate(cls, user_id):
+        """
+        Drop ``user_id`` from the local LRU and the shared cache.
+        """
+        user_id = str(user_id)
+        with cls._lock:
+            cls._entries.pop(user_id, None)
+        shared = cls.get_shared_cache()
+        if shared is not None:
+            shared.delete(cls.make_key(user_id))
+
+    @classmethod
+    def clear(cls):
+        """
+        Empty the local LRU of this process.
+        """
+        with cls._lock:
+            cls._entries.clear()
+
+    @classmethod
+    def _get_local(cls, user_id):
+        now = time.monotonic()
+        with cls._lock:
+            entry = cls._entries.get(user_id)
+            if entry is None or entry[0] <= now:
+                return None
+            cls._entries.move_to_end(user_id)
+        metrics.inc('auth_user_cache_hits_total', (('level', 'local'),))
+        return _load(entry[1])
+
+    @classmethod
+    def _get_shared(cls, user_id, values):
+        if values is None:
+            metrics.inc('auth_user_cache_misses_total')
+            return None
+        metrics.inc('auth_user_cache_hits_total', (('level', 'shared'),))
+        cls._store_local(user_id, values)
+        return _load(values)
+
+    @classmethod
+    def _store_user(cls, user):
+        user_id = str(getattr(user, api_settings.USER_ID_FIELD))
+        values = _dump(user)
+        cls._store_local(user_id, values)
+        return user_id, values
+
+    @classmethod
+    def _store_local(cls, user_id, values):
+        expires_at = time.monotonic() + settings.AUTH_USER_CACHE_TIMEOUT
+        with cls._lock:
+            cls._entries[user_id] = (expires_at, values)
+            cls._entries.move_to_end(user_id)
+            while len(cls._entries) > settings.AUTH_USER_CACHE_SIZE:
+                cls._entries.popitem(last=False)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    simplejwt's JWTAuthentication resolving users through UserCache.
+
+    Cached users go through the same active and token revocation checks
+    as users read from the database. :meth:`aauthenticate` serves async
+    views (see ``apps.core.async_views``) with the async cache and ORM.
+    """
+
+    def get_user(self, validated_token):
+        if not UserCache.is_enabled():
+            return super().get_user(validated_token)
+        user = UserCache.get(self.get_user_id(validated_token))
+        if user is None:
+            user = super().get_user(validated_token)
+            UserCache.set(user)
+            return user
+        return self.check_user(user, validated_token)
+
+    def authenticate(self, request):
+        with timed('auth'):
+            return super().authenticate(request)
+
+    async def aauthenticate(self, request):
+        """
+        Async variant of ``authenticate()``.
+        """
+        with timed('auth'):
+            header = self.get_header(request)
+            if header is None:
+                return None
+            raw_token = self.get_raw_token(header)
+            if raw_token is None:
+                return None
+            validated_token = self.get_validated_token(raw_token)
+            return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        """
+        Async variant of :meth:`get_user`.
+
+        Raises:
+            AuthenticationFailed: If the user is missing, inactive or
+                changed their password
+        """
+        user_id = self.get_user_id(validated_token)
+        cache_enabled = UserCache.is_enabled()
+        if cache_enabled:
+            user = await UserCache.aget(user_id)
+            if user is not None:
+                return self.check_user(user, validated_token)
+
+        try:
+            user = await self.user_model.objects.aget(**{api_settings.USER_ID_FIELD: user_id})
+        except self.user_model.DoesNotExist as e:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found") from e
+        self.check_user(user, validated_token)
+        if cache_enabled:
+            await UserCache.aset(user)
+        return user
+
+    @staticmethod
+    def get_user_id(validated_token):
+        try:
+            return validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            ) from e
+
+    @staticmethod
+    def check_user(user, validated_token):
+        """
+        Apply simplejwt's active and token revocation checks to ``user``.
+        """
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+            api_settings.REVOKE_TOKEN_CLAIM
+        ) != _password_digest(user):
+            raise AuthenticationFailed(
+                _("The user's password has been changed."), code="password_changed"
+            )
+        return user
+
+
+class CachedJWTScheme(SimpleJWTScheme):
+    """
+    OpenAPI security scheme of CachedJWTAuthentication.
+    """
+    target_class = CachedJWTAuthentication
+
+
+def _password_digest(user):
+    """
+    Return the password digest simplejwt puts in revocable tokens, cached on
+    users loaded from UserCache so the password field is never read.
+    """
+    digest = getattr(user, '_password_digest', None)
+    return digest if digest is not None else get_md5_hash_password(user.password)
+
+
+def _dump(user):
+    values = {name: getattr(user, name) for name in UserCache.fields}
+    values['_password_digest'] = _password_digest(user)
+    return values
+
+
+def _load(values):
+    # from_db() expects values in field order. Fields not cached are
+    # deferred and loaded on access.
+    User = get_user_model()
+    names = [field.attname for field in User._meta.concrete_fields if field.attname in values]
+    user = User.from_db(DEFAULT_DB_ALIAS, names, [values[name] for name in names])
+    user._password_digest = values.get('_password_digest')
+    return user
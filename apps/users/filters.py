@@ -19,6 +19,7 @@ class UserFilter(filters.FilterSet):
     def filter_search(self, queryset, name, value):
         """
         Filter users by username or email containing the search value.
+        Served by the pg_trgm indexes on UPPER(username) and UPPER(email).
         """
         return queryset.filter(
             models.Q(username__icontains=value) |
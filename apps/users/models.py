@@ -2,8 +2,40 @@
 User model extending Django's AbstractUser with BaseModel.
 """
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db import models
+from django.db.models.functions import Collate, Upper
 from apps.core.models import BaseModel
 
+# Columns matched by user search and autocomplete.
+SEARCH_FIELDS = ('username', 'email', 'first_name', 'last_name')
+
+
+def prefix_key(field):
+    """
+    Return the expression of the prefix index on ``field``.
+
+    ``UPPER(field) COLLATE "C"`` lets PostgreSQL turn a ``LIKE 'AB%'``
+    filter into a B-tree range scan and read matches in index order, so
+    a prefix lookup stops after ``LIMIT`` rows however many users share
+    the prefix.
+    """
+    return Collate(Upper(field), 'C')
+
+
+def trigram_index(field):
+    """
+    Return a pg_trgm GIN index on ``UPPER(field)``.
+
+    Django compiles ``icontains`` and ``istartswith`` to
+    ``UPPER(field::text) LIKE UPPER(pattern)`` on PostgreSQL, which this
+    expression index serves.
+    """
+    return GinIndex(
+        OpClass(Upper(field), name='gin_trgm_ops'),
+        name=f'users_{field}_trgm_idx',
+    )
+
 
 class User(AbstractUser, BaseModel):
     """
@@ -16,6 +48,11 @@ class User(AbstractUser, BaseModel):
         verbose_name = 'User'
         verbose_name_plural = 'Users'
         ordering = ['-created_at']
+        indexes = [
+            *(models.Index(prefix_key(field), name=f'users_{field}_prefix_idx')
+              for field in SEARCH_FIELDS),
+            *(trigram_index(field) for field in SEARCH_FIELDS),
+        ]
     
     def __str__(self):
         return self.username
@@ -0,0 +1,63 @@
+"""
+Index-backed user autocomplete.
+"""
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db.models import Q
+from django.db.models.functions import Greatest
+from .models import SEARCH_FIELDS, prefix_key
+
+# Shorter inputs have no trigram of their own and only match prefixes.
+MIN_SUBSTRING_LENGTH = 3
+
+
+def autocomplete_users(queryset, text, limit):
+    """
+    Return up to ``limit`` users matching ``text``, best matches first.
+
+    Users whose username, email or name starts with ``text`` come first.
+    Each field contributes at most ``limit`` candidates, read in order from
+    its ``users_<field>_prefix_idx`` range, and the candidates are ranked
+    by trigram similarity, so a common prefix never ranks more than
+    ``4 * limit`` rows. For inputs of three or more characters, remaining
+    slots are filled with users containing ``text`` anywhere, found
+    through the trigram GIN indexes.
+
+    Args:
+        queryset: User queryset to search in
+        text: User input
+        limit: Maximum number of users returned
+
+    Returns:
+        List of User instances
+    """
+    text = text.strip()
+    if not text:
+        return []
+
+    candidates = [
+        queryset.alias(key=prefix_key(field))
+        .filter(key__startswith=text.upper())
+        .order_by('key')
+        .values('pk')[:limit]
+        for field in SEARCH_FIELDS
+    ]
+    users = list(
+        queryset.filter(pk__in=candidates[0].union(*candidates[1:]))
+        .annotate(rank=Greatest(*(
+            TrigramSimilarity(field, text) for field in SEARCH_FIELDS
+        )))
+        .order_by('-rank', 'username')[:limit]
+    )
+    if len(users) == limit or len(text) < MIN_SUBSTRING_LENGTH:
+        return users
+
+    contains = Q()
+    for field in SEARCH_FIELDS:
+        contains |= Q(**{f'{field}__icontains': text})
+    # No ORDER BY: sorting would visit every match of a common substring.
+    others = (
+        queryset.filter(contains)
+        .exclude(pk__in=[user.pk for user in users])
+        .order_by()[:limit - len(users)]
+    )
+    return users + sorted(others, key=lambda user: user.username)
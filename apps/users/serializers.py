@@ -2,6 +2,7 @@
 Serializers for User model.
 """
 from rest_framework import serializers
+from apps.core.serializers import format_uuid
 from .models import User
 
 
@@ -15,3 +16,40 @@ class UserSerializer(serializers.ModelSerializer):
         model = User
         fields = ['uuid', 'username', 'email', 'first_name', 'last_name']
         read_only_fields = fields
+
+
+class UserRowSerializer:
+    """
+    Fast read-only counterpart of UserSerializer for ``values()`` rows.
+
+    Users are read from ``<prefix>__<field>`` keys of a row, and each user
+    is formatted once per serializer instance, so repeated creators,
+    assignees and authors on a page cost a dict lookup. ``fields`` limits
+    the output to a subset of UserSerializer fields.
+    """
+    fields = UserSerializer.Meta.fields
+
+    def __init__(self, fields=None):
+        self._cache = {}
+        if fields is not None:
+            self.fields = fields
+
+    @classmethod
+    def get_value_fields(cls, prefix, fields=None):
+        """
+        Return the ``values()`` lookups needed to represent ``prefix``.
+        """
+        fields = cls.fields if fields is None else fields
+        return [f'{prefix}__id'] + [f'{prefix}__{field}' for field in fields]
+
+    def to_representation(self, row, prefix):
+        user_id = row[f'{prefix}__id']
+        if user_id is None:
+            return None
+        data = self._cache.get(user_id)
+        if data is None:
+            data = {field: row[f'{prefix}__{field}'] for field in self.fields}
+            if 'uuid' in data:
+                data['uuid'] = format_uuid(data['uuid'])
+            self._cache[user_id] = data
+        return data
@@ -0,0 +1,23 @@
+"""
+Signal handlers keeping UserCache in sync with User writes.
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework_simplejwt.settings import api_settings
+from .authentication import UserCache
+from .models import User
+
+
+@receiver(post_save, sender=User, dispatch_uid='users_invalidate_auth_cache_on_save')
+@receiver(post_delete, sender=User, dispatch_uid='users_invalidate_auth_cache_on_delete')
+def invalidate_auth_cache(sender, instance, **kwargs):
+    """
+    Drop a saved or deleted user from UserCache.
+
+    The entry is dropped again on commit, so a request that re-cached the
+    old row before the transaction committed cannot keep it.
+    """
+    user_id = getattr(instance, api_settings.USER_ID_FIELD)
+    UserCache.invalidate(user_id)
+    transaction.on_commit(lambda: UserCache.invalidate(user_id))
@@ -3,26 +3,37 @@ Views for user authentication and profile.
 """
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from drf_spectacular.utils import extend_schema
+from drf_spectacular.utils import extend_schema, OpenApiParameter
 
+from apps.core.async_views import AsyncViewSetMixin
+from apps.core.replicas import ReplicaReadMixin
+from apps.tasks.models import UserTaskStats
+from apps.tasks.serializers import UserTaskStatsSerializer
 from .models import User
+from .search import autocomplete_users
 from .serializers import UserSerializer
 from .filters import UserFilter
 
 
-class UserViewSet(viewsets.ReadOnlyModelViewSet):
+class UserViewSet(AsyncViewSetMixin, ReplicaReadMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for listing and retrieving users.
     Supports filtering by username or email via 'search' query parameter.
     Uses UUID for lookup instead of primary key.
+    /autocomplete/ serves the assignee picker from the search indexes.
+    /me/ is served by the async ``acurrent_user`` under ASGI.
+    /{uuid}/stats/ and /me/stats/ serve task statistics of a user.
     """
     queryset = User.objects.all().order_by('username')
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated]
     filterset_class = UserFilter
     lookup_field = 'uuid'
+    default_autocomplete_limit = 10
+    max_autocomplete_limit = 25
 
     @extend_schema(
         responses={200: UserSerializer},
@@ -35,3 +46,81 @@ class UserViewSet(viewsets.ReadOnlyModelViewSet):
         """
         serializer = self.get_serializer(request.user)
         return Response(serializer.data, status=status.HTTP_200_OK)
+
+    async def acurrent_user(self, request):
+        """
+        Async variant of :meth:`current_user`; the user is already loaded.
+        """
+        return self.current_user(request)
+
+    @staticmethod
+    def task_stats_response(user):
+        """
+        Return the task statistics of ``user``, read from its UserTaskStats
+        row in a single query whatever the number of tasks.
+        """
+        stats = UserTaskStats.objects.filter(user=user).first() or UserTaskStats()
+        stats.user = user
+        serializer = UserTaskStatsSerializer(stats)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    @extend_schema(
+        responses={200: UserTaskStatsSerializer},
+        description="Get open and completed task counts and the median completion time "
+                    "of the tasks assigned to a user"
+    )
+    @action(detail=True, methods=['get'], url_path='stats')
+    def stats(self, request, uuid=None):
+        """
+        Get task statistics of a user.
+        """
+        return self.task_stats_response(self.get_object())
+
+    @extend_schema(
+        responses={200: UserTaskStatsSerializer},
+        description="Get task statistics of the current authenticated user"
+    )
+    @action(detail=False, methods=['get'], url_path='me/stats')
+    def current_user_stats(self, request):
+        """
+        Get task statistics of the currently authenticated user.
+        """
+        return self.task_stats_response(request.user)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(name='q', type=str, required=True,
+                             description='Username prefix, or a word of the username, '
+                                         'email or name (3+ characters)'),
+            OpenApiParameter(name='limit', type=int,
+                             description='Maximum number of users (default 10, max 25)'),
+        ],
+        responses={200: UserSerializer(many=True)},
+        description="Suggest active users for a partial name, best matches first",
+    )
+    @action(detail=False, methods=['get'], url_path='autocomplete')
+    def autocomplete(self, request):
+        """
+        Suggest active users whose username starts with ``q`` or whose
+        username, email or name contains a word similar to it.
+
+        Raises:
+            ValidationError: If limit is invalid
+        """
+        limit = request.query_params.get('limit', self.default_autocomplete_limit)
+        try:
+            limit = int(limit)
+        except (TypeError, ValueError):
+            limit = None
+        if limit is None or not 1 <= limit <= self.max_autocomplete_limit:
+            raise ValidationError({'limit': [
+                f"Must be an integer between 1 and {self.max_autocomplete_limit}."
+            ]})
+
+        users = autocomplete_users(
+            User.objects.filter(is_active=True).only(*UserSerializer.Meta.fields),
+            request.query_params.get('q', ''),
+            limit,
+        )
+        serializer = self.get_serializer(users, many=True)
+        return Response(serializer.data, status=status.HTTP_200_OK)
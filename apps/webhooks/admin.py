@@ -0,0 +1,38 @@
+"""
+Admin configuration for webhook subscriptions and deliveries.
+"""
+from django.contrib import admin
+from django.utils import timezone
+from .models import WebhookDelivery, WebhookSubscription
+
+
+@admin.register(WebhookSubscription)
+class WebhookSubscriptionAdmin(admin.ModelAdmin):
+    """
+    Webhook subscription admin interface.
+    """
+    list_display = ['url', 'uuid', 'events', 'is_active', 'created_at']
+    list_filter = ['is_active', 'created_at']
+    search_fields = ['url', 'uuid']
+    readonly_fields = ['uuid', 'secret', 'created_at', 'updated_at']
+
+
+@admin.register(WebhookDelivery)
+class WebhookDeliveryAdmin(admin.ModelAdmin):
+    """
+    Webhook delivery admin interface, to inspect pending and failed
+    deliveries; failed ones can be queued again.
+    """
+    list_display = ['event', 'event_uuid', 'subscription', 'status', 'attempts',
+                    'next_attempt_at', 'last_error']
+    list_filter = ['status', 'event']
+    search_fields = ['event_uuid', 'subscription__url']
+    readonly_fields = ['subscription', 'event_uuid', 'event', 'payload', 'created_at',
+                       'attempts', 'last_error']
+    actions = ['retry']
+
+    @admin.action(description='Retry selected deliveries')
+    def retry(self, request, queryset):
+        updated = queryset.update(status=WebhookDelivery.PENDING, attempts=0,
+                                  next_attempt_at=timezone.now())
+        self.message_user(request, f'{updated} deliveries queued again.')
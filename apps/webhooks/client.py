@@ -0,0 +1,93 @@
+"""
+Keep-alive HTTP client used by the webhook worker.
+"""
+import http.client
+import threading
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+
+class ConnectionPool:
+    """
+    Pool of persistent HTTP(S) connections, kept per origin.
+
+    Consecutive requests to an endpoint reuse one connection instead of
+    paying a TCP (and TLS) handshake each; the pool may be shared by
+    threads, each connection being used by one request at a time.
+    """
+    # Errors of a kept-alive connection the server closed meanwhile; the
+    # request is retried once on a new connection.
+    STALE_CONNECTION_ERRORS = (
+        http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError,
+    )
+
+    def __init__(self, timeout, max_idle=4):
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self._idle = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def post(self, url, body, headers):
+        """
+        POST ``body`` to ``url`` and read the response.
+
+        Args:
+            url: Absolute http or https URL
+            body: Request body as bytes
+            headers: Dict of request headers
+
+        Returns:
+            HTTP status code of the response
+
+        Raises:
+            OSError, http.client.HTTPException: If the request failed
+        """
+        parts = urlsplit(url)
+        origin = (parts.scheme, parts.hostname, parts.port)
+        path = (parts.path or '/') + (f'?{parts.query}' if parts.query else '')
+
+        while True:
+            connection, reused = self._acquire(origin)
+            try:
+                connection.request('POST', path, body=body, headers=headers)
+                response = connection.getresponse()
+                response.read()
+            except self.STALE_CONNECTION_ERRORS:
+                connection.close()
+                if reused:
+                    continue
+                raise
+            except BaseException:
+                connection.close()
+                raise
+            if response.will_close:
+                connection.close()
+            else:
+                self._release(origin, connection)
+            return response.status
+
+    def close(self):
+        """
+        Close all idle connections.
+        """
+        with self._lock:
+            connections = [conn for idle in self._idle.values() for conn in idle]
+            self._idle.clear()
+        for connection in connections:
+            connection.close()
+
+    def _acquire(self, origin):
+        with self._lock:
+            if self._idle[origin]:
+                return self._idle[origin].pop(), True
+        scheme, host, port = origin
+        if scheme == 'https':
+            return http.client.HTTPSConnection(host, port, timeout=self.timeout), False
+        return http.client.HTTPConnection(host, port, timeout=self.timeout), False
+
+    def _release(self, origin, connection):
+        with self._lock:
+            if len(self._idle[origin]) < self.max_idle:
+                self._idle[origin].append(connection)
+                return
+        connection.close()
@@ -0,0 +1,67 @@
+"""
+Management command running the webhook delivery worker.
+"""
+import signal
+
+from django.core.management.base import BaseCommand, CommandError
+from apps.webhooks.worker import WebhookWorker
+
+
+class Command(BaseCommand):
+    help = ('Deliver webhook events from the outbox to the subscribed endpoints, '
+            'retrying failed deliveries with backoff; stops on SIGINT or SIGTERM')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Process until no event or delivery is due, then exit',
+        )
+        parser.add_argument(
+            '--claim-size',
+            type=int,
+            default=1000,
+            help='Events fanned out and deliveries claimed per round (default: 1000)',
+        )
+        parser.add_argument(
+            '--threads',
+            type=int,
+            default=4,
+            help='Endpoints sent to concurrently (default: 4)',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=1.0,
+            help='Seconds to wait when nothing is due (default: 1)',
+        )
+
+    def handle(self, *args, **options):
+        for option in ('claim_size', 'threads'):
+            if options[option] < 1:
+                raise CommandError(f"--{option.replace('_', '-')} must be a positive integer.")
+
+        worker = WebhookWorker(claim_size=options['claim_size'], threads=options['threads'])
+        if options['once']:
+            totals = {'events': 0, 'delivered': 0, 'retrying': 0, 'failed': 0}
+            try:
+                while True:
+                    counts = worker.run_once()
+                    for key, value in counts.items():
+                        totals[key] += value
+                    if not any(counts.values()):
+                        break
+            finally:
+                worker.pool.close()
+            self.stdout.write(self.style.SUCCESS(
+                f"Fanned out {totals['events']} events; delivered {totals['delivered']}, "
+                f"retrying {totals['retrying']}, failed {totals['failed']} deliveries"
+            ))
+            return
+
+        stopping = []
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *_: stopping.append(True))
+        self.stdout.write(f"Webhook worker started, polling every {options['poll_interval']}s")
+        worker.run(options['poll_interval'], stop=lambda: bool(stopping))
+        self.stdout.write(self.style.SUCCESS('Webhook worker stopped'))
@@ -0,0 +1,75 @@
+# Generated by Django 6.0.9 on 2026-10-17 15:06
+
+import apps.webhooks.models
+import django.contrib.postgres.fields
+import django.core.serializers.json
+import django.db.models.deletion
+import django.db.models.functions.datetime
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WebhookEvent',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('uuid', models.UUIDField(default=uuid.uuid4, editable=False)),
+                ('event', models.CharField(choices=[('task.created', 'Task created'), ('task.completed', 'Task completed'), ('comment.created', 'Comment created')], max_length=32)),
+                ('payload', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('created_at', models.DateTimeField(db_default=django.db.models.functions.datetime.Now(), editable=False)),
+            ],
+            options={
+                'verbose_name': 'Webhook event',
+                'verbose_name_plural': 'Webhook events',
+                'db_table': 'webhook_outbox',
+            },
+        ),
+        migrations.CreateModel(
+            name='WebhookSubscription',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('uuid', models.UUIDField(db_index=True, default=uuid.uuid4, editable=False, help_text='UUID for external API identification', unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('url', models.URLField(help_text='Endpoint the events are POSTed to', max_length=2000)),
+                ('secret', models.CharField(default=apps.webhooks.models.generate_secret, editable=False, help_text='Key of the HMAC-SHA256 signature of each request', max_length=64)),
+                ('events', django.contrib.postgres.fields.ArrayField(base_field=models.CharField(choices=[('task.created', 'Task created'), ('task.completed', 'Task completed'), ('comment.created', 'Comment created')], max_length=32), help_text='Event types delivered to the endpoint')),
+                ('is_active', models.BooleanField(default=True, help_text='Whether events are delivered')),
+            ],
+            options={
+                'verbose_name': 'Webhook subscription',
+                'verbose_name_plural': 'Webhook subscriptions',
+                'db_table': 'webhook_subscriptions',
+                'ordering': ['created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='WebhookDelivery',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('event_uuid', models.UUIDField(help_text='UUID of the event, sent as its id')),
+                ('event', models.CharField(choices=[('task.created', 'Task created'), ('task.completed', 'Task completed'), ('comment.created', 'Comment created')], max_length=32)),
+                ('payload', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('created_at', models.DateTimeField(help_text='When the event happened')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('failed', 'Failed')], default='pending', max_length=7)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('next_attempt_at', models.DateTimeField(db_default=django.db.models.functions.datetime.Now(), help_text='When the delivery is due; moved forward by the lease of the worker sending it')),
+                ('last_error', models.TextField(blank=True)),
+                ('subscription', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='deliveries', to='webhooks.webhooksubscription')),
+            ],
+            options={
+                'verbose_name': 'Webhook delivery',
+                'verbose_name_plural': 'Webhook deliveries',
+                'db_table': 'webhook_deliveries',
+                'indexes': [models.Index(condition=models.Q(('status', 'pending')), fields=['next_attempt_at', 'id'], name='webhook_delivery_due_idx')],
+            },
+        ),
+    ]
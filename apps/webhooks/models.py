@@ -0,0 +1,122 @@
+"""
+Webhook subscription, outbox and delivery models.
+"""
+import secrets
+import uuid
+
+from django.contrib.postgres.fields import ArrayField
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.db.models.functions import Now
+from apps.core.models import BaseModel
+
+TASK_CREATED = 'task.created'
+TASK_COMPLETED = 'task.completed'
+COMMENT_CREATED = 'comment.created'
+EVENT_CHOICES = [
+    (TASK_CREATED, 'Task created'),
+    (TASK_COMPLETED, 'Task completed'),
+    (COMMENT_CREATED, 'Comment created'),
+]
+
+
+def generate_secret():
+    return secrets.token_hex(32)
+
+
+class WebhookSubscription(BaseModel):
+    """
+    Endpoint that receives the events it subscribed to as signed POSTs.
+    """
+    url = models.URLField(max_length=2000, help_text="Endpoint the events are POSTed to")
+    secret = models.CharField(
+        max_length=64,
+        default=generate_secret,
+        editable=False,
+        help_text="Key of the HMAC-SHA256 signature of each request",
+    )
+    events = ArrayField(
+        models.CharField(max_length=32, choices=EVENT_CHOICES),
+        help_text="Event types delivered to the endpoint",
+    )
+    is_active = models.BooleanField(default=True, help_text="Whether events are delivered")
+
+    class Meta:
+        db_table = 'webhook_subscriptions'
+        ordering = ['created_at']
+        verbose_name = 'Webhook subscription'
+        verbose_name_plural = 'Webhook subscriptions'
+
+    def __str__(self):
+        return self.url
+
+
+class WebhookEvent(models.Model):
+    """
+    Transactional outbox of events not yet fanned out to subscriptions.
+
+    The services insert events in the transaction of the change, so an
+    event exists exactly when its change committed; the webhook worker
+    moves them into WebhookDelivery rows.
+    """
+    id = models.BigAutoField(primary_key=True)
+    uuid = models.UUIDField(default=uuid.uuid4, editable=False)
+    event = models.CharField(max_length=32, choices=EVENT_CHOICES)
+    payload = models.JSONField(encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(db_default=Now(), editable=False)
+
+    class Meta:
+        db_table = 'webhook_outbox'
+        verbose_name = 'Webhook event'
+        verbose_name_plural = 'Webhook events'
+
+    def __str__(self):
+        return f"{self.event} {self.uuid}"
+
+
+class WebhookDelivery(models.Model):
+    """
+    An event waiting to be delivered to one subscription.
+
+    A worker claims due deliveries by moving next_attempt_at past its
+    lease, so a delivery whose worker died is retried once the lease ends.
+    Deliveries are deleted once the endpoint accepted them, and marked
+    failed after WEBHOOK_MAX_ATTEMPTS unsuccessful attempts.
+    """
+    PENDING = 'pending'
+    FAILED = 'failed'
+    STATUS_CHOICES = [(PENDING, 'Pending'), (FAILED, 'Failed')]
+
+    id = models.BigAutoField(primary_key=True)
+    subscription = models.ForeignKey(
+        WebhookSubscription,
+        on_delete=models.CASCADE,
+        related_name='deliveries',
+    )
+    event_uuid = models.UUIDField(help_text="UUID of the event, sent as its id")
+    event = models.CharField(max_length=32, choices=EVENT_CHOICES)
+    payload = models.JSONField(encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(help_text="When the event happened")
+    status = models.CharField(max_length=7, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(
+        db_default=Now(),
+        help_text="When the delivery is due; moved forward by the lease of the "
+                  "worker sending it",
+    )
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        db_table = 'webhook_deliveries'
+        verbose_name = 'Webhook delivery'
+        verbose_name_plural = 'Webhook deliveries'
+        indexes = [
+            models.Index(
+                fields=['next_attempt_at', 'id'],
+                name='webhook_delivery_due_idx',
+                condition=models.Q(status='pending'),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.event} {self.event_uuid} to {self.subscription_id}"
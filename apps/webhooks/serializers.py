@@ -0,0 +1,48 @@
+"""
+Serializers for webhook subscriptions.
+"""
+from rest_framework import serializers
+from .models import EVENT_CHOICES, WebhookSubscription
+
+
+class WebhookSubscriptionSerializer(serializers.ModelSerializer):
+    """
+    Serializer for WebhookSubscription model.
+    The secret is generated on creation and only readable.
+    """
+    events = serializers.ListField(
+        child=serializers.ChoiceField(choices=EVENT_CHOICES),
+        allow_empty=False,
+    )
+
+    class Meta:
+        model = WebhookSubscription
+        fields = [
+            'uuid',
+            'url',
+            'secret',
+            'events',
+            'is_active',
+            'created_at',
+            'updated_at',
+        ]
+        read_only_fields = [
+            'uuid',
+            'secret',
+            'created_at',
+            'updated_at',
+        ]
+
+    def validate_url(self, value):
+        """
+        Only accept http and https endpoints.
+        """
+        if not value.lower().startswith(('http://', 'https://')):
+            raise serializers.ValidationError('Enter an http or https URL.')
+        return value
+
+    def validate_events(self, value):
+        """
+        Drop duplicate event types, keeping their order.
+        """
+        return list(dict.fromkeys(value))
@@ -0,0 +1,221 @@
+"""
+Service layer for webhook events and their deliveries.
+"""
+import logging
+import random
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from apps.core.serializers import format_datetime, format_uuid
+from .models import WebhookDelivery, WebhookEvent
+
+logger = logging.getLogger(__name__)
+
+
+class WebhookService:
+    """
+    Service for webhook events: the outbox written by the task and comment
+    services, and the deliveries the webhook worker sends from it.
+    """
+    # Moves a batch of outbox events into one delivery per active
+    # subscription of their type; concurrent workers skip each other's
+    # events. Events without subscribers are dropped.
+    FAN_OUT_SQL = """
+        WITH claimed AS (
+            DELETE FROM webhook_outbox
+            WHERE id IN (
+                SELECT id FROM webhook_outbox
+                ORDER BY id
+                LIMIT %s
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING id, uuid, event, payload, created_at
+        ), fanned AS (
+            INSERT INTO webhook_deliveries
+                (subscription_id, event_uuid, event, payload, created_at,
+                 status, attempts, last_error)
+            SELECT subscription.id, claimed.uuid, claimed.event, claimed.payload,
+                   claimed.created_at, %s, 0, ''
+            FROM claimed
+            JOIN webhook_subscriptions subscription
+              ON subscription.is_active AND claimed.event = ANY(subscription.events)
+            ORDER BY claimed.id, subscription.id
+            RETURNING 1
+        )
+        SELECT (SELECT count(*) FROM claimed), (SELECT count(*) FROM fanned)
+    """
+
+    @staticmethod
+    def enqueue(events):
+        """
+        Add events to the outbox, in the caller's transaction.
+
+        This is the only cost of webhooks on the request path: one INSERT,
+        whatever the number of events and subscriptions.
+
+        Args:
+            events: List of (event type, payload dict) pairs
+        """
+        if events:
+            WebhookEvent.objects.bulk_create(
+                [WebhookEvent(event=event, payload=payload) for event, payload in events]
+            )
+
+    @staticmethod
+    def task_payload(task):
+        """
+        Return the event payload of a task, built without queries from a
+        task whose creator and assignee are loaded.
+
+        Args:
+            task: Task instance
+
+        Returns:
+            Dict of the task fields, users by UUID
+        """
+        return {
+            'uuid': format_uuid(task.uuid),
+            'title': task.title,
+            'description': task.description,
+            'creator': format_uuid(task.creator.uuid),
+            'assignee': format_uuid(task.assignee.uuid) if task.assignee_id else None,
+            'is_completed': task.is_completed,
+            'completed_at': format_datetime(task.completed_at),
+            'created_at': format_datetime(task.created_at),
+            'updated_at': format_datetime(task.updated_at),
+        }
+
+    @staticmethod
+    def comment_payload(comment):
+        """
+        Return the event payload of a comment.
+
+        Args:
+            comment: Comment instance with its task and author loaded
+
+        Returns:
+            Dict of the comment fields, task and author by UUID
+        """
+        return {
+            'uuid': format_uuid(comment.uuid),
+            'task_uuid': format_uuid(comment.task.uuid),
+            'author': format_uuid(comment.author.uuid),
+            'text': comment.text,
+            'created_at': format_datetime(comment.created_at),
+        }
+
+    @staticmethod
+    def fan_out(limit):
+        """
+        Move up to ``limit`` outbox events into deliveries, in one statement.
+
+        Args:
+            limit: Maximum number of events moved
+
+        Returns:
+            Tuple of (events moved, deliveries created)
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(WebhookService.FAN_OUT_SQL, [limit, WebhookDelivery.PENDING])
+            return cursor.fetchone()
+
+    @staticmethod
+    def claim(limit, lease_seconds):
+        """
+        Claim up to ``limit`` due deliveries for this worker.
+
+        Claimed rows are moved ``lease_seconds`` into the future in a short
+        transaction, so other workers skip them without a lock being held
+        while they are sent, and take them over if this worker dies.
+
+        Args:
+            limit: Maximum number of deliveries claimed
+            lease_seconds: Seconds the deliveries stay claimed
+
+        Returns:
+            List of WebhookDelivery instances with their subscription,
+            oldest first
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            ids = list(
+                WebhookDelivery.objects.filter(
+                    status=WebhookDelivery.PENDING, next_attempt_at__lte=now
+                ).order_by('next_attempt_at', 'id').select_for_update(
+                    skip_locked=True
+                ).values_list('id', flat=True)[:limit]
+            )
+            if not ids:
+                return []
+            WebhookDelivery.objects.filter(pk__in=ids).update(
+                next_attempt_at=now + timedelta(seconds=lease_seconds)
+            )
+        return list(
+            WebhookDelivery.objects.filter(pk__in=ids)
+            .select_related('subscription')
+            .order_by('id')
+        )
+
+    @staticmethod
+    def retry_delay(attempts):
+        """
+        Return the seconds before the next attempt after ``attempts``
+        failed ones: exponential backoff with jitter, capped.
+
+        Args:
+            attempts: Number of failed attempts, at least 1
+
+        Returns:
+            Delay in seconds
+        """
+        delay = min(
+            settings.WEBHOOK_RETRY_MAX_SECONDS,
+            settings.WEBHOOK_RETRY_BASE_SECONDS * 2 ** (attempts - 1),
+        )
+        # Jitter spreads the retries of deliveries that failed together.
+        return random.uniform(delay / 2, delay)
+
+    @staticmethod
+    def record_results(delivered, failures):
+        """
+        Delete delivered deliveries and schedule the retry of failed ones.
+
+        Args:
+            delivered: List of WebhookDelivery instances the endpoint accepted
+            failures: List of (WebhookDelivery, error message) pairs
+
+        Returns:
+            Number of deliveries marked failed for good
+        """
+        now = timezone.now()
+        failed = 0
+        for delivery, error in failures:
+            delivery.attempts += 1
+            delivery.last_error = error
+            if delivery.attempts >= settings.WEBHOOK_MAX_ATTEMPTS:
+                delivery.status = WebhookDelivery.FAILED
+                failed += 1
+                logger.warning(
+                    "Webhook delivery of event uuid %s to subscription uuid %s failed "
+                    "after %d attempts: %s",
+                    delivery.event_uuid, delivery.subscription.uuid, delivery.attempts, error,
+                )
+            else:
+                delivery.next_attempt_at = now + timedelta(
+                    seconds=WebhookService.retry_delay(delivery.attempts)
+                )
+
+        with transaction.atomic():
+            if delivered:
+                WebhookDelivery.objects.filter(
+                    pk__in=[delivery.pk for delivery in delivered]
+                ).delete()
+            if failures:
+                WebhookDelivery.objects.bulk_update(
+                    [delivery for delivery, _ in failures],
+                    fields=['attempts', 'last_error', 'status', 'next_attempt_at'],
+                    batch_size=500,
+                )
+        return failed
@@ -0,0 +1,14 @@
+"""
+URL routing for webhook subscriptions.
+"""
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+
+from .views import WebhookSubscriptionViewSet
+
+router = DefaultRouter()
+router.register(r'webhooks', WebhookSubscriptionViewSet, basename='webhook')
+
+urlpatterns = [
+    path('', include(router.urls)),
+]
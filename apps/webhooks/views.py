@@ -0,0 +1,21 @@
+"""
+ViewSets for webhook subscriptions.
+"""
+from rest_framework import viewsets
+from rest_framework.permissions import IsAdminUser
+
+from .models import WebhookSubscription
+from .serializers import WebhookSubscriptionSerializer
+
+
+class WebhookSubscriptionViewSet(viewsets.ModelViewSet):
+    """
+    ViewSet for managing webhook subscriptions.
+    Restricted to staff users, since the server POSTs to the given URLs.
+    Uses UUID for lookup instead of primary key.
+    """
+    queryset = WebhookSubscription.objects.all()
+    serializer_class = WebhookSubscriptionSerializer
+    permission_classes = [IsAdminUser]
+    lookup_field = 'uuid'
+    filterset_fields = ['is_active']
@@ -0,0 +1,148 @@
+"""
+Background delivery of webhook events, run by manage.py run_webhook_worker.
+"""
+import hashlib
+import hmac
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import groupby
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from apps.core.serializers import format_datetime, format_uuid
+from .client import ConnectionPool
+from .services import WebhookService
+
+logger = logging.getLogger(__name__)
+
+
+def sign(secret, timestamp, body):
+    """
+    Return the hex HMAC-SHA256 of ``"<timestamp>.<body>"`` keyed by
+    ``secret``, sent as ``Webhook-Signature: v1=<signature>``.
+
+    Args:
+        secret: Secret of the subscription
+        timestamp: Unix time sent as Webhook-Timestamp
+        body: Request body as bytes
+
+    Returns:
+        Hex digest
+    """
+    message = f'{timestamp}.'.encode() + body
+    return hmac.new(secret.encode(), message, hashlib.sha256).hexdigest()
+
+
+class WebhookWorker:
+    """
+    Fans outbox events out to subscriptions and POSTs due deliveries.
+
+    Each round claims a set of deliveries, sends them grouped per
+    subscription in requests of up to ``batch_size`` events, one thread
+    per endpoint over a shared keep-alive connection pool, then records
+    all results in one transaction. Several workers may run side by side.
+    """
+
+    def __init__(self, batch_size=None, claim_size=1000, threads=4, timeout=None,
+                 lease_seconds=None):
+        self.batch_size = batch_size or settings.WEBHOOK_BATCH_SIZE
+        self.claim_size = claim_size
+        self.threads = threads
+        self.lease_seconds = lease_seconds or settings.WEBHOOK_LEASE_SECONDS
+        self.pool = ConnectionPool(timeout or settings.WEBHOOK_TIMEOUT)
+
+    def run(self, poll_interval, stop):
+        """
+        Process rounds until ``stop()`` returns true, sleeping
+        ``poll_interval`` seconds whenever there was nothing to do.
+        """
+        try:
+            while not stop():
+                if not any(self.run_once().values()):
+                    time.sleep(poll_interval)
+        finally:
+            self.pool.close()
+
+    def run_once(self):
+        """
+        Fan out one batch of outbox events and send one claim of deliveries.
+
+        Returns:
+            Dict of the numbers of events fanned out, and of deliveries
+            delivered, scheduled for retry and failed for good
+        """
+        events, _ = WebhookService.fan_out(self.claim_size)
+        deliveries = WebhookService.claim(self.claim_size, self.lease_seconds)
+        delivered, failures = [], []
+        if deliveries:
+            groups = [
+                list(group) for _, group in groupby(
+                    sorted(deliveries, key=lambda delivery: delivery.subscription_id),
+                    key=lambda delivery: delivery.subscription_id,
+                )
+            ]
+            with ThreadPoolExecutor(max_workers=min(self.threads, len(groups))) as executor:
+                for ok, failed in executor.map(self.send_all, groups):
+                    delivered += ok
+                    failures += failed
+        failed = WebhookService.record_results(delivered, failures)
+        if deliveries:
+            logger.info(
+                "Webhook worker delivered %d, retrying %d, failed %d deliveries",
+                len(delivered), len(failures) - failed, failed,
+            )
+        return {
+            'events': events,
+            'delivered': len(delivered),
+            'retrying': len(failures) - failed,
+            'failed': failed,
+        }
+
+    def send_all(self, deliveries):
+        """
+        Send the deliveries of one subscription in batches, in order.
+
+        Returns:
+            Tuple of (delivered deliveries, list of (delivery, error) pairs)
+        """
+        delivered, failures = [], []
+        for start in range(0, len(deliveries), self.batch_size):
+            batch = deliveries[start:start + self.batch_size]
+            error = self.send(batch[0].subscription, batch)
+            if error is None:
+                delivered += batch
+            else:
+                failures += [(delivery, error) for delivery in batch]
+        return delivered, failures
+
+    def send(self, subscription, batch):
+        """
+        POST one signed batch of events to ``subscription``.
+
+        Returns:
+            None on a 2xx response, else the error message
+        """
+        body = json.dumps({
+            'events': [{
+                'id': format_uuid(delivery.event_uuid),
+                'type': delivery.event,
+                'created_at': format_datetime(delivery.created_at),
+                'data': delivery.payload,
+            } for delivery in batch],
+        }, cls=DjangoJSONEncoder).encode()
+        timestamp = int(time.time())
+        headers = {
+            'Content-Type': 'application/json',
+            'User-Agent': 'task-manager-webhooks',
+            'Webhook-Timestamp': str(timestamp),
+            'Webhook-Signature': f'v1={sign(subscription.secret, timestamp, body)}',
+        }
+        try:
+            status = self.pool.post(subscription.url, body, headers)
+        except Exception as exc:
+            return f'{type(exc).__name__}: {exc}'
+        if 200 <= status < 300:
+            return None
+        return f'HTTP {status}'
@@ -0,0 +1,7 @@
+"""
+Local performance benchmarks.
+
+Each module is runnable with ``python -m benchmarks.<name>`` against the
+configured Postgres server. Benchmarks create and drop their own test
+database, so development data is never touched.
+"""
@@ -0,0 +1,167 @@
+"""
+Benchmark concurrent read throughput of the API under WSGI and ASGI.
+
+Starts gunicorn (config.wsgi, sync workers) and uvicorn (config.asgi,
+async read views) with the same number of workers against a benchmark
+database and fires concurrent GET requests at both.
+
+Usage:
+    python -m benchmarks.asgi_vs_wsgi [--tasks 10000] [--workers 2]
+        [--concurrency 1 16 64] [--requests 400]
+"""
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.utils import (
+    benchmark_database,
+    new_task,
+    print_table,
+    setup_django,
+    summarize,
+)
+
+SERVERS = {
+    'wsgi (gunicorn)': [
+        sys.executable, '-m', 'gunicorn', '--bind', '127.0.0.1:{port}',
+        '--workers', '{workers}', '--log-level', 'warning', 'config.wsgi:application',
+    ],
+    'asgi (uvicorn)': [
+        sys.executable, '-m', 'uvicorn', '--host', '127.0.0.1', '--port', '{port}',
+        '--workers', '{workers}', '--log-level', 'warning', 'config.asgi:application',
+    ],
+}
+
+
+def create_dataset(tasks_count):
+    """
+    Create a user owning ``tasks_count`` tasks and return it with a task.
+    """
+    from apps.tasks.models import Task
+    from apps.users.models import User
+
+    user = User.objects.create_user(username='bench', email='bench@example.com', password='!')
+    Task.objects.bulk_create(
+        (
+            new_task(title=f'Task {index}', description='Lorem ipsum. ' * 8, creator=user)
+            for index in range(tasks_count)
+        ),
+        batch_size=2000,
+    )
+    return user, Task.objects.first()
+
+
+def start_server(command, workers):
+    """
+    Start ``command`` on a free port against the benchmark database and
+    wait until it accepts connections.
+    """
+    from django.db import connection
+
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    env = {
+        **os.environ,
+        'DB_NAME': connection.settings_dict['NAME'],
+        'DEBUG': 'False',
+        'ALLOWED_HOSTS': '127.0.0.1',
+        'TASK_LIST_CACHE_TIMEOUT': '0',
+        'LOG_LEVEL': 'WARNING',
+    }
+    process = subprocess.Popen(
+        [part.format(port=port, workers=workers) for part in command], env=env
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return process, f'http://127.0.0.1:{port}'
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f'Server did not start: {command[2]}')
+
+
+def fire(url, token, concurrency, requests):
+    """
+    Send ``requests`` GETs from ``concurrency`` threads and return the
+    durations of successful requests, the error count and the wall time.
+    """
+    def get(_):
+        request = urllib.request.Request(url, headers={'Authorization': f'Bearer {token}'})
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                response.read()
+        except (urllib.error.URLError, OSError):
+            return None
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        results = list(pool.map(get, range(requests)))
+    elapsed = time.perf_counter() - start
+    durations = [result for result in results if result is not None]
+    return durations, len(results) - len(durations), elapsed
+
+
+def run(tasks_count, workers, concurrency_levels, requests):
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    user, task = create_dataset(tasks_count)
+    token = str(AccessToken.for_user(user))
+    endpoints = {
+        'task list': '/api/tasks/?limit=20',
+        'task retrieve': f'/api/tasks/{task.uuid}/',
+        'users/me': '/api/users/me/',
+    }
+
+    results = []
+    for server, command in SERVERS.items():
+        process, base_url = start_server(command, workers)
+        try:
+            for endpoint, path in endpoints.items():
+                fire(base_url + path, token, workers, workers * 5)
+                for concurrency in concurrency_levels:
+                    durations, errors, elapsed = fire(
+                        base_url + path, token, concurrency, requests
+                    )
+                    results.append({
+                        'server': server,
+                        'endpoint': endpoint,
+                        'concurrency': concurrency,
+                        'req_per_s': len(durations) / elapsed,
+                        'errors': errors,
+                        **summarize(durations or [0]),
+                    })
+        finally:
+            process.terminate()
+            process.wait()
+
+    print(f'{tasks_count} tasks, {workers} workers per server, {requests} requests per run')
+    print_table(results, ['endpoint', 'server', 'concurrency', 'req_per_s',
+                          'median_ms', 'p95_ms', 'errors'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--tasks', type=int, default=10000)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 16, 64])
+    parser.add_argument('--requests', type=int, default=400)
+    args = parser.parse_args()
+
+    setup_django()
+    with benchmark_database():
+        run(args.tasks, args.workers, args.concurrency, args.requests)
+
+
+if __name__ == '__main__':
+    main()
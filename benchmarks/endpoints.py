@@ -0,0 +1,311 @@
+"""
+Benchmark every task and user API route against stored baselines.
+
+For each dataset size, generates users, tasks and comments with the
+seed_data generator in a benchmark database and calls every route of
+apps/tasks/urls.py and apps/users/urls.py in-process, recording p50, p95
+and p99 latency, SQL query count, SQL time and response bytes. Each run is
+compared with the baseline file; the script exits with status 1 when a
+metric regresses beyond its threshold, and refuses to run when a route
+has no benchmark case.
+
+Usage:
+    python -m benchmarks.endpoints [--sizes 1k 10k] [--repeat 30]
+        [--baseline benchmarks/baselines/endpoints.json] [--save-baseline]
+        [--latency-threshold 0.25] [--queries-threshold 0] [--bytes-threshold 0.1]
+"""
+import argparse
+import io
+import json
+import logging
+import statistics
+import sys
+import time
+from collections import namedtuple
+from pathlib import Path
+
+from benchmarks.utils import (
+    benchmark_database,
+    percentile,
+    print_table,
+    setup_django,
+)
+
+DEFAULT_BASELINE = Path(__file__).parent / 'baselines' / 'endpoints.json'
+PASSWORD = 'bench'
+# Fixed, so datasets and response sizes are the same on every run.
+END_DATE = '2025-01-01'
+WARMUP = 2
+# Latency differences below this are noise on millisecond-fast endpoints.
+MIN_LATENCY_DELTA_MS = 1.0
+
+# ``request`` returns ``(path, data)`` and runs outside the timed call, so
+# cases that consume objects (deletes) can create them first.
+Case = namedtuple('Case', 'name route method request')
+
+
+class QueryRecorder:
+    """
+    Database execute wrapper counting queries and their time.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.seconds += time.perf_counter() - start
+
+
+def create_dataset(size):
+    """
+    Generate ``size`` tasks for ``size // 100`` users (at least 10) and
+    return the busiest user, one of its tasks with comments and a comment.
+    """
+    from django.core.management import call_command
+    from apps.tasks.models import Task
+    from apps.users.models import User
+
+    call_command(
+        'seed_data', f'--users={max(10, size // 100)}', f'--tasks={size}', '--seed=1',
+        f'--end-date={END_DATE}', f'--password={PASSWORD}', stdout=io.StringIO(),
+    )
+    user = User.objects.get(username='user1')
+    task = Task.objects.filter(creator=user).order_by('-comment_count', 'id').first()
+    return user, task, task.comments.order_by('id').first()
+
+
+def build_cases(user, task, comment):
+    """
+    Return the benchmark cases; every route and method needs one.
+    """
+    from apps.tasks.models import ChangeLogEntry, Task
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    def fixed(path, data=None):
+        return lambda: (path, data)
+
+    def new_task_path():
+        return f'/api/tasks/{Task.objects.create(title="Disposable", creator=user).uuid}/', None
+
+    def bulk_request():
+        deleted = Task.objects.bulk_create(
+            Task(title=f'Disposable {index}', creator=user, last_activity_at=task.created_at)
+            for index in range(10)
+        )
+        updated = Task.objects.filter(creator=user).order_by('id')[:10]
+        return '/api/tasks/bulk/', {
+            'create': [{'title': f'Bulk {index}'} for index in range(10)],
+            'update': [{'uuid': str(item.uuid), 'is_completed': True} for item in updated],
+            'delete': [str(item.uuid) for item in deleted],
+        }
+
+    task_path = f'/api/tasks/{task.uuid}/'
+    comments_path = f'{task_path}comments/'
+    # The position 100 entries before the end of the change log.
+    since = '.'.join(map(str, ChangeLogEntry.objects.order_by('-txid', '-id').values_list(
+        'txid', 'id')[100]))
+    # Reads first, so writes do not change the data they are measured on.
+    return [
+        Case('task list', 'task-list', 'get', fixed('/api/tasks/')),
+        Case('task list, keyset page', 'task-list', 'get', fixed('/api/tasks/?cursor=&limit=50')),
+        Case('task list, comments embedded', 'task-list', 'get',
+             fixed('/api/tasks/?include=comments&limit=50')),
+        Case('task list, filtered', 'task-list', 'get',
+             fixed(f'/api/tasks/?is_completed=false&assignee={user.uuid}&limit=50')),
+        Case('task search', 'task-list', 'get', fixed('/api/tasks/?q=review%20report&limit=20')),
+        Case('task export', 'task-export', 'get', fixed('/api/tasks/export/?format=ndjson')),
+        Case('task retrieve', 'task-detail', 'get', fixed(task_path + '?include=comments')),
+        Case('comment list', 'task-comments-list', 'get', fixed(comments_path + '?limit=20')),
+        Case('comment retrieve', 'task-comments-detail', 'get',
+             fixed(f'{comments_path}{comment.uuid}/')),
+        Case('user list', 'user-list', 'get', fixed('/api/users/?limit=20')),
+        Case('user autocomplete', 'user-autocomplete', 'get', fixed('/api/users/autocomplete/?q=use')),
+        Case('current user', 'user-current-user', 'get', fixed('/api/users/me/')),
+        Case('user retrieve', 'user-detail', 'get', fixed(f'/api/users/{user.uuid}/')),
+        Case('user stats', 'user-stats', 'get', fixed(f'/api/users/{user.uuid}/stats/')),
+        Case('current user stats', 'user-current-user-stats', 'get', fixed('/api/users/me/stats/')),
+        Case('sync, full sync page', 'sync-list', 'get', fixed('/api/sync/?limit=500')),
+        Case('sync, 100 changes', 'sync-list', 'get', fixed(f'/api/sync/?since={since}')),
+        Case('token obtain', 'token_obtain_pair', 'post',
+             fixed('/api/auth/token/', {'username': user.username, 'password': PASSWORD})),
+        Case('token refresh', 'token_refresh', 'post',
+             lambda: ('/api/auth/token/refresh/', {'refresh': str(RefreshToken.for_user(user))})),
+        Case('task create', 'task-list', 'post',
+             fixed('/api/tasks/', {'title': 'Benchmark task', 'description': 'Created'})),
+        Case('task bulk', 'task-bulk', 'post', bulk_request),
+        Case('task update', 'task-detail', 'put',
+             fixed(task_path, {'title': task.title, 'description': 'Updated'})),
+        Case('task partial update', 'task-detail', 'patch',
+             fixed(task_path, {'description': 'Patched'})),
+        Case('task delete', 'task-detail', 'delete', new_task_path),
+        Case('comment create', 'task-comments-list', 'post',
+             fixed(comments_path, {'text': 'Benchmark comment'})),
+    ]
+
+
+def route_methods():
+    """
+    Return ``(route name, method)`` of every route in the task and user
+    URLconfs.
+    """
+    from apps.tasks import urls as task_urls
+    from apps.users import urls as user_urls
+
+    def walk(patterns):
+        for pattern in patterns:
+            if hasattr(pattern, 'url_patterns'):
+                yield from walk(pattern.url_patterns)
+            elif pattern.name != 'api-root':
+                yield pattern
+
+    routes = set()
+    for pattern in walk([*task_urls.urlpatterns, *user_urls.urlpatterns]):
+        view = pattern.callback.cls
+        methods = getattr(pattern.callback, 'actions', None) or {
+            method: method for method in view.http_method_names if hasattr(view, method)
+        }
+        routes.update(
+            (pattern.name, method) for method in methods
+            if method in view.http_method_names and method not in ('head', 'options')
+        )
+    return routes
+
+
+def measure_case(client, case, repeat):
+    """
+    Call ``case`` ``WARMUP + repeat`` times and return its metrics.
+    """
+    from django.db import connection
+
+    durations, queries, sql_times, sizes = [], [], [], []
+    for iteration in range(WARMUP + repeat):
+        path, data = case.request()
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            start = time.perf_counter()
+            response = getattr(client, case.method)(path, data, format='json')
+            body = (b''.join(response.streaming_content) if response.streaming
+                    else response.content)
+            elapsed = time.perf_counter() - start
+        if response.status_code >= 300:
+            raise RuntimeError(f'{case.name}: {response.status_code} {body[:200]!r}')
+        if iteration >= WARMUP:
+            durations.append(elapsed)
+            queries.append(recorder.count)
+            sql_times.append(recorder.seconds)
+            sizes.append(len(body))
+    return {
+        'p50_ms': round(percentile(durations, 50) * 1000, 3),
+        'p95_ms': round(percentile(durations, 95) * 1000, 3),
+        'p99_ms': round(percentile(durations, 99) * 1000, 3),
+        'queries': max(queries),
+        'sql_ms': round(statistics.median(sql_times) * 1000, 3),
+        'bytes': int(statistics.median(sizes)),
+    }
+
+
+def compare(result, baseline, thresholds):
+    """
+    Return the regressions of ``result`` against ``baseline`` as strings.
+    """
+    if baseline is None:
+        return ['no baseline']
+    regressions = []
+    for metric in ('p50_ms', 'p95_ms', 'sql_ms'):
+        if (result[metric] > baseline[metric] * (1 + thresholds['latency'])
+                and result[metric] - baseline[metric] > MIN_LATENCY_DELTA_MS):
+            regressions.append(f'{metric} +{result[metric] / baseline[metric] - 1:.0%}')
+    if result['queries'] > baseline['queries'] + thresholds['queries']:
+        regressions.append(f'queries {baseline["queries"]} -> {result["queries"]}')
+    if result['bytes'] > baseline['bytes'] * (1 + thresholds['bytes']):
+        regressions.append(f'bytes +{result["bytes"] / baseline["bytes"] - 1:.0%}')
+    return regressions
+
+
+def run_size(size, repeat):
+    from django.test import override_settings
+    from rest_framework.test import APIClient
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    user, task, comment = create_dataset(size)
+    cases = build_cases(user, task, comment)
+    missing = route_methods() - {(case.route, case.method) for case in cases}
+    if missing:
+        raise SystemExit('Routes without a benchmark case: ' + ', '.join(
+            f'{method.upper()} {name}' for name, method in sorted(missing)
+        ))
+
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}')
+    # The response cache would turn repeated list calls into cache hits
+    # and hide their queries.
+    with override_settings(TASK_LIST_CACHE_TIMEOUT=0, ALLOWED_HOSTS=['testserver']):
+        return {case.name: measure_case(client, case, repeat) for case in cases}
+
+
+def run(sizes, repeat, baseline_path, save_baseline, thresholds):
+    results = {}
+    for size in sizes:
+        with benchmark_database():
+            results[str(size)] = run_size(size, repeat)
+
+    baselines = {}
+    if save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(results, indent=2, sort_keys=True) + '\n')
+        print(f'Baseline saved to {baseline_path}')
+    elif baseline_path.exists():
+        baselines = json.loads(baseline_path.read_text())
+
+    rows = []
+    regressed = False
+    for size, cases in results.items():
+        for name, result in cases.items():
+            regressions = [] if save_baseline else compare(
+                result, baselines.get(size, {}).get(name), thresholds
+            )
+            regressed |= any(regression != 'no baseline' for regression in regressions)
+            rows.append({'size': size, 'case': name, **result,
+                         'status': ', '.join(regressions) or 'ok'})
+    print_table(rows, ['size', 'case', 'p50_ms', 'p95_ms', 'p99_ms', 'queries', 'sql_ms',
+                       'bytes', 'status'])
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', nargs='+', default=['1k', '10k'],
+                        help='Dataset sizes in tasks, e.g. 1k 10k 100k')
+    parser.add_argument('--repeat', type=int, default=30)
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='Store this run as the baseline instead of comparing')
+    parser.add_argument('--latency-threshold', type=float, default=0.25,
+                        help='Allowed relative increase of p50, p95 and SQL time')
+    parser.add_argument('--queries-threshold', type=int, default=0,
+                        help='Allowed increase of the query count')
+    parser.add_argument('--bytes-threshold', type=float, default=0.1,
+                        help='Allowed relative increase of response bytes')
+    args = parser.parse_args()
+
+    setup_django()
+    from apps.core.management.commands.seed_data import count
+
+    # Request logging would drown the results.
+    logging.disable(logging.INFO)
+    regressed = run(
+        [count(size) for size in args.sizes], args.repeat, args.baseline, args.save_baseline,
+        {'latency': args.latency_threshold, 'queries': args.queries_threshold,
+         'bytes': args.bytes_threshold},
+    )
+    sys.exit(1 if regressed else 0)
+
+
+if __name__ == '__main__':
+    main()
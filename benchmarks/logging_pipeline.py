@@ -0,0 +1,143 @@
+"""
+Benchmark request latency with synchronous vs background queue logging.
+
+The queue configuration is config.settings.LOGGING. Each configuration
+writes to the console (redirected to /dev/null) and rotating info/error
+files in ``--log-dir``. It is measured on single logger calls, on task
+retrieval, which logs the timing line, and on task create/update
+requests, which also log from TaskService.
+
+Usage:
+    python -m benchmarks.logging_pipeline [--repeat 300] [--log-dir /tmp]
+"""
+import argparse
+import copy
+import logging
+import logging.config
+import os
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+from benchmarks.utils import (
+    benchmark_database,
+    percentile,
+    print_table,
+    setup_django,
+)
+
+CONFIGS = (
+    # (name, background queue, formatter)
+    ('sync, text', False, 'verbose'),
+    ('sync, json', False, 'json'),
+    ('queue, json', True, 'json'),
+)
+ROUNDS = 5
+WARMUP = 5
+
+
+def logging_config(directory, background, formatter, console):
+    """
+    Return a copy of ``settings.LOGGING`` writing to ``directory``, through
+    the queue handler or straight to the target handlers.
+    """
+    from django.conf import settings
+
+    config = copy.deepcopy(settings.LOGGING)
+    handlers = config['handlers']
+    handlers['console']['stream'] = console
+    for name in ('console', 'info_file', 'error_file'):
+        handlers[name]['formatter'] = formatter
+    for name in ('info_file', 'error_file'):
+        handlers[name]['filename'] = directory / f'{name}.log'
+    targets = ['queue'] if background else ['console', 'info_file', 'error_file']
+    for logger in (*config['loggers'].values(), config['root']):
+        logger['handlers'] = targets
+    return config
+
+
+def measure_log_calls(repeat):
+    logger = logging.getLogger('apps.tasks.services')
+    durations = []
+    for _ in range(repeat):
+        task, user = uuid.uuid4(), uuid.uuid4()
+        start = time.perf_counter()
+        logger.info(f'User uuid {user} created task uuid {task}')
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def measure_requests(client, method, path, data, repeat):
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = getattr(client, method)(path, data, format='json')
+        durations.append(time.perf_counter() - start)
+        assert response.status_code < 300, response.content
+    return durations
+
+
+def run(repeat, log_dir):
+    from django.test import override_settings
+    from rest_framework.test import APIClient
+    from apps.tasks.models import Task
+    from apps.users.models import User
+
+    user = User.objects.create_user(username='bench', password='!')
+    task = Task.objects.create(title='Benchmark', creator=user)
+    client = APIClient()
+    client.force_authenticate(user)
+    cases = {
+        'log call': measure_log_calls,
+        'task retrieve': lambda repeat: measure_requests(
+            client, 'get', f'/api/tasks/{task.uuid}/', None, repeat),
+        'task create': lambda repeat: measure_requests(
+            client, 'post', '/api/tasks/', {'title': 'Logged'}, repeat),
+        'task update': lambda repeat: measure_requests(
+            client, 'patch', f'/api/tasks/{task.uuid}/', {'description': 'Logged'}, repeat),
+    }
+
+    # Configurations take turns, so growing tables slow them down alike.
+    durations = {}
+    with open(os.devnull, 'w') as console, \
+            override_settings(ALLOWED_HOSTS=['testserver']):
+        for _ in range(ROUNDS):
+            for name, background, formatter in CONFIGS:
+                with tempfile.TemporaryDirectory(dir=log_dir) as directory:
+                    logging.config.dictConfig(
+                        logging_config(Path(directory), background, formatter, console)
+                    )
+                    for case, func in cases.items():
+                        func(WARMUP)
+                        durations.setdefault((name, case), []).extend(func(repeat // ROUNDS))
+                    # Writes what is still queued before the files go away.
+                    logging.shutdown()
+
+    rows = [
+        {
+            'logging': name,
+            'case': case,
+            'p50_us': percentile(values, 50) * 1e6,
+            'p95_us': percentile(values, 95) * 1e6,
+            'p99_us': percentile(values, 99) * 1e6,
+        }
+        for (name, case), values in durations.items()
+    ]
+    print_table(rows, ['logging', 'case', 'p50_us', 'p95_us', 'p99_us'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=300)
+    parser.add_argument('--log-dir', default=None,
+                        help='Directory for the log files (default: system temp dir)')
+    args = parser.parse_args()
+
+    setup_django()
+    with benchmark_database():
+        run(args.repeat, args.log_dir)
+
+
+if __name__ == '__main__':
+    main()
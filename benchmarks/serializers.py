@@ -0,0 +1,119 @@
+"""
+Benchmark ModelSerializer vs row serializers for task and comment pages.
+
+Usage:
+    python -m benchmarks.serializers [--rows 10000] [--users 200] [--repeat 5]
+"""
+import argparse
+import random
+
+from benchmarks.utils import (
+    benchmark_database,
+    measure,
+    new_task,
+    print_table,
+    setup_django,
+    summarize,
+)
+
+
+def create_dataset(rows, users_count):
+    """
+    Create ``users_count`` users, ``rows`` tasks and ``rows`` comments on a
+    single task, with users picked at random.
+    """
+    from apps.tasks.models import Task, Comment
+    from apps.users.models import User
+
+    rng = random.Random(0)
+    users = User.objects.bulk_create(
+        User(
+            username=f'bench_user_{index}',
+            email=f'bench_user_{index}@example.com',
+            first_name='Bench',
+            last_name=f'User {index}',
+            password='!',
+        )
+        for index in range(users_count)
+    )
+    Task.objects.bulk_create(
+        (
+            new_task(
+                title=f'Task {index}',
+                description='Lorem ipsum dolor sit amet. ' * 8,
+                creator=rng.choice(users),
+                assignee=rng.choice(users) if rng.random() < 0.8 else None,
+                is_completed=rng.random() < 0.3,
+            )
+            for index in range(rows)
+        ),
+        batch_size=2000,
+    )
+    task = Task.objects.first()
+    Comment.objects.bulk_create(
+        (
+            Comment(task=task, author=rng.choice(users), text=f'Comment {index}')
+            for index in range(rows)
+        ),
+        batch_size=2000,
+    )
+    return task
+
+
+def run(rows, users_count, repeat):
+    from rest_framework.renderers import JSONRenderer
+    from apps.tasks.models import Task, Comment
+    from apps.tasks.serializers import (
+        TaskSerializer,
+        CommentSerializer,
+        TaskRowSerializer,
+        CommentRowSerializer,
+    )
+
+    task = create_dataset(rows, users_count)
+    tasks = Task.objects.select_related('creator', 'assignee').order_by('-created_at')
+    comments = Comment.objects.filter(task=task).select_related('author', 'task')
+    renderer = JSONRenderer()
+
+    cases = {
+        'tasks / TaskSerializer': lambda: TaskSerializer(
+            list(tasks[:rows]), many=True
+        ).data,
+        'tasks / TaskRowSerializer': lambda: TaskRowSerializer(
+            list(TaskRowSerializer.get_queryset(tasks)[:rows])
+        ).data,
+        'comments / CommentSerializer': lambda: CommentSerializer(
+            list(comments[:rows]), many=True
+        ).data,
+        'comments / CommentRowSerializer': lambda: CommentRowSerializer(
+            list(CommentRowSerializer.get_queryset(comments)[:rows])
+        ).data,
+    }
+
+    results = []
+    for name, func in cases.items():
+        stats = summarize(measure(func, repeat=repeat))
+        data = func()
+        stats['render_ms'] = summarize(
+            measure(lambda: renderer.render(data), repeat=repeat)
+        )['median_ms']
+        results.append({'case': name, **stats})
+
+    print(f'Fetch + serialize {rows} rows ({users_count} users), {repeat} runs')
+    print_table(results, ['case', 'min_ms', 'median_ms', 'p95_ms', 'max_ms', 'render_ms'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+    with benchmark_database():
+        run(args.rows, args.users, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
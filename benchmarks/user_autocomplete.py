@@ -0,0 +1,90 @@
+"""
+Benchmark user autocomplete against the old icontains search.
+
+Usage:
+    python -m benchmarks.user_autocomplete [--users 1000000] [--repeat 50]
+"""
+import argparse
+
+from benchmarks.utils import (
+    benchmark_database,
+    measure,
+    print_table,
+    setup_django,
+    summarize,
+)
+
+QUERIES = ['a', 'jo', 'john', 'smit', 'user_4242', 'example.org']
+
+
+def create_dataset(users_count):
+    """
+    Insert ``users_count`` users with a single INSERT ... SELECT.
+    """
+    from django.db import connection
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            INSERT INTO users (
+                uuid, username, email, first_name, last_name, password,
+                is_superuser, is_staff, is_active, date_joined,
+                created_at, updated_at
+            )
+            SELECT
+                gen_random_uuid(),
+                (ARRAY['john', 'jane', 'anna', 'mike', 'user'])[1 + i %% 5] || '_' || i,
+                'person' || i || '@' || (ARRAY['example.com', 'example.org'])[1 + i %% 2],
+                (ARRAY['John', 'Jane', 'Anna', 'Mike', 'Sam'])[1 + i %% 5],
+                (ARRAY['Smith', 'Jones', 'Brown', 'Taylor', 'Lee'])[1 + (i / 5) %% 5] || i %% 97,
+                '!', false, false, true, now(), now(), now()
+            FROM generate_series(1, %s) AS i
+            """,
+            [users_count],
+        )
+        cursor.execute('ANALYZE users')
+
+
+def run(users_count, repeat):
+    from apps.users.models import User
+    from apps.users.search import autocomplete_users
+    from apps.users.filters import UserFilter
+
+    create_dataset(users_count)
+    users = User.objects.filter(is_active=True).only('uuid', 'username', 'email',
+                                                     'first_name', 'last_name')
+    search = UserFilter().filter_search
+
+    results = []
+    for text in QUERIES:
+        results.append({
+            'query': text,
+            'case': 'autocomplete',
+            **summarize(measure(lambda: autocomplete_users(users, text, 10), repeat=repeat)),
+        })
+        results.append({
+            'query': text,
+            'case': 'search (icontains)',
+            **summarize(measure(
+                lambda: list(search(users.order_by('username'), 'search', text)[:10]),
+                repeat=repeat,
+            )),
+        })
+
+    print(f'{users_count} users, {repeat} runs per query, limit 10')
+    print_table(results, ['query', 'case', 'min_ms', 'median_ms', 'p95_ms', 'max_ms'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--users', type=int, default=1000000)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    setup_django()
+    with benchmark_database():
+        run(args.users, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""
+Shared helpers for benchmark scripts.
+"""
+import os
+import statistics
+import time
+from contextlib import contextmanager
+
+
+def setup_django():
+    """
+    Configure Django for a standalone benchmark script.
+    """
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+    import django
+    django.setup()
+
+
+@contextmanager
+def benchmark_database(keepdb=False):
+    """
+    Create a throwaway test database for the duration of the block.
+    """
+    from django.db import connection
+
+    old_name = connection.settings_dict['NAME']
+    # Keep clear of the test database pytest reuses.
+    connection.settings_dict['TEST']['NAME'] = f'bench_{old_name}'
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=keepdb)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=keepdb)
+
+
+def new_task(**fields):
+    """
+    Return an unsaved Task ready for ``bulk_create()``, which skips the
+    ``last_activity_at`` initialization of ``Task.save()``.
+    """
+    from apps.tasks.models import Task
+
+    task = Task(**fields)
+    task.last_activity_at = task.created_at
+    return task
+
+
+def measure(func, repeat=5, warmup=1):
+    """
+    Call ``func`` ``warmup + repeat`` times and return the timed durations
+    in seconds.
+    """
+    for _ in range(warmup):
+        func()
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def percentile(values, percent):
+    """
+    Return the ``percent`` percentile of ``values`` (nearest rank).
+    """
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(percent / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(durations):
+    """
+    Return min/median/p95/max of durations in milliseconds.
+    """
+    return {
+        'min_ms': min(durations) * 1000,
+        'median_ms': statistics.median(durations) * 1000,
+        'p95_ms': percentile(durations, 95) * 1000,
+        'max_ms': max(durations) * 1000,
+    }
+
+
+def print_table(rows, columns):
+    """
+    Print ``rows`` (dicts) as an aligned text table.
+    """
+    widths = {
+        column: max(len(column), *(len(_format_cell(row[column])) for row in rows))
+        for column in columns
+    }
+    print('  '.join(column.ljust(widths[column]) for column in columns))
+    print('  '.join('-' * widths[column] for column in columns))
+    for row in rows:
+        print('  '.join(_format_cell(row[column]).ljust(widths[column]) for column in columns))
+
+
+def _format_cell(value):
+    if isinstance(value, float):
+        return f'{value:.2f}'
+    return str(value)
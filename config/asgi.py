@@ -1,9 +1,13 @@
 """
 ASGI config for smarteducation project.
+
+Serve with e.g. ``uvicorn config.asgi:application --workers 4``. Read
+endpoints run as async views here (see ``API_ASYNC_VIEWS``).
 """
 import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+os.environ.setdefault('API_ASYNC_VIEWS', 'true')
 
-application = get_asgi_application()
\ No newline at end of file
+application = get_asgi_application()
@@ -4,7 +4,7 @@ Django settings for smarteducation project.
 import os
 from pathlib import Path
 from datetime import timedelta
-from decouple import config
+from decouple import Csv, config
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -25,6 +25,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     
     # Third-party
     'rest_framework',
@@ -36,9 +37,12 @@ INSTALLED_APPS = [
     'apps.core',
     'apps.users',
     'apps.tasks',
+    'apps.webhooks',
 ]
 
 MIDDLEWARE = [
+    # First, so its timings cover the other middleware.
+    'apps.core.timing.ServerTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -67,6 +71,11 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'config.wsgi.application'
+ASGI_APPLICATION = 'config.asgi.application'
+
+# Serve read endpoints with async views (apps.core.async_views). Enabled by
+# config.asgi; keep it off under WSGI, where every view runs in a thread.
+API_ASYNC_VIEWS = config('API_ASYNC_VIEWS', default=False, cast=bool)
 
 # Database
 DATABASES = {
@@ -80,6 +89,78 @@ DATABASES = {
     }
 }
 
+# Read replicas (DB_REPLICA_HOSTS=host[:port],...) share the primary's
+# database name and credentials. apps.core.replicas.ReplicaRouter sends the
+# reads of the task, comment and user APIs to a replica lagging at most
+# REPLICA_MAX_LAG_SECONDS (checked every REPLICA_CHECK_INTERVAL seconds per
+# process), and pins users to the primary for REPLICA_PIN_SECONDS after a
+# write. Pins are kept in the default cache, so it must be shared.
+for index, replica in enumerate(config('DB_REPLICA_HOSTS', default='', cast=Csv()), start=1):
+    host, _, port = replica.partition(':')
+    DATABASES[f'replica{index}'] = {
+        **DATABASES['default'],
+        'HOST': host,
+        'PORT': port or DATABASES['default']['PORT'],
+        'OPTIONS': {'connect_timeout': 2},
+        'TEST': {'MIRROR': 'default'},
+    }
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+DATABASE_ROUTERS = ['apps.core.replicas.ReplicaRouter']
+REPLICA_MAX_LAG_SECONDS = config('REPLICA_MAX_LAG_SECONDS', default=2, cast=float)
+REPLICA_CHECK_INTERVAL = config('REPLICA_CHECK_INTERVAL', default=5, cast=float)
+REPLICA_PIN_SECONDS = config('REPLICA_PIN_SECONDS', default=10, cast=float)
+
+# Cache: locmem by default; point CACHE_BACKEND/CACHE_LOCATION at a shared
+# backend (e.g. django.core.cache.backends.redis.RedisCache) in production.
+CACHE_BACKEND = config(
+    'CACHE_BACKEND',
+    default='django.core.cache.backends.locmem.LocMemCache',
+)
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKEND,
+        'LOCATION': config('CACHE_LOCATION', default=''),
+    }
+}
+
+# Task list response cache (apps.tasks.cache.TaskListCache); 0 disables it.
+# Off by default with a per-process cache (locmem/dummy): each worker would
+# keep its own generation counter and serve pages other workers invalidated.
+TASK_LIST_CACHE_ALIAS = 'default'
+TASK_LIST_CACHE_TIMEOUT = config(
+    'TASK_LIST_CACHE_TIMEOUT',
+    default=0 if CACHE_BACKEND.endswith(('LocMemCache', 'DummyCache')) else 300,
+    cast=int,
+)
+
+# Users resolved by JWT authentication (apps.users.authentication.UserCache):
+# a per-process LRU (TIMEOUT seconds, 0 disables the cache; it also bounds
+# how long other workers keep a deactivated user), backed by the shared
+# cache ALIAS when one is configured.
+AUTH_USER_CACHE_TIMEOUT = config('AUTH_USER_CACHE_TIMEOUT', default=30, cast=int)
+AUTH_USER_CACHE_SIZE = config('AUTH_USER_CACHE_SIZE', default=1000, cast=int)
+AUTH_USER_CACHE_ALIAS = (
+    None if CACHE_BACKEND.endswith(('LocMemCache', 'DummyCache')) else 'default'
+)
+AUTH_USER_CACHE_SHARED_TIMEOUT = config('AUTH_USER_CACHE_SHARED_TIMEOUT', default=300, cast=int)
+
+# Per-request timings (apps.core.timing.ServerTimingMiddleware): the
+# Server-Timing header can be turned off where clients must not see it.
+# With REQUEST_PROFILE_DIR set, SAMPLE_RATE of requests are run under
+# cProfile and those slower than MIN_MS are saved there.
+SERVER_TIMING_HEADER = config('SERVER_TIMING_HEADER', default=True, cast=bool)
+REQUEST_PROFILE_DIR = config('REQUEST_PROFILE_DIR', default='')
+REQUEST_PROFILE_SAMPLE_RATE = config('REQUEST_PROFILE_SAMPLE_RATE', default=0.01, cast=float)
+REQUEST_PROFILE_MIN_MS = config('REQUEST_PROFILE_MIN_MS', default=500, cast=float)
+
+# Prometheus metrics at /metrics (apps.core.metrics). Each worker process
+# writes its metrics to METRICS_DIR every FLUSH_INTERVAL seconds and
+# /metrics adds them up; without METRICS_DIR only the serving process is
+# reported. With METRICS_TOKEN set, scrapers must send it as a Bearer token.
+METRICS_DIR = config('METRICS_DIR', default='')
+METRICS_FLUSH_INTERVAL = config('METRICS_FLUSH_INTERVAL', default=5, cast=float)
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+
 # Custom User Model
 AUTH_USER_MODEL = 'users.User'
 
@@ -115,12 +196,12 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.users.authentication.CachedJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
+    'DEFAULT_PAGINATION_CLASS': 'apps.core.pagination.CountStrategyLimitOffsetPagination',
     'PAGE_SIZE': 10,
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
@@ -129,6 +210,30 @@ REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
 }
 
+# Pagination count strategy: exact, auto, estimate or none
+# (see apps.core.pagination.CountStrategyLimitOffsetPagination)
+PAGINATION_COUNT_STRATEGY = config('PAGINATION_COUNT_STRATEGY', default='auto')
+PAGINATION_EXACT_COUNT_THRESHOLD = config(
+    'PAGINATION_EXACT_COUNT_THRESHOLD', default=10000, cast=int
+)
+
+# Delta sync (/api/sync/): change log entries read per page by default and
+# at most, and the days deletions are kept by compact_change_log; clients
+# that sync less often must start over.
+SYNC_PAGE_SIZE = config('SYNC_PAGE_SIZE', default=500, cast=int)
+SYNC_MAX_PAGE_SIZE = config('SYNC_MAX_PAGE_SIZE', default=5000, cast=int)
+CHANGE_LOG_RETENTION_DAYS = config('CHANGE_LOG_RETENTION_DAYS', default=30, cast=int)
+
+# Outbound webhooks, delivered by manage.py run_webhook_worker: events per
+# POST, request timeout, how long a claimed delivery stays locked to one
+# worker, and exponential retry backoff until a delivery is marked failed.
+WEBHOOK_BATCH_SIZE = config('WEBHOOK_BATCH_SIZE', default=100, cast=int)
+WEBHOOK_TIMEOUT = config('WEBHOOK_TIMEOUT', default=10, cast=float)
+WEBHOOK_LEASE_SECONDS = config('WEBHOOK_LEASE_SECONDS', default=300, cast=int)
+WEBHOOK_MAX_ATTEMPTS = config('WEBHOOK_MAX_ATTEMPTS', default=10, cast=int)
+WEBHOOK_RETRY_BASE_SECONDS = config('WEBHOOK_RETRY_BASE_SECONDS', default=10, cast=int)
+WEBHOOK_RETRY_MAX_SECONDS = config('WEBHOOK_RETRY_MAX_SECONDS', default=3600, cast=int)
+
 # JWT Settings
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(
@@ -158,10 +263,25 @@ SPECTACULAR_SETTINGS = {
 LOGS_DIR = BASE_DIR / 'logs'
 LOGS_DIR.mkdir(exist_ok=True)
 
+# Loggers write to a bounded in-memory queue; a background thread formats
+# the records and writes them to the console and files, so requests never
+# wait on log I/O. Records below ERROR are dropped while the queue is full
+# (LOG_QUEUE_OVERFLOW=block waits instead). LOG_SAMPLE_RATES keeps a share
+# of the INFO/DEBUG records of busy loggers, e.g.
+# "apps.core.timing=0.1,django.server=0.5".
+LOG_FORMAT = config('LOG_FORMAT', default='json')
+LOG_SAMPLE_RATES = {
+    name: float(rate)
+    for name, rate in (item.split('=') for item in config('LOG_SAMPLE_RATES', default='', cast=Csv()))
+}
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
     'formatters': {
+        'json': {
+            '()': 'apps.core.log.JsonFormatter',
+        },
         'verbose': {
             'format': '[{levelname}] {asctime} {name} - {message}',
             'style': '{',
@@ -172,17 +292,32 @@ LOGGING = {
             'style': '{',
         },
     },
+    'filters': {
+        'sampling': {
+            '()': 'apps.core.log.SamplingFilter',
+            'rates': LOG_SAMPLE_RATES,
+        },
+    },
     'handlers': {
+        'queue': {
+            'class': 'apps.core.log.AsyncQueueHandler',
+            'queue': {'()': 'queue.Queue', 'maxsize': config('LOG_QUEUE_SIZE', default=10000, cast=int)},
+            'listener': 'apps.core.log.BackgroundListener',
+            'handlers': ['console', 'info_file', 'error_file'],
+            'respect_handler_level': True,
+            'filters': ['sampling'],
+            '.': {'overflow': config('LOG_QUEUE_OVERFLOW', default='drop')},
+        },
         'console': {
             'class': 'logging.StreamHandler',
-            'formatter': 'verbose',
+            'formatter': LOG_FORMAT,
         },
         'info_file': {
             'class': 'logging.handlers.RotatingFileHandler',
             'filename': LOGS_DIR / 'info.log',
             'maxBytes': 10 * 1024 * 1024,  # 10 MB
             'backupCount': 5,
-            'formatter': 'verbose',
+            'formatter': LOG_FORMAT,
             'level': 'INFO',
         },
         'error_file': {
@@ -190,24 +325,24 @@ LOGGING = {
             'filename': LOGS_DIR / 'error.log',
             'maxBytes': 10 * 1024 * 1024,  # 10 MB
             'backupCount': 5,
-            'formatter': 'verbose',
+            'formatter': LOG_FORMAT,
             'level': 'ERROR',
         },
     },
     'loggers': {
         'apps': {
-            'handlers': ['console', 'info_file', 'error_file'],
+            'handlers': ['queue'],
             'level': config('LOG_LEVEL', default='INFO'),
             'propagate': False,
         },
         'django': {
-            'handlers': ['console', 'info_file', 'error_file'],
+            'handlers': ['queue'],
             'level': config('DJANGO_LOG_LEVEL', default='INFO'),
             'propagate': False,
         },
     },
     'root': {
-        'handlers': ['console', 'info_file', 'error_file'],
+        'handlers': ['queue'],
         'level': config('LOG_LEVEL', default='INFO'),
     },
-}
\ No newline at end of file
+}
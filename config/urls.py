@@ -6,6 +6,7 @@ from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import path, include
+from apps.core.views import metrics_view
 from drf_spectacular.views import (
     SpectacularAPIView,
     SpectacularSwaggerView,
@@ -18,11 +19,15 @@ urlpatterns = [
     # API
     path('api/', include('apps.users.urls')),
     path('api/', include('apps.tasks.urls')),
+    path('api/', include('apps.webhooks.urls')),
 
     # API Documentation
     path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
     path('api/docs/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
     path('api/redoc/', SpectacularRedocView.as_view(url_name='schema'), name='redoc'),
+
+    # Prometheus scrape target
+    path('metrics', metrics_view, name='metrics'),
 ]
 
 # Serve static files in debug mode
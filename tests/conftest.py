@@ -3,8 +3,10 @@ Pytest configuration and fixtures for integration tests.
 """
 import pytest
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from rest_framework.test import APIClient
 from apps.tasks.models import Task
+from apps.users.authentication import UserCache
 
 User = get_user_model()
 
@@ -12,7 +14,8 @@ User = get_user_model()
 # Expected API response structures
 TASK_FIELDS = {
     'uuid', 'title', 'description', 'creator', 'assignee',
-    'is_completed', 'completed_at', 'created_at', 'updated_at'
+    'is_completed', 'completed_at', 'comment_count', 'last_activity_at',
+    'created_at', 'updated_at'
 }
 
 USER_FIELDS = {
@@ -20,10 +23,22 @@ USER_FIELDS = {
 }
 
 PAGINATION_FIELDS = {
-    'count', 'next', 'previous', 'results'
+    'count', 'count_type', 'next', 'previous', 'results'
 }
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """
+    Fixture for isolating tests from each other's cached responses.
+    """
+    cache.clear()
+    UserCache.clear()
+    yield
+    cache.clear()
+    UserCache.clear()
+
+
 @pytest.fixture
 def api_client():
     """
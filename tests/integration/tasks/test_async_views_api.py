@@ -0,0 +1,194 @@
+"""
+Integration tests for the async read views served under ASGI.
+"""
+import json
+
+import pytest
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.test import AsyncClient, override_settings
+from django.urls import include, path, resolve
+from rest_framework import status
+from rest_framework.routers import DefaultRouter
+from rest_framework_nested import routers
+from rest_framework_simplejwt.tokens import AccessToken
+from apps.core.metrics import registry as metrics
+from apps.tasks.models import Task, Comment
+from apps.tasks.views import TaskViewSet, CommentViewSet
+from apps.users.views import UserViewSet
+
+# The API routes as config.asgi builds them, mounted under /async/ next to
+# the regular (sync) routes.
+urlpatterns = [path('', include('config.urls'))]
+with override_settings(API_ASYNC_VIEWS=True):
+    router = DefaultRouter()
+    router.register(r'tasks', TaskViewSet, basename='async-task')
+    router.register(r'users', UserViewSet, basename='async-user')
+    tasks_router = routers.NestedDefaultRouter(router, r'tasks', lookup='task')
+    tasks_router.register(r'comments', CommentViewSet, basename='async-task-comments')
+    urlpatterns += [
+        path('async/api/', include(router.urls)),
+        path('async/api/', include(tasks_router.urls)),
+    ]
+
+
+@pytest.fixture
+def async_get(user):
+    """
+    GET through Django's ASGI handler with a JWT access token of ``user``.
+    """
+    client = AsyncClient()
+    authorization = f'Bearer {AccessToken.for_user(user)}'
+
+    def get(url, **headers):
+        if url.startswith('/api/'):
+            url = '/async' + url
+        headers.setdefault('authorization', authorization)
+        return async_to_sync(client.get)(url, headers=headers)
+    return get
+
+
+def unprefixed(response):
+    """
+    Return the JSON body of an /async/ response with links as in sync ones.
+    """
+    return json.loads(response.content.replace(b'/async/api/', b'/api/'))
+
+
+@pytest.fixture
+def tasks_with_comments(db, user, another_user):
+    """
+    Five tasks, the newest two with comments.
+    """
+    tasks = [Task.objects.create(creator=user, title=f'Task {index}') for index in range(5)]
+    for task in tasks[-2:]:
+        for index in range(2):
+            Comment.objects.create(task=task, author=another_user, text=f'Note {index}')
+    return tasks
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+@pytest.mark.urls(__name__)
+class TestAsyncViews:
+    """Test suite for the async task, comment and current user views."""
+
+    def test_read_views_are_coroutines(self):
+        """Test that read routes are async while the flag is on."""
+        assert iscoroutinefunction(resolve('/async/api/tasks/').func)
+        assert iscoroutinefunction(resolve('/async/api/users/me/').func)
+        assert not iscoroutinefunction(resolve('/api/tasks/').func)
+
+    @pytest.mark.parametrize('query', [
+        '',
+        '?limit=2&offset=1',
+        '?cursor=&limit=2',
+        '?count=none&limit=2',
+        '?include=comments&comments_limit=1&fields=uuid,title',
+        '?is_completed=false&ordering=title',
+    ])
+    def test_task_list_matches_sync(self, async_get, authenticated_client,
+                                    tasks_with_comments, query):
+        """Test that the async task list answers like the sync one."""
+        response = async_get('/api/tasks/' + query)
+        expected = authenticated_client.get('/api/tasks/' + query)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert unprefixed(response) == expected.json()
+        assert response.has_header('ETag')
+
+    def test_task_list_keyset_next_page(self, async_get, tasks_with_comments):
+        """Test that keyset cursors of the async list can be followed."""
+        first = async_get('/api/tasks/?cursor=&limit=3').json()
+        second = async_get(first['next']).json()
+
+        seen = [item['uuid'] for item in first['results'] + second['results']]
+        assert seen == [str(task.uuid) for task in reversed(tasks_with_comments)]
+        assert second['next'] is None
+
+    def test_task_list_not_modified(self, async_get, tasks_with_comments):
+        """Test that the async list answers 304 to a current ETag."""
+        etag = async_get('/api/tasks/?include=comments')['ETag']
+
+        response = async_get('/api/tasks/?include=comments', if_none_match=etag)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        Comment.objects.create(task=tasks_with_comments[-1],
+                               author=tasks_with_comments[0].creator, text='New')
+        response = async_get('/api/tasks/?include=comments', if_none_match=etag)
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_task_retrieve(self, async_get, authenticated_client, tasks_with_comments):
+        """Test that the async retrieve answers like the sync one."""
+        url = f'/api/tasks/{tasks_with_comments[-1].uuid}/?include=comments'
+        response = async_get(url)
+        expected = authenticated_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == expected.json()
+        assert response['ETag'] == expected['ETag']
+        assert response['Last-Modified'] == expected['Last-Modified']
+        assert async_get(url, if_none_match=response['ETag']).status_code == (
+            status.HTTP_304_NOT_MODIFIED
+        )
+        assert async_get('/api/tasks/not-a-uuid/').status_code == status.HTTP_404_NOT_FOUND
+
+    def test_comment_list_matches_sync(self, async_get, authenticated_client,
+                                       tasks_with_comments):
+        """Test that the async comment list answers like the sync one."""
+        url = f'/api/tasks/{tasks_with_comments[-1].uuid}/comments/?limit=1'
+        response = async_get(url)
+        expected = authenticated_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert unprefixed(response) == expected.json()
+        assert response.json()['count'] == 2
+
+    def test_current_user_uses_auth_cache(self, async_get, user):
+        """Test that /users/me/ authenticates asynchronously through UserCache."""
+        local_hits = metrics.value('auth_user_cache_hits_total', (('level', 'local'),))
+        misses = metrics.value('auth_user_cache_misses_total')
+        first = async_get('/api/users/me/')
+        second = async_get('/api/users/me/')
+
+        assert first.status_code == second.status_code == status.HTTP_200_OK
+        assert second.json()['uuid'] == str(user.uuid)
+        assert metrics.value('auth_user_cache_hits_total', (('level', 'local'),)) == local_hits + 1
+        assert metrics.value('auth_user_cache_misses_total') == misses + 1
+
+    def test_authentication_failures(self, async_get, user):
+        """Test that missing, invalid and inactive credentials are rejected."""
+        anonymous = async_to_sync(AsyncClient().get)('/async/api/users/me/')
+        invalid = async_get('/api/users/me/', authorization='Bearer invalid')
+        user.is_active = False
+        user.save()
+        inactive = async_get('/api/users/me/')
+
+        assert anonymous.status_code == status.HTTP_401_UNAUTHORIZED
+        assert invalid.status_code == status.HTTP_401_UNAUTHORIZED
+        assert inactive.status_code == status.HTTP_401_UNAUTHORIZED
+        assert 'Bearer' in anonymous['WWW-Authenticate']
+
+    def test_export_streams_asynchronously(self, async_get, authenticated_client,
+                                           tasks_with_comments, monkeypatch):
+        """Test that the async export streams the same lines as the sync one."""
+        monkeypatch.setattr(TaskViewSet, 'export_chunk_size', 2)
+
+        async def read(response):
+            return b''.join([chunk async for chunk in response.streaming_content])
+
+        response = async_get('/api/tasks/export/?format=csv')
+        expected = authenticated_client.get('/api/tasks/export/?format=csv')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.is_async
+        assert async_to_sync(read)(response) == b''.join(expected.streaming_content)
+
+    def test_writes_use_sync_handlers(self, user):
+        """Test that actions without an async variant still work."""
+        response = async_to_sync(AsyncClient().post)(
+            '/async/api/tasks/', {'title': 'Created over ASGI'}, content_type='application/json',
+            headers={'authorization': f'Bearer {AccessToken.for_user(user)}'},
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert Task.objects.filter(title='Created over ASGI', creator=user).exists()
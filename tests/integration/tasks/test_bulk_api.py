@@ -0,0 +1,122 @@
+"""
+Integration tests for the bulk task endpoint.
+"""
+import uuid
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from apps.tasks.models import Task
+from tests.conftest import assert_task_structure
+
+
+BULK_URL = reverse('task-bulk')
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestTaskBulk:
+    """Test suite for POST /api/tasks/bulk/."""
+
+    def test_create_update_delete(self, authenticated_client, user, another_user, task):
+        """Test that all three operations are applied in one request."""
+        to_delete = Task.objects.create(creator=user, title='Obsolete')
+        payload = {
+            'create': [
+                {'title': 'First'},
+                {'title': 'Second', 'assignee_uuid': str(another_user.uuid)},
+            ],
+            'update': [{'uuid': str(task.uuid), 'is_completed': True}],
+            'delete': [str(to_delete.uuid)],
+        }
+
+        response = authenticated_client.post(BULK_URL, payload, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [item['title'] for item in response.data['created']] == ['First', 'Second']
+        assert_task_structure(response.data['created'][0], user_obj=user)
+        assert_task_structure(
+            response.data['created'][1], user_obj=user, assignee_obj=another_user
+        )
+        assert_task_structure(response.data['updated'][0], user_obj=user)
+        assert response.data['deleted'] == [str(to_delete.uuid)]
+
+        task.refresh_from_db()
+        assert task.is_completed is True
+        assert task.completed_at is not None
+        assert not Task.objects.filter(pk=to_delete.pk).exists()
+        assert Task.objects.filter(title__in=['First', 'Second'], creator=user).count() == 2
+
+    def test_constant_query_count(self, authenticated_client, user, another_user):
+        """Test that the number of queries does not grow with batch size."""
+        def run(size):
+            tasks = [Task.objects.create(creator=user, title=f'T{i}') for i in range(size)]
+            payload = {
+                'create': [
+                    {'title': f'New {i}', 'assignee_uuid': str(another_user.uuid)}
+                    for i in range(size)
+                ],
+                'update': [{'uuid': str(t.uuid), 'title': 'Renamed'} for t in tasks],
+            }
+            with CaptureQueriesContext(connection) as context:
+                response = authenticated_client.post(BULK_URL, payload, format='json')
+            assert response.status_code == status.HTTP_200_OK
+            return len(context.captured_queries)
+
+        assert run(2) == run(20)
+
+    def test_invalid_item_rejects_whole_batch(self, authenticated_client, user, task):
+        """Test that one invalid item reports per-item errors and writes nothing."""
+        payload = {
+            'create': [{'title': 'Valid'}, {'title': 'Bad', 'assignee_uuid': str(uuid.uuid4())}],
+            'update': [{'uuid': str(task.uuid), 'title': 'Renamed'}],
+        }
+
+        response = authenticated_client.post(BULK_URL, payload, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data['create'][0] == {}
+        assert 'assignee_uuid' in response.data['create'][1]
+        assert 'update' not in response.data
+        assert not Task.objects.filter(title='Valid').exists()
+        task.refresh_from_db()
+        assert task.title != 'Renamed'
+
+    def test_missing_and_duplicate_targets(self, authenticated_client, task):
+        """Test errors for unknown uuids and tasks targeted twice."""
+        payload = {
+            'update': [{'uuid': str(task.uuid), 'title': 'A'}, {'uuid': str(uuid.uuid4())}],
+            'delete': [str(task.uuid)],
+        }
+
+        response = authenticated_client.post(BULK_URL, payload, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data['update'][0] == {}
+        assert 'uuid' in response.data['update'][1]
+        assert 'uuid' in response.data['delete'][0]
+        assert Task.objects.filter(pk=task.pk).exists()
+
+    def test_delete_requires_creator_or_assignee(self, api_client, another_user, task):
+        """Test that users cannot bulk delete tasks they neither created nor own."""
+        api_client.force_authenticate(user=another_user)
+
+        response = api_client.post(BULK_URL, {'delete': [str(task.uuid)]}, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'uuid' in response.data['delete'][0]
+        assert Task.objects.filter(pk=task.pk).exists()
+
+    def test_empty_request(self, authenticated_client):
+        """Test that a request without operations is rejected."""
+        response = authenticated_client.post(BULK_URL, {}, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_requires_authentication(self, api_client):
+        """Test that unauthenticated users cannot use the bulk endpoint."""
+        response = api_client.post(BULK_URL, {'create': [{'title': 'x'}]}, format='json')
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
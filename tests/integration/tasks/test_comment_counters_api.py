@@ -0,0 +1,118 @@
+"""
+Integration tests for the denormalized Task.comment_count and last_activity_at.
+"""
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from apps.tasks.models import Task, Comment
+from apps.tasks.services import CommentService
+
+
+def add_comment(client, task, text='Comment'):
+    """
+    Create a comment on ``task`` through the API.
+    """
+    url = reverse('task-comments-list', kwargs={'task_uuid': task.uuid})
+    response = client.post(url, {'text': text}, format='json')
+    assert response.status_code == status.HTTP_201_CREATED
+    return Comment.objects.get(uuid=response.data['uuid'])
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestCommentCounters:
+    """Test suite for task comment counters."""
+
+    def test_new_task_activity_is_creation(self, task):
+        """Test that a new task starts with no comments and activity at creation."""
+        assert task.comment_count == 0
+        assert task.last_activity_at == task.created_at
+
+    def test_bulk_created_activity_is_creation(self, authenticated_client):
+        """Test that tasks created through the bulk endpoint start with activity at creation."""
+        payload = {'create': [{'title': 'First'}, {'title': 'Second'}]}
+        response = authenticated_client.post(reverse('task-bulk'), payload, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        for task in Task.objects.all():
+            assert task.last_activity_at == task.created_at
+
+    def test_create_comment_updates_counters(self, authenticated_client, task):
+        """Test that creating comments bumps the count and last activity."""
+        add_comment(authenticated_client, task)
+        comment = add_comment(authenticated_client, task)
+
+        response = authenticated_client.get(reverse('task-detail', kwargs={'uuid': task.uuid}))
+
+        assert response.data['comment_count'] == 2
+        task.refresh_from_db()
+        assert task.last_activity_at == comment.created_at
+        assert task.updated_at >= comment.created_at
+
+    def test_delete_comment_updates_counters(self, authenticated_client, task):
+        """Test that deleting the newest comment restores the previous activity."""
+        first = add_comment(authenticated_client, task)
+        second = add_comment(authenticated_client, task)
+
+        CommentService.delete_comment(second)
+        task.refresh_from_db()
+        assert task.comment_count == 1
+        assert task.last_activity_at == first.created_at
+
+        CommentService.delete_comment(first)
+        task.refresh_from_db()
+        assert task.comment_count == 0
+        assert task.last_activity_at == task.created_at
+
+    def test_delete_comments_queryset(self, authenticated_client, user, task):
+        """Test that bulk comment deletion recomputes counters of every task."""
+        other = Task.objects.create(creator=user, title='Other')
+        add_comment(authenticated_client, task)
+        add_comment(authenticated_client, other)
+        kept = add_comment(authenticated_client, other)
+
+        CommentService.delete_comments(Comment.objects.exclude(pk=kept.pk))
+
+        task.refresh_from_db()
+        other.refresh_from_db()
+        assert (task.comment_count, other.comment_count) == (0, 1)
+        assert other.last_activity_at == kept.created_at
+
+    def test_order_and_filter_by_counters(self, authenticated_client, user, task):
+        """Test ordering and filtering the task list by comment counters."""
+        Task.objects.create(creator=user, title='Quiet')
+        busy = Task.objects.create(creator=user, title='Busy')
+        for _ in range(3):
+            add_comment(authenticated_client, busy)
+        add_comment(authenticated_client, task)
+
+        ordered = authenticated_client.get(reverse('task-list') + '?ordering=-comment_count')
+        assert [item['comment_count'] for item in ordered.data['results']] == [3, 1, 0]
+
+        filtered = authenticated_client.get(reverse('task-list') + '?comment_count__gte=1')
+        assert {item['uuid'] for item in filtered.data['results']} == {
+            str(busy.uuid), str(task.uuid)
+        }
+
+        active = authenticated_client.get(reverse('task-list') + '?cursor=&ordering=-last_activity_at')
+        assert active.data['results'][0]['uuid'] == str(task.uuid)
+
+    def test_recompute_command_repairs_drift(self, user, task):
+        """Test that the command fixes drifted counters and only those."""
+        comment = Comment.objects.create(task=task, author=user, text='Raw insert')
+        Task.objects.create(creator=user, title='Consistent')
+
+        out = StringIO()
+        call_command('recompute_task_counters', '--batch-size=1', stdout=out)
+
+        task.refresh_from_db()
+        assert task.comment_count == 1
+        assert task.last_activity_at == comment.created_at
+        assert 'Recomputed counters of 1 tasks' in out.getvalue()
+
+        out = StringIO()
+        call_command('recompute_task_counters', stdout=out)
+        assert 'Recomputed counters of 0 tasks' in out.getvalue()
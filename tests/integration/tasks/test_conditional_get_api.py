@@ -0,0 +1,121 @@
+"""
+Integration tests for conditional GET on Task and Comment endpoints.
+"""
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from apps.tasks.models import Comment, Task
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestConditionalGet:
+    """Test suite for ETag / Last-Modified handling."""
+
+    def test_retrieve_sets_validators(self, authenticated_client, task):
+        """Test that task detail responses carry a weak ETag and Last-Modified."""
+        response = authenticated_client.get(reverse('task-detail', kwargs={'uuid': task.uuid}))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response['ETag'].startswith('W/"')
+        assert 'Last-Modified' in response
+
+    def test_retrieve_not_modified(self, authenticated_client, task):
+        """Test that a matching If-None-Match returns 304 with no body."""
+        url = reverse('task-detail', kwargs={'uuid': task.uuid})
+        etag = authenticated_client.get(url)['ETag']
+
+        response = authenticated_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response['ETag'] == etag
+        assert not response.content
+
+    def test_retrieve_modified_after_update(self, authenticated_client, task):
+        """Test that updating a task changes its ETag."""
+        url = reverse('task-detail', kwargs={'uuid': task.uuid})
+        etag = authenticated_client.get(url)['ETag']
+        authenticated_client.patch(url, {'title': 'Changed'}, format='json')
+
+        response = authenticated_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['title'] == 'Changed'
+
+    def test_retrieve_if_modified_since(self, authenticated_client, task):
+        """Test that If-Modified-Since with the returned date yields 304."""
+        url = reverse('task-detail', kwargs={'uuid': task.uuid})
+        last_modified = authenticated_client.get(url)['Last-Modified']
+
+        response = authenticated_client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_list_not_modified_skips_serialization(self, authenticated_client, user, task,
+                                                   settings):
+        """Test that an unchanged task list answers 304 from the page and max(updated_at)."""
+        settings.TASK_LIST_CACHE_TIMEOUT = 0
+        url = reverse('task-list')
+        response = authenticated_client.get(url)
+        assert 'Last-Modified' not in response
+
+        with CaptureQueriesContext(connection) as context:
+            response = authenticated_client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert 'Last-Modified' not in response
+        assert len(context.captured_queries) == 2
+
+    def test_list_etag_changes_when_other_page_row_deleted(self, authenticated_client, user,
+                                                           settings):
+        """Test that deleting a row off the page changes the ETag via the exact count."""
+        settings.TASK_LIST_CACHE_TIMEOUT = 0
+        tasks = [Task.objects.create(creator=user, title=f'Task {index}') for index in range(3)]
+        url = reverse('task-list') + '?limit=1&ordering=title'
+        etag = authenticated_client.get(url)['ETag']
+
+        Task.objects.filter(pk=tasks[2].pk).delete()
+        response = authenticated_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['count'] == 2
+
+    def test_list_etag_changes_on_create_and_delete(self, authenticated_client, user, task,
+                                                    django_capture_on_commit_callbacks):
+        """Test that creating or deleting a task invalidates the list ETag."""
+        url = reverse('task-list')
+        first = authenticated_client.get(url)['ETag']
+
+        with django_capture_on_commit_callbacks(execute=True):
+            created = authenticated_client.post(url, {'title': 'New'}, format='json').data
+        second = authenticated_client.get(url)['ETag']
+        with django_capture_on_commit_callbacks(execute=True):
+            authenticated_client.delete(reverse('task-detail', kwargs={'uuid': created['uuid']}))
+        third = authenticated_client.get(url)['ETag']
+
+        assert len({first, second}) == 2
+        assert len({second, third}) == 2
+
+    def test_list_etag_depends_on_query(self, authenticated_client, task):
+        """Test that different filters get different ETags."""
+        url = reverse('task-list')
+
+        plain = authenticated_client.get(url)['ETag']
+        filtered = authenticated_client.get(url + '?is_completed=false')['ETag']
+
+        assert plain != filtered
+
+    def test_comment_list_not_modified(self, authenticated_client, user, task):
+        """Test conditional GET on the nested comments list."""
+        Comment.objects.create(task=task, author=user, text='Hello')
+        url = reverse('task-comments-list', kwargs={'task_uuid': task.uuid})
+        etag = authenticated_client.get(url)['ETag']
+
+        response = authenticated_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        authenticated_client.post(url, {'text': 'Another'}, format='json')
+        response = authenticated_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
@@ -0,0 +1,101 @@
+"""
+Integration tests for the streaming task export.
+"""
+import csv
+import io
+import json
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from apps.tasks.models import Task
+from apps.tasks.views import TaskViewSet
+
+URL = reverse('task-export')
+
+
+@pytest.fixture
+def export_tasks(db, user, another_user):
+    """
+    Five tasks, every other one assigned and completed.
+    """
+    return [
+        Task.objects.create(
+            creator=user,
+            assignee=another_user if index % 2 else None,
+            is_completed=bool(index % 2),
+            title=f'Task, "{index}"',
+            description='Line one\nline two',
+        )
+        for index in range(5)
+    ]
+
+
+def content(response):
+    return b''.join(response.streaming_content).decode('utf-8')
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestTaskExport:
+    """Test suite for GET /api/tasks/export/."""
+
+    def test_ndjson_matches_list(self, authenticated_client, export_tasks, monkeypatch):
+        """Test that NDJSON lines equal the list items, across chunks."""
+        monkeypatch.setattr(TaskViewSet, 'export_chunk_size', 2)
+
+        response = authenticated_client.get(URL + '?format=ndjson')
+        listed = authenticated_client.get(reverse('task-list') + '?limit=100').data['results']
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.streaming
+        assert response['Content-Type'] == 'application/x-ndjson; charset=utf-8'
+        assert response['Content-Disposition'] == 'attachment; filename="tasks.ndjson"'
+        lines = content(response).splitlines()
+        assert [json.loads(line) for line in lines] == json.loads(json.dumps(listed))
+
+    def test_csv(self, authenticated_client, export_tasks, another_user, monkeypatch):
+        """Test that CSV has a header, flattened users and quoted text."""
+        monkeypatch.setattr(TaskViewSet, 'export_chunk_size', 2)
+
+        response = authenticated_client.get(URL + '?format=csv')
+
+        assert response['Content-Type'] == 'text/csv; charset=utf-8'
+        rows = list(csv.DictReader(io.StringIO(content(response))))
+        assert len(rows) == 5
+        assert [row['uuid'] for row in rows] == [str(task.uuid) for task in reversed(export_tasks)]
+        assert rows[0]['title'] == 'Task, "4"'
+        assert rows[0]['description'] == 'Line one\nline two'
+        assert rows[0]['assignee.uuid'] == ''
+        assert rows[1]['assignee.username'] == another_user.username
+        assert rows[1]['is_completed'] == 'True'
+
+    def test_filters_ordering_and_fields(self, authenticated_client, export_tasks):
+        """Test that list filters, ordering and sparse fieldsets apply."""
+        response = authenticated_client.get(
+            URL + '?format=csv&is_completed=true&ordering=title&fields=uuid,title,assignee.uuid'
+        )
+
+        lines = content(response).splitlines()
+        assert lines[0] == 'uuid,title,assignee.uuid'
+        assert [line.split(',')[0] for line in lines[1:]] == [
+            str(export_tasks[1].uuid), str(export_tasks[3].uuid)
+        ]
+
+    def test_empty_export(self, authenticated_client):
+        """Test that an empty CSV export still has its header."""
+        response = authenticated_client.get(URL + '?format=csv&fields=uuid')
+
+        assert content(response) == 'uuid\r\n'
+        assert content(authenticated_client.get(URL)) == ''
+
+    def test_invalid_requests(self, authenticated_client, export_tasks):
+        """Test unknown formats, invalid filters and anonymous requests."""
+        assert authenticated_client.get(URL + '?format=xml').status_code == (
+            status.HTTP_404_NOT_FOUND
+        )
+        response = authenticated_client.get(URL + '?format=ndjson&comment_count__gte=x')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'comment_count__gte' in json.loads(response.content)
+        assert APIClient().get(URL).status_code == status.HTTP_401_UNAUTHORIZED
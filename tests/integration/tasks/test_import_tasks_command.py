@@ -0,0 +1,153 @@
+"""
+Integration tests for the import_tasks management command.
+"""
+import json
+import uuid
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from apps.tasks.models import Task, UserTaskStats
+from apps.tasks.services import CommentService
+
+
+def write_ndjson(path, records):
+    path.write_text(''.join(json.dumps(record) + '\n' for record in records))
+    return path
+
+
+def run(*args):
+    out, err = StringIO(), StringIO()
+    call_command('import_tasks', *map(str, args), stdout=out, stderr=err)
+    return out.getvalue(), err.getvalue()
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestImportTasksCommand:
+    """Test suite for manage.py import_tasks."""
+
+    def test_import_ndjson(self, tmp_path, user, another_user):
+        """Test that NDJSON records are inserted with resolved users."""
+        task_uuid = uuid.uuid4()
+        path = write_ndjson(tmp_path / 'tasks.ndjson', [
+            {'uuid': str(task_uuid), 'title': 'First', 'creator': {'uuid': str(user.uuid)},
+             'assignee': another_user.username, 'is_completed': True,
+             'completed_at': '2024-01-02T03:04:05Z', 'created_at': '2024-01-01T00:00:00Z'},
+            {'title': 'Second', 'description': 'Body', 'creator': 'testuser'},
+        ])
+
+        out, _ = run(path, '--batch-size=1')
+
+        first = Task.objects.get(uuid=task_uuid)
+        assert first.creator == user
+        assert first.assignee == another_user
+        assert first.is_completed
+        assert first.completed_at.isoformat() == '2024-01-02T03:04:05+00:00'
+        assert first.last_activity_at == first.created_at
+        second = Task.objects.get(title='Second')
+        assert second.description == 'Body'
+        assert second.assignee is None
+        assert not second.is_completed
+        assert '2 records: 2 inserted' in out
+        assert 'Imported 2 records: 2 inserted, 0 updated, 0 skipped' in out
+        stats = UserTaskStats.objects.get(user=another_user)
+        assert (stats.open_count, stats.completed_count) == (0, 1)
+        assert not (tmp_path / 'tasks.ndjson.checkpoint').exists()
+
+        run(path)
+        assert Task.objects.count() == 2
+
+    def test_export_round_trip(self, tmp_path, authenticated_client, user, another_user):
+        """Test that a CSV export imports back into the same tasks."""
+        tasks = [
+            Task.objects.create(creator=user, assignee=another_user if index else None,
+                                title=f'Task, "{index}"', description='a\nb')
+            for index in range(3)
+        ]
+        response = authenticated_client.get('/api/tasks/export/?format=csv')
+        path = tmp_path / 'tasks.csv'
+        path.write_bytes(b''.join(response.streaming_content))
+        Task.objects.all().delete()
+
+        run(path)
+
+        imported = {task.uuid: task for task in Task.objects.all()}
+        assert set(imported) == {task.uuid for task in tasks}
+        for task in tasks:
+            assert imported[task.uuid].title == task.title
+            assert imported[task.uuid].description == 'a\nb'
+            assert imported[task.uuid].assignee_id == task.assignee_id
+            assert imported[task.uuid].created_at == task.created_at
+
+    def test_upsert_existing(self, tmp_path, task, another_user):
+        """Test that existing uuids are updated and keep their counters."""
+        CommentService.create_comment({'text': 'Kept'}, another_user, task)
+        task.refresh_from_db()
+        path = write_ndjson(tmp_path / 'tasks.ndjson', [
+            {'uuid': str(task.uuid), 'title': 'Old', 'creator': str(another_user.uuid)},
+            {'uuid': str(task.uuid), 'title': 'Renamed', 'creator': str(another_user.uuid)},
+        ])
+
+        out, _ = run(path)
+
+        updated = Task.objects.get()
+        assert updated.title == 'Renamed'
+        assert updated.creator == another_user
+        assert updated.comment_count == 1
+        assert updated.last_activity_at == task.last_activity_at
+        assert updated.updated_at > task.updated_at
+        assert '0 inserted, 1 updated' in out
+
+    def test_invalid_records(self, tmp_path, user):
+        """Test that invalid records stop the import unless skipped."""
+        path = write_ndjson(tmp_path / 'tasks.ndjson', [
+            {'title': 'Valid', 'creator': 'testuser'},
+            {'title': 'Unknown creator', 'creator': 'nobody'},
+        ])
+        with path.open('a') as f:
+            f.write('{not json\n')
+
+        with pytest.raises(CommandError, match="Record 2: Unknown creator 'nobody'"):
+            run(path)
+        assert not Task.objects.exists()
+
+        _, err = run(path, '--skip-invalid', '--restart')
+        assert Task.objects.get().title == 'Valid'
+        assert 'Skipped record 2' in err
+        assert 'Skipped record 3: Invalid JSON' in err
+
+    def test_resume_from_checkpoint(self, tmp_path, user):
+        """Test that a failed import resumes after its last committed batch."""
+        path = write_ndjson(tmp_path / 'tasks.ndjson', [
+            {'title': f'Task {index}', 'creator': 'testuser' if index != 3 else 'nobody'}
+            for index in range(5)
+        ])
+        checkpoint = tmp_path / 'tasks.ndjson.checkpoint'
+
+        with pytest.raises(CommandError):
+            run(path, '--batch-size=2')
+        assert json.loads(checkpoint.read_text())['records'] == 2
+        assert Task.objects.count() == 2
+
+        path.write_text(path.read_text().replace('"nobody"', '"testuser"'))
+        out, _ = run(path, '--batch-size=2')
+
+        assert 'Resuming after record 2' in out
+        assert 'Imported 5 records: 5 inserted' in out
+        assert sorted(Task.objects.values_list('title', flat=True)) == [
+            f'Task {index}' for index in range(5)
+        ]
+        assert not checkpoint.exists()
+
+    def test_invalid_arguments(self, tmp_path):
+        """Test the batch size, format and checkpoint checks."""
+        with pytest.raises(CommandError, match='--batch-size'):
+            run(tmp_path / 'tasks.csv', '--batch-size=0')
+        with pytest.raises(CommandError, match='--format'):
+            run(tmp_path / 'tasks.txt')
+        path = write_ndjson(tmp_path / 'tasks.ndjson', [])
+        (tmp_path / 'tasks.ndjson.checkpoint').write_text('{}')
+        with pytest.raises(CommandError, match='--restart'):
+            run(path)
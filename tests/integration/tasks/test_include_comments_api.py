@@ -0,0 +1,121 @@
+"""
+Integration tests for embedding recent comments (?include=comments).
+"""
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from apps.tasks.models import Task, Comment
+
+
+def create_comments(task, author, count):
+    """
+    Create ``count`` comments on ``task``, oldest first.
+    """
+    now = timezone.now()
+    comments = []
+    for index in range(count):
+        comment = Comment.objects.create(task=task, author=author, text=f'Comment {index}')
+        Comment.objects.filter(pk=comment.pk).update(
+            created_at=now - timedelta(minutes=count - index)
+        )
+        comments.append(comment)
+    return comments
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestIncludeComments:
+    """Test suite for embedded comments on task endpoints."""
+
+    def test_list_embeds_newest_comments(self, authenticated_client, user, task):
+        """Test that each task carries its newest comments, newest first."""
+        other = Task.objects.create(creator=user, title='Quiet task')
+        comments = create_comments(task, user, 5)
+
+        url = reverse('task-list') + '?include=comments&comments_limit=2'
+        response = authenticated_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        results = {item['uuid']: item for item in response.data['results']}
+        embedded = results[str(task.uuid)]['comments']
+        assert [item['uuid'] for item in embedded] == [
+            str(comments[4].uuid), str(comments[3].uuid)
+        ]
+        assert embedded[0]['author']['uuid'] == str(user.uuid)
+        assert results[str(other.uuid)]['comments'] == []
+
+    def test_single_query_for_all_tasks(self, authenticated_client, user, settings):
+        """Test that comments of every task on the page cost one query."""
+        settings.TASK_LIST_CACHE_TIMEOUT = 0
+        for index in range(5):
+            task = Task.objects.create(creator=user, title=f'Task {index}')
+            create_comments(task, user, 4)
+        url = reverse('task-list')
+
+        with CaptureQueriesContext(connection) as plain:
+            authenticated_client.get(url)
+        with CaptureQueriesContext(connection) as included:
+            authenticated_client.get(url + '?include=comments')
+
+        # One windowed comment query plus one comment fingerprint query.
+        assert len(included.captured_queries) == len(plain.captured_queries) + 2
+        assert 'ROW_NUMBER()' in included.captured_queries[-1]['sql']
+
+    def test_retrieve_embeds_comments(self, authenticated_client, user, task):
+        """Test that retrieve embeds comments with the default limit."""
+        create_comments(task, user, 5)
+
+        url = reverse('task-detail', kwargs={'uuid': task.uuid}) + '?include=comments'
+        response = authenticated_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data['comments']) == 3
+
+    def test_new_comment_changes_etag(self, authenticated_client, user, task):
+        """Test that a new comment invalidates validators of included responses."""
+        url = reverse('task-detail', kwargs={'uuid': task.uuid}) + '?include=comments'
+        etag = authenticated_client.get(url)['ETag']
+
+        Comment.objects.create(task=task, author=user, text='Late comment')
+        response = authenticated_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['comments'][0]['text'] == 'Late comment'
+
+    def test_list_etag_covers_page_comments_only(self, authenticated_client, user, settings):
+        """Test that the list ETag follows comments of page tasks and ignores others."""
+        settings.TASK_LIST_CACHE_TIMEOUT = 0
+        first = Task.objects.create(creator=user, title='A')
+        second = Task.objects.create(creator=user, title='B')
+        url = reverse('task-list') + '?include=comments&ordering=title&limit=1'
+        etag = authenticated_client.get(url)['ETag']
+
+        with CaptureQueriesContext(connection) as context:
+            authenticated_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        fingerprint = [q['sql'] for q in context.captured_queries if 'comments' in q['sql']]
+        assert f'IN ({first.pk})' in fingerprint[0]
+
+        Comment.objects.create(task=second, author=user, text='Off page')
+        response = authenticated_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        Comment.objects.create(task=first, author=user, text='On page')
+        response = authenticated_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+
+    @pytest.mark.parametrize('query', [
+        'include=tags',
+        'include=comments&comments_limit=0',
+        'include=comments&comments_limit=21',
+        'include=comments&comments_limit=abc',
+    ])
+    def test_invalid_parameters(self, authenticated_client, task, query):
+        """Test that unknown includes and out-of-range limits return 400."""
+        response = authenticated_client.get(reverse('task-list') + '?' + query)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
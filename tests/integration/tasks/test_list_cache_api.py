@@ -0,0 +1,104 @@
+"""
+Integration tests for the task list response cache.
+"""
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from apps.core.metrics import registry as metrics
+from apps.tasks.cache import TaskListCache
+from apps.tasks.models import Task
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestTaskListCache:
+    """Test suite for TaskListCache in front of TaskViewSet.list."""
+
+    @pytest.fixture(autouse=True)
+    def enable_cache(self, settings):
+        settings.TASK_LIST_CACHE_TIMEOUT = 300
+
+    def test_repeated_list_served_from_cache(self, authenticated_client, task):
+        """Test that a repeated request is a cache hit without queries."""
+        url = reverse('task-list')
+        hits = metrics.value('task_list_cache_hits_total')
+        misses = metrics.value('task_list_cache_misses_total')
+        first = authenticated_client.get(url)
+
+        with CaptureQueriesContext(connection) as context:
+            second = authenticated_client.get(url)
+
+        assert first['X-Cache'] == 'MISS'
+        assert second['X-Cache'] == 'HIT'
+        assert second.status_code == status.HTTP_200_OK
+        assert second.data == first.data
+        assert second['ETag'] == first['ETag']
+        assert len(context.captured_queries) == 0
+        assert metrics.value('task_list_cache_hits_total') == hits + 1
+        assert metrics.value('task_list_cache_misses_total') == misses + 1
+
+    def test_cached_not_modified(self, authenticated_client, task):
+        """Test that a cached page answers If-None-Match with 304."""
+        url = reverse('task-list')
+        etag = authenticated_client.get(url)['ETag']
+
+        response = authenticated_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response['X-Cache'] == 'HIT'
+
+    def test_keyed_by_params_and_user(self, api_client, user, another_user, task):
+        """Test that filters, ordering and user select different entries."""
+        url = reverse('task-list')
+        api_client.force_authenticate(user=user)
+        api_client.get(url)
+
+        assert api_client.get(url + '?ordering=title')['X-Cache'] == 'MISS'
+        assert api_client.get(url + '?is_completed=true')['X-Cache'] == 'MISS'
+        api_client.force_authenticate(user=another_user)
+        assert api_client.get(url)['X-Cache'] == 'MISS'
+
+    @pytest.mark.parametrize('write', ['create', 'update', 'delete', 'comment'])
+    def test_service_writes_invalidate(self, authenticated_client, user, write,
+                                       django_capture_on_commit_callbacks):
+        """Test that every service write bumps the cache generation on commit."""
+        task = Task.objects.create(creator=user, title='Original')
+        url = reverse('task-list')
+        detail_url = reverse('task-detail', kwargs={'uuid': task.uuid})
+        authenticated_client.get(url)
+
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            if write == 'create':
+                authenticated_client.post(url, {'title': 'New'}, format='json')
+            elif write == 'update':
+                authenticated_client.patch(detail_url, {'title': 'Changed'}, format='json')
+            elif write == 'delete':
+                authenticated_client.delete(detail_url)
+            else:
+                comments_url = reverse('task-comments-list', kwargs={'task_uuid': task.uuid})
+                authenticated_client.post(comments_url, {'text': 'Hi'}, format='json')
+
+        assert callbacks
+
+        response = authenticated_client.get(url)
+        assert response['X-Cache'] == 'MISS'
+
+    def test_generation_survives_eviction(self):
+        """Test that a lost generation counter never reuses an old value."""
+        old_generation = TaskListCache.get_generation()
+        TaskListCache.get_cache().delete(TaskListCache.generation_key)
+
+        TaskListCache.invalidate()
+
+        assert TaskListCache.get_generation() > old_generation
+
+    def test_disabled_cache(self, authenticated_client, task, settings):
+        """Test that a zero timeout disables the cache."""
+        settings.TASK_LIST_CACHE_TIMEOUT = 0
+
+        response = authenticated_client.get(reverse('task-list'))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert 'X-Cache' not in response
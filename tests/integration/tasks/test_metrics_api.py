@@ -0,0 +1,93 @@
+"""
+Integration tests for the Prometheus metrics endpoint.
+"""
+import json
+import os
+import re
+
+import pytest
+from django.test import override_settings
+from rest_framework import status
+from apps.core.metrics import registry
+
+URL = '/metrics'
+LIST_COUNT = ('http_request_duration_seconds_count'
+              '{view="TaskViewSet.list",method="GET",status="200"}')
+
+
+def scrape(client):
+    """
+    Return ``{sample: value}`` of a /metrics response.
+    """
+    response = client.get(URL)
+    assert response.status_code == status.HTTP_200_OK
+    assert response['Content-Type'].startswith('text/plain; version=0.0.4')
+    samples = {}
+    for line in response.content.decode().splitlines():
+        if not line.startswith('#'):
+            sample, value = line.rsplit(' ', 1)
+            samples[sample] = float(value)
+    return samples
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestMetrics:
+    """Test suite for GET /metrics."""
+
+    def test_request_histogram_by_view(self, authenticated_client, task):
+        """Test that requests are counted per view, method and status."""
+        before = scrape(authenticated_client)
+
+        authenticated_client.get('/api/tasks/')
+        authenticated_client.get(f'/api/tasks/{task.uuid}/comments/')
+        after = scrape(authenticated_client)
+
+        assert after[LIST_COUNT] == before.get(LIST_COUNT, 0) + 1
+        assert ('http_request_duration_seconds_count'
+                '{view="CommentViewSet.list",method="GET",status="200"}') in after
+        assert after[LIST_COUNT.replace('_count{', '_bucket{').replace('}', ',le="+Inf"}')] \
+            == after[LIST_COUNT]
+        assert after['db_queries_total{view="TaskViewSet.list"}'] > \
+            before.get('db_queries_total{view="TaskViewSet.list"}', 0)
+
+    def test_creation_counters(self, authenticated_client, task,
+                               django_capture_on_commit_callbacks):
+        """Test that created tasks and comments are counted after commit."""
+        before = scrape(authenticated_client)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            authenticated_client.post('/api/tasks/', {'title': 'Counted'}, format='json')
+            authenticated_client.post('/api/tasks/bulk/', {
+                'create': [{'title': 'One'}, {'title': 'Two'}],
+            }, format='json')
+            authenticated_client.post(f'/api/tasks/{task.uuid}/comments/',
+                                      {'text': 'Counted'}, format='json')
+        after = scrape(authenticated_client)
+
+        assert after['tasks_created_total'] == before.get('tasks_created_total', 0) + 3
+        assert after['comments_created_total'] == before.get('comments_created_total', 0) + 1
+
+    def test_aggregates_worker_files(self, api_client, tmp_path):
+        """Test that metrics written by other worker processes are added up."""
+        api_client.get('/api/tasks/')
+        other = registry.snapshot()
+        (tmp_path / '999999999.json').write_text(json.dumps(other))
+        own = scrape(api_client)
+
+        with override_settings(METRICS_DIR=str(tmp_path)):
+            registry.flush()
+            combined = scrape(api_client)
+
+        assert (tmp_path / f'{os.getpid()}.json').exists()
+        unauthorized = ('http_request_duration_seconds_count'
+                        '{view="TaskViewSet.list",method="GET",status="401"}')
+        assert combined[unauthorized] == own[unauthorized] * 2
+
+    def test_token(self, api_client):
+        """Test that METRICS_TOKEN restricts scraping to its Bearer token."""
+        with override_settings(METRICS_TOKEN='secret'):
+            assert api_client.get(URL).status_code == status.HTTP_401_UNAUTHORIZED
+            api_client.credentials(HTTP_AUTHORIZATION='Bearer secret')
+            assert re.search(r'^# TYPE http_request_duration_seconds histogram$',
+                             api_client.get(URL).content.decode(), re.M)
@@ -0,0 +1,129 @@
+"""
+Integration tests for keyset pagination on Task and Comment endpoints.
+"""
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from apps.tasks.models import Task, Comment
+from tests.conftest import assert_task_structure
+
+
+def create_tasks(user, count):
+    """
+    Create ``count`` tasks with distinct, increasing created_at values.
+    """
+    now = timezone.now()
+    tasks = []
+    for index in range(count):
+        task = Task.objects.create(creator=user, title=f'Task {index:02d}')
+        Task.objects.filter(pk=task.pk).update(
+            created_at=now - timedelta(minutes=count - index)
+        )
+        tasks.append(task)
+    return tasks
+
+
+def collect_pages(client, url, link='next'):
+    """
+    Follow ``link`` from ``url`` and return the uuids of every page.
+    """
+    pages = []
+    while url:
+        response = client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        pages.append([item['uuid'] for item in response.data['results']])
+        url = response.data[link]
+    return pages
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestKeysetPagination:
+    """Test suite for keyset pagination mode."""
+
+    def test_first_page_has_no_count(self, authenticated_client, user):
+        """Test that keyset mode returns next/previous links without a count."""
+        create_tasks(user, 3)
+
+        url = reverse('task-list') + '?cursor=&limit=2'
+        response = authenticated_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert set(response.data.keys()) == {'next', 'previous', 'results'}
+        assert response.data['previous'] is None
+        assert response.data['next'] is not None
+        assert len(response.data['results']) == 2
+        for task in response.data['results']:
+            assert_task_structure(task)
+
+    def test_walk_forward_and_backward(self, authenticated_client, user):
+        """Test that following links visits every task once in order."""
+        tasks = create_tasks(user, 7)
+        expected = [str(task.uuid) for task in reversed(tasks)]
+
+        pages = collect_pages(authenticated_client, reverse('task-list') + '?cursor=&limit=3')
+        assert [len(page) for page in pages] == [3, 3, 1]
+        assert sum(pages, []) == expected
+
+        last_page = authenticated_client.get(
+            reverse('task-list') + '?cursor=&limit=3'
+        ).data
+        while last_page['next']:
+            last_page = authenticated_client.get(last_page['next']).data
+        backward = collect_pages(authenticated_client, last_page['previous'], link='previous')
+        assert sum(reversed(backward), []) == expected[:6]
+
+    def test_ordering_field_with_tiebreaker(self, authenticated_client, user):
+        """Test keyset pagination over a non-unique ordering field."""
+        tasks = create_tasks(user, 5)
+        Task.objects.filter(pk__in=[task.pk for task in tasks]).update(title='Same')
+
+        pages = collect_pages(
+            authenticated_client, reverse('task-list') + '?cursor=&limit=2&ordering=title'
+        )
+
+        uuids = sum(pages, [])
+        assert len(uuids) == 5
+        assert uuids == [str(task.uuid) for task in sorted(tasks, key=lambda t: t.pk)]
+
+    def test_stable_under_concurrent_inserts(self, authenticated_client, user):
+        """Test that tasks created between requests do not shift later pages."""
+        tasks = create_tasks(user, 4)
+
+        first = authenticated_client.get(reverse('task-list') + '?cursor=&limit=2').data
+        Task.objects.create(creator=user, title='Newest task')
+        second = authenticated_client.get(first['next']).data
+
+        assert [item['uuid'] for item in second['results']] == [
+            str(tasks[1].uuid), str(tasks[0].uuid)
+        ]
+
+    def test_cursor_from_other_ordering_rejected(self, authenticated_client, user):
+        """Test that a cursor cannot be replayed with a different ordering."""
+        create_tasks(user, 3)
+
+        first = authenticated_client.get(reverse('task-list') + '?cursor=&limit=1').data
+        response = authenticated_client.get(first['next'] + '&ordering=title')
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_invalid_cursor(self, authenticated_client):
+        """Test that a malformed cursor returns 404."""
+        response = authenticated_client.get(reverse('task-list') + '?cursor=not-a-cursor')
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_comments_keyset(self, authenticated_client, user, task):
+        """Test keyset pagination on the nested comments endpoint."""
+        comments = [
+            Comment.objects.create(task=task, author=user, text=f'Comment {index}')
+            for index in range(5)
+        ]
+
+        url = reverse('task-comments-list', kwargs={'task_uuid': task.uuid})
+        pages = collect_pages(authenticated_client, url + '?cursor=&limit=2')
+
+        assert sum(pages, []) == [str(comment.uuid) for comment in reversed(comments)]
@@ -0,0 +1,114 @@
+"""
+Integration tests for pagination count strategies on list endpoints.
+"""
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from apps.tasks.models import Task
+from tests.conftest import assert_pagination_structure
+
+
+def count_queries(queries):
+    """
+    Return the number of COUNT queries in captured queries.
+    """
+    return sum('COUNT(' in query['sql'].upper() for query in queries)
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestPaginationCount:
+    """Test suite for count strategies of limit/offset pagination."""
+
+    @pytest.fixture
+    def tasks(self, user):
+        return [
+            Task.objects.create(creator=user, title=f'Task {index}')
+            for index in range(5)
+        ]
+
+    def test_last_page_count_without_count_query(self, authenticated_client, tasks):
+        """Test that a single-page result is counted from the page itself."""
+        with CaptureQueriesContext(connection) as context:
+            response = authenticated_client.get(reverse('task-list') + '?limit=10')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert_pagination_structure(response.data)
+        assert response.data['count'] == 5
+        assert response.data['count_type'] == 'exact'
+        assert response.data['next'] is None
+        assert count_queries(context.captured_queries) == 0
+
+    def test_exact_count_under_threshold(self, authenticated_client, tasks):
+        """Test that auto strategy counts exactly below the threshold."""
+        response = authenticated_client.get(reverse('task-list') + '?limit=2')
+
+        assert response.data['count'] == 5
+        assert response.data['count_type'] == 'exact'
+        assert response.data['next'] is not None
+
+    def test_estimated_count_over_threshold(self, authenticated_client, tasks, settings):
+        """Test that auto strategy estimates above the threshold."""
+        settings.PAGINATION_EXACT_COUNT_THRESHOLD = 3
+
+        response = authenticated_client.get(reverse('task-list') + '?limit=2&is_completed=false')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['count_type'] == 'estimated'
+        assert response.data['count'] >= 4
+        assert len(response.data['results']) == 2
+
+    def test_estimate_strategy_uses_table_statistics(self, authenticated_client, tasks, settings):
+        """Test that an unfiltered estimate comes from pg_class after ANALYZE."""
+        settings.PAGINATION_COUNT_STRATEGY = 'estimate'
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE tasks')
+
+        response = authenticated_client.get(reverse('task-list') + '?limit=2')
+
+        assert response.data['count_type'] == 'estimated'
+        assert response.data['count'] == 5
+
+    def test_client_can_skip_count(self, authenticated_client, tasks):
+        """Test that ?count=none leaves the count out."""
+        with CaptureQueriesContext(connection) as context:
+            response = authenticated_client.get(reverse('task-list') + '?limit=2&count=none')
+
+        assert response.data['count'] is None
+        assert response.data['count_type'] == 'none'
+        assert response.data['next'] is not None
+        assert count_queries(context.captured_queries) == 0
+
+    def test_conditional_get_respects_count_strategy(self, authenticated_client, tasks,
+                                                     settings):
+        """Test that validating a task list page never adds a COUNT query."""
+        settings.PAGINATION_COUNT_STRATEGY = 'none'
+        url = reverse('task-list') + '?limit=2'
+        etag = authenticated_client.get(url)['ETag']
+
+        with CaptureQueriesContext(connection) as context:
+            response = authenticated_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert count_queries(context.captured_queries) == 0
+
+    def test_client_cannot_force_exact(self, authenticated_client, tasks, settings):
+        """Test that ?count=exact does not override the configured strategy."""
+        settings.PAGINATION_COUNT_STRATEGY = 'none'
+
+        response = authenticated_client.get(reverse('task-list') + '?limit=2&count=exact')
+
+        assert response.data['count_type'] == 'none'
+
+    def test_users_list_count_strategy(self, authenticated_client, user, another_user, settings):
+        """Test that the users list uses the same count strategy."""
+        settings.PAGINATION_COUNT_STRATEGY = 'none'
+
+        response = authenticated_client.get(reverse('user-list') + '?limit=1')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert_pagination_structure(response.data)
+        assert response.data['count'] is None
+        assert response.data['next'] is not None
@@ -0,0 +1,134 @@
+"""
+Integration tests for read replica routing.
+
+The replicas are ``TEST['MIRROR']`` aliases of the test database, i.e.
+second connections to it, so tests commit their data for them to see.
+"""
+import logging
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.db import connections, transaction
+from django.test import AsyncClient
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from apps.core.replicas import ReplicaHealth, ReplicaRouter, _replica
+from apps.tasks.models import Task
+
+URL = '/api/tasks/'
+
+
+def add_mirror(alias, **overrides):
+    default = connections.settings['default']
+    connections.settings.setdefault(alias, {
+        **default, **overrides, 'TEST': {**default['TEST'], 'MIRROR': 'default'},
+    })
+
+
+# Registered at import, before the test databases are set up, so Django
+# points them at the test database like configured replicas.
+add_mirror('replica')
+add_mirror('replica_down', HOST='127.0.0.1', PORT='1')
+
+
+@pytest.fixture
+def replica(settings):
+    """
+    Fixture routing reads to the ``replica`` mirror.
+    """
+    settings.DATABASE_REPLICAS = ['replica']
+    ReplicaHealth.reset()
+    yield connections['replica']
+    ReplicaHealth.reset()
+
+
+def task_queries(connection, func):
+    """
+    Return the SQL run on ``connection`` by ``func()`` that reads tasks.
+    """
+    with CaptureQueriesContext(connection) as queries:
+        response = func()
+    assert response.status_code < 400, response.content
+    return [query['sql'] for query in queries if 'FROM "tasks"' in query['sql']]
+
+
+@pytest.mark.integration
+@pytest.mark.django_db(transaction=True, databases=['default', 'replica', 'replica_down'])
+class TestReplicaRouting:
+    """Test suite for ReplicaRouter, ReplicaHealth and primary pinning."""
+
+    def test_reads_use_replica(self, authenticated_client, user, replica):
+        """Test that task list reads run on the replica only."""
+        Task.objects.create(title='Replicated', creator=user)
+        primary = connections['default']
+
+        with CaptureQueriesContext(primary) as primary_queries:
+            replica_queries = task_queries(replica, lambda: authenticated_client.get(URL))
+
+        assert replica_queries
+        assert not [query for query in primary_queries if 'FROM "tasks"' in query['sql']]
+
+    def test_writer_is_pinned_to_primary(self, authenticated_client, another_user, replica):
+        """Test that a user who wrote reads from the primary; others do not."""
+        response = authenticated_client.post(URL, {'title': 'Mine'}, format='json')
+        assert response.status_code == status.HTTP_201_CREATED
+
+        assert task_queries(replica, lambda: authenticated_client.get(URL)) == []
+        other = APIClient()
+        other.force_authenticate(another_user)
+        assert task_queries(replica, lambda: other.get(URL))
+
+    def test_lagging_replica_falls_back(self, authenticated_client, settings, replica, caplog):
+        """Test that a replica lagging beyond the limit is not used."""
+        settings.REPLICA_MAX_LAG_SECONDS = -1
+
+        with caplog.at_level(logging.WARNING, logger='apps.core.replicas'):
+            assert task_queries(replica, lambda: authenticated_client.get(URL)) == []
+
+        assert any('behind' in record.getMessage() for record in caplog.records
+                   if record.name == 'apps.core.replicas')
+
+    def test_unreachable_replica_falls_back(self, authenticated_client, settings, caplog):
+        """Test that requests are served by the primary while no replica answers."""
+        settings.DATABASE_REPLICAS = ['replica_down']
+        ReplicaHealth.reset()
+        try:
+            with caplog.at_level(logging.WARNING, logger='apps.core.replicas'):
+                response = authenticated_client.get(URL)
+        finally:
+            ReplicaHealth.reset()
+
+        assert response.status_code == status.HTTP_200_OK
+        assert any('unavailable' in record.getMessage() for record in caplog.records
+                   if record.name == 'apps.core.replicas')
+
+    @pytest.mark.urls('tests.integration.tasks.test_async_views_api')
+    def test_async_views_use_replica(self, user, replica):
+        """Test that async views read from the replica and pin writers to the primary."""
+        Task.objects.create(title='Replicated', creator=user)
+        client = AsyncClient()
+        headers = {'authorization': f'Bearer {AccessToken.for_user(user)}'}
+
+        def get():
+            return async_to_sync(client.get)('/async/api/tasks/', headers=headers)
+
+        assert task_queries(replica, get)
+        response = async_to_sync(client.post)('/async/api/tasks/', {'title': 'Mine'},
+                                              content_type='application/json', headers=headers)
+        assert response.status_code == status.HTTP_201_CREATED
+        assert task_queries(replica, get) == []
+
+    def test_router_keeps_writes_and_transactions_on_primary(self, replica):
+        """Test that writes and reads inside transactions use the primary."""
+        router = ReplicaRouter()
+        token = _replica.set('replica')
+        try:
+            assert router.db_for_read(Task) == 'replica'
+            assert router.db_for_write(Task) == 'default'
+            with transaction.atomic():
+                assert router.db_for_read(Task) == 'default'
+            assert router.allow_migrate('replica', 'tasks') is False
+        finally:
+            _replica.reset(token)
@@ -0,0 +1,69 @@
+"""
+Integration tests for the fast read-path row serializers.
+"""
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from apps.tasks.models import Task, Comment
+from apps.tasks.serializers import (
+    TaskSerializer,
+    CommentSerializer,
+    TaskRowSerializer,
+    CommentRowSerializer,
+)
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestRowSerializers:
+    """Test suite for TaskRowSerializer and CommentRowSerializer."""
+
+    def test_task_rows_match_task_serializer(self, user, another_user):
+        """Test that row output equals TaskSerializer output."""
+        Task.objects.create(creator=user, title='Unassigned', description='')
+        Task.objects.create(
+            creator=user, assignee=another_user, title='Assigned',
+            description='Text', is_completed=True,
+        )
+        Task.objects.create(creator=another_user, assignee=user, title='Other')
+        queryset = Task.objects.select_related('creator', 'assignee').order_by('id')
+
+        expected = TaskSerializer(queryset, many=True).data
+        actual = TaskRowSerializer(TaskRowSerializer.get_queryset(queryset)).data
+
+        assert actual == expected
+
+    def test_comment_rows_match_comment_serializer(self, user, another_user, task):
+        """Test that row output equals CommentSerializer output."""
+        Comment.objects.create(task=task, author=user, text='First')
+        Comment.objects.create(task=task, author=another_user, text='Second')
+        queryset = Comment.objects.select_related('author', 'task').order_by('id')
+
+        expected = CommentSerializer(queryset, many=True).data
+        actual = CommentRowSerializer(CommentRowSerializer.get_queryset(queryset)).data
+
+        assert actual == expected
+
+    def test_repeated_users_formatted_once(self, user):
+        """Test that a user repeated on a page is formatted once."""
+        for index in range(3):
+            Task.objects.create(creator=user, title=f'Task {index}')
+
+        data = TaskRowSerializer(
+            TaskRowSerializer.get_queryset(Task.objects.all())
+        ).data
+
+        assert data[0]['creator'] is data[1]['creator'] is data[2]['creator']
+
+    def test_task_list_single_query(self, authenticated_client, user, another_user):
+        """Test that a task list page is fetched with one query."""
+        for index in range(3):
+            Task.objects.create(creator=user, assignee=another_user, title=f'Task {index}')
+
+        with CaptureQueriesContext(connection) as context:
+            response = authenticated_client.get(reverse('task-list'))
+
+        # One conditional GET fingerprint query plus the page itself
+        assert response.data['count'] == 3
+        assert len(context.captured_queries) == 2
@@ -0,0 +1,132 @@
+"""
+Integration tests for full-text task search (?q=).
+"""
+import pytest
+from django.db import connection
+from django.urls import reverse
+from rest_framework import status
+from apps.tasks.models import Task, Comment
+from apps.tasks.search import build_search_query, comment_search_vector
+
+
+@pytest.fixture
+def search_tasks(db, user):
+    """
+    Tasks with distinct searchable text.
+    """
+    return {
+        'title': Task.objects.create(
+            creator=user, title='Deploy database migrations',
+            description='Run them on staging first',
+        ),
+        'description': Task.objects.create(
+            creator=user, title='Release checklist',
+            description='Remember the database backups before release',
+        ),
+        'other': Task.objects.create(
+            creator=user, title='Write onboarding guide',
+            description='Explain the project layout',
+        ),
+    }
+
+
+def uuids(response):
+    return [item['uuid'] for item in response.data['results']]
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestTaskSearch:
+    """Test suite for full-text search on the task list."""
+
+    def test_ranked_matches(self, authenticated_client, search_tasks):
+        """Test that matches are ranked with title hits first."""
+        response = authenticated_client.get(reverse('task-list') + '?q=databases')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert uuids(response) == [
+            str(search_tasks['title'].uuid), str(search_tasks['description'].uuid)
+        ]
+        assert 'search_snippet' not in response.data['results'][0]
+
+    def test_vector_follows_updates(self, authenticated_client, search_tasks):
+        """Test that the generated vector reflects edited text."""
+        task = search_tasks['other']
+        url = reverse('task-detail', kwargs={'uuid': task.uuid})
+        authenticated_client.patch(url, {'title': 'Tune database indexes'}, format='json')
+
+        response = authenticated_client.get(reverse('task-list') + '?q=index')
+
+        assert uuids(response) == [str(task.uuid)]
+
+    def test_websearch_syntax(self, authenticated_client, search_tasks):
+        """Test phrase and negation queries."""
+        response = authenticated_client.get(
+            reverse('task-list') + '?q=database -release'
+        )
+        assert uuids(response) == [str(search_tasks['title'].uuid)]
+
+        response = authenticated_client.get(reverse('task-list') + '?q="project layout"')
+        assert uuids(response) == [str(search_tasks['other'].uuid)]
+
+    def test_combines_with_filters_and_keyset(self, authenticated_client, user, search_tasks):
+        """Test that search composes with TaskFilter and keyset pagination."""
+        Task.objects.filter(pk=search_tasks['description'].pk).update(is_completed=True)
+        for index in range(3):
+            Task.objects.create(creator=user, title=f'Database task {index}')
+
+        response = authenticated_client.get(
+            reverse('task-list') + '?q=database&is_completed=false&cursor=&limit=2'
+        )
+        seen = uuids(response)
+        for _ in range(5):
+            if not response.data['next']:
+                break
+            response = authenticated_client.get(response.data['next'])
+            seen += uuids(response)
+
+        assert len(seen) == len(set(seen)) == 4
+        assert str(search_tasks['description'].uuid) not in seen
+
+    def test_highlight(self, authenticated_client, search_tasks):
+        """Test that highlight adds a snippet with marked matches."""
+        response = authenticated_client.get(
+            reverse('task-list') + '?q=backups&highlight=true&fields=uuid'
+        )
+
+        assert response.data['results'] == [{
+            'uuid': str(search_tasks['description'].uuid),
+            'search_snippet': response.data['results'][0]['search_snippet'],
+        }]
+        assert '<mark>backups</mark>' in response.data['results'][0]['search_snippet']
+
+    def test_search_comments(self, authenticated_client, user, search_tasks):
+        """Test that comment text matches only when requested."""
+        task = search_tasks['other']
+        Comment.objects.create(task=task, author=user, text='Blocked by the firewall rules')
+        url = reverse('task-list') + '?q=firewall'
+
+        assert uuids(authenticated_client.get(url)) == []
+        assert uuids(authenticated_client.get(url + '&search_comments=true')) == [
+            str(task.uuid)
+        ]
+
+    def test_indexes_are_usable(self, search_tasks):
+        """Test that the planner can answer both lookups from GIN indexes."""
+        query = build_search_query('database')
+        tasks_sql, tasks_params = Task.objects.filter(
+            search_vector=query
+        ).order_by().query.sql_with_params()
+        comments_sql, comments_params = Comment.objects.annotate(
+            text_vector=comment_search_vector()
+        ).filter(text_vector=query).order_by().query.sql_with_params()
+
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+            cursor.execute(f'EXPLAIN {tasks_sql}', tasks_params)
+            tasks_plan = ' '.join(row[0] for row in cursor.fetchall())
+            cursor.execute(f'EXPLAIN {comments_sql}', comments_params)
+            comments_plan = ' '.join(row[0] for row in cursor.fetchall())
+
+        assert 'tasks_search_vector_idx' in tasks_plan
+        assert 'comments_text_search_idx' in comments_plan
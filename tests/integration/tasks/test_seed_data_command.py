@@ -0,0 +1,106 @@
+"""
+Integration tests for the synthetic data generator of seed_data.
+"""
+import datetime
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from apps.core.generator import DataGenerator
+from apps.tasks.models import Task, Comment
+from apps.tasks.services import TaskService
+from apps.users.models import User
+
+END = datetime.datetime(2025, 1, 1, tzinfo=datetime.UTC)
+
+
+def generate(*args):
+    out = StringIO()
+    call_command('seed_data', *args, stdout=out)
+    return out.getvalue()
+
+
+def index_definitions():
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT indexdef FROM pg_indexes WHERE tablename IN ('users', 'tasks', 'comments')"
+        )
+        return sorted(row[0] for row in cursor.fetchall())
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestSeedDataGenerator:
+    """Test suite for manage.py seed_data --users/--tasks."""
+
+    def test_generates_consistent_data(self):
+        """Test that counts, references and comment counters are consistent."""
+        out = generate('--users=20', '--tasks=300', '--batch-size=70', '--seed=3')
+
+        comments = Comment.objects.count()
+        assert User.objects.count() == 20
+        assert Task.objects.count() == 300
+        assert f'Generated 20 users, 300 tasks and {comments} comments' in out
+        assert TaskService.recompute_counters(Task.objects.all()) == 0
+        assert Task.objects.filter(is_completed=True, completed_at__isnull=True).count() == 0
+        assert Task.objects.filter(assignee__isnull=True).exists()
+        # Ids continue after generated ones.
+        assert Task.objects.create(title='Next', creator=User.objects.first()).id == 301
+
+    def test_fixed_comment_count_and_skew(self):
+        """Test a fixed number of comments and the skew of assignees."""
+        generate('--users=50', '--tasks=1k', '--comments-per-task=2')
+
+        assert set(Task.objects.values_list('comment_count', flat=True)) == {2}
+        assert Comment.objects.count() == 2000
+        busiest = Task.objects.filter(assignee__username='user1').count()
+        assert busiest > Task.objects.filter(assignee__username='user50').count() * 5
+
+    def test_deterministic(self):
+        """Test that generated rows depend on the arguments and seed only."""
+        generator = DataGenerator(10, 100, seed=7, end=END)
+        rows = generator.task_rows(0, 50)[0][:10]
+
+        assert DataGenerator(10, 100, seed=7, end=END).task_rows(0, 50)[0][:10] == rows
+        assert DataGenerator(10, 100, seed=8, end=END).task_rows(0, 50)[0][:10] != rows
+        assert all(row[10] <= END for row in generator.task_rows(50, 100)[0])
+
+    def test_drop_indexes_rebuilds_them(self):
+        """Test that --drop-indexes leaves the same indexes behind."""
+        before = index_definitions()
+
+        out = generate('--users=5', '--tasks=50', '--drop-indexes')
+
+        assert 'Rebuilding' in out
+        assert index_definitions() == before
+
+    def test_invalid_arguments(self):
+        """Test the argument checks of generator mode."""
+        with pytest.raises(CommandError, match='--users'):
+            generate('--tasks=10')
+        with pytest.raises(CommandError, match='--batch-size'):
+            generate('--users=1', '--batch-size=0')
+        with pytest.raises(CommandError, match='invalid count'):
+            generate('--users=lots')
+
+
+@pytest.mark.integration
+@pytest.mark.django_db(transaction=True)
+class TestSeedDataWorkers:
+    """Test suite for seed_data with worker processes."""
+
+    def test_workers_write_the_same_data(self):
+        """Test that parallel workers generate the same rows as one process."""
+        args = ('--users=10', '--tasks=200', '--batch-size=30', '--end-date=2025-01-01')
+
+        generate(*args, '--workers=2')
+        tasks = set(Task.objects.values_list('uuid', 'title', 'comment_count', 'updated_at'))
+        comments = set(Comment.objects.values_list('uuid', 'task_id', 'created_at'))
+        Task.objects.all().delete()
+        User.objects.all().delete()
+        generate(*args)
+
+        assert set(Task.objects.values_list('uuid', 'title', 'comment_count', 'updated_at')) == tasks
+        assert set(Comment.objects.values_list('uuid', 'task_id', 'created_at')) == comments
@@ -0,0 +1,99 @@
+"""
+Integration tests for the Server-Timing middleware.
+"""
+import logging
+import pstats
+import re
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient, override_settings
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
+from apps.tasks.models import Task
+
+URL = '/api/tasks/'
+
+
+def parse_server_timing(header):
+    """
+    Return ``{name: (milliseconds, description)}`` of a Server-Timing header.
+    """
+    metrics = {}
+    for metric in header.split(', '):
+        match = re.fullmatch(r'(\w+);dur=([\d.]+)(?:;desc="([^"]*)")?', metric)
+        assert match, metric
+        metrics[match[1]] = (float(match[2]), match[3])
+    return metrics
+
+
+@pytest.fixture
+def jwt_client(api_client, user):
+    """
+    API client authenticating with a JWT, so authentication runs.
+    """
+    api_client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}')
+    return api_client
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestServerTiming:
+    """Test suite for Server-Timing headers and timing log lines."""
+
+    def test_header_phases(self, jwt_client, user):
+        """Test that list responses report SQL, auth, serialize and render."""
+        Task.objects.create(title='Timed', creator=user)
+
+        response = jwt_client.get(URL)
+
+        assert response.status_code == status.HTTP_200_OK
+        metrics = parse_server_timing(response['Server-Timing'])
+        assert list(metrics) == ['db', 'auth', 'serialize', 'render', 'app', 'total']
+        assert re.fullmatch(r'\d+ queries', metrics['db'][1])
+        assert int(metrics['db'][1].split()[0]) >= 2
+        parts = sum(ms for name, (ms, _) in metrics.items() if name != 'total')
+        assert parts == pytest.approx(metrics['total'][0], abs=0.5)
+
+    def test_log_line(self, authenticated_client, caplog):
+        """Test that each request logs its method, path, status and timings."""
+        with caplog.at_level(logging.INFO, logger='apps.core.timing'):
+            authenticated_client.get(URL + '?limit=1')
+
+        [record] = [record for record in caplog.records if record.name == 'apps.core.timing']
+        assert record.getMessage().startswith('GET /api/tasks/ 200 in ')
+        assert (record.method, record.path, record.status) == ('GET', '/api/tasks/', 200)
+        assert record.db_queries >= 2
+        assert record.total_ms >= record.db_ms
+        assert 'serialize_ms' in vars(record)
+
+    def test_header_can_be_disabled(self, authenticated_client):
+        """Test that SERVER_TIMING_HEADER=False drops the header."""
+        with override_settings(SERVER_TIMING_HEADER=False):
+            response = authenticated_client.get(URL)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert not response.has_header('Server-Timing')
+
+    def test_asgi_requests(self, user):
+        """Test that requests through the ASGI handler are timed too."""
+        response = async_to_sync(AsyncClient().get)(
+            URL, headers={'authorization': f'Bearer {AccessToken.for_user(user)}'}
+        )
+
+        metrics = parse_server_timing(response['Server-Timing'])
+        assert metrics['db'][1] != '0 queries'
+        assert 'auth' in metrics
+
+    def test_slow_requests_are_profiled(self, authenticated_client, tmp_path):
+        """Test that sampled requests over the threshold are saved as profiles."""
+        with override_settings(REQUEST_PROFILE_DIR=str(tmp_path),
+                               REQUEST_PROFILE_SAMPLE_RATE=1.0, REQUEST_PROFILE_MIN_MS=0):
+            authenticated_client.get(URL)
+        with override_settings(REQUEST_PROFILE_DIR=str(tmp_path),
+                               REQUEST_PROFILE_SAMPLE_RATE=1.0, REQUEST_PROFILE_MIN_MS=60000):
+            authenticated_client.get(URL)
+
+        [profile] = tmp_path.glob('*.prof')
+        assert '-GET-api-tasks-' in profile.name
+        assert pstats.Stats(str(profile)).total_calls > 0
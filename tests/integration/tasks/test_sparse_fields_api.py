@@ -0,0 +1,117 @@
+"""
+Integration tests for sparse fieldsets (?fields= / ?exclude=).
+"""
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from apps.tasks.models import Comment
+from tests.integration.tasks.test_pagination_api import collect_pages, create_tasks
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestSparseFieldsets:
+    """Test suite for sparse fieldsets on task and comment endpoints."""
+
+    def test_list_fields(self, authenticated_client, task, another_user):
+        """Test that ?fields= trims list items, including nested users."""
+        task.assignee = another_user
+        task.save()
+
+        url = reverse('task-list') + '?fields=uuid,title,is_completed,assignee.uuid'
+        response = authenticated_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['results'] == [{
+            'uuid': str(task.uuid),
+            'title': task.title,
+            'is_completed': False,
+            'assignee': {'uuid': str(another_user.uuid)},
+        }]
+
+    def test_list_query_skips_columns_and_joins(self, authenticated_client, task, settings):
+        """Test that unselected columns and user joins are not fetched."""
+        settings.TASK_LIST_CACHE_TIMEOUT = 0
+        url = reverse('task-list') + '?fields=uuid,title'
+
+        with CaptureQueriesContext(connection) as context:
+            response = authenticated_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        page_sql = context.captured_queries[-1]['sql']
+        assert '"description"' not in page_sql
+        assert 'users' not in page_sql
+
+    def test_list_exclude(self, authenticated_client, task):
+        """Test that ?exclude= removes fields and nested fields."""
+        url = reverse('task-list') + '?exclude=description,creator.email'
+        item = authenticated_client.get(url).data['results'][0]
+
+        assert 'description' not in item
+        assert 'email' not in item['creator']
+        assert item['creator']['uuid'] == str(task.creator.uuid)
+        assert 'title' in item
+
+    def test_keyset_with_sparse_fields(self, authenticated_client, user):
+        """Test that keyset cursors work when ordering columns are not selected."""
+        tasks = create_tasks(user, 5)
+
+        pages = collect_pages(
+            authenticated_client,
+            reverse('task-list') + '?cursor=&limit=2&fields=uuid&ordering=title',
+        )
+
+        assert sum(pages, []) == [str(task.uuid) for task in tasks]
+
+    def test_retrieve_fields(self, authenticated_client, task):
+        """Test that retrieve returns only the selected fields without joins."""
+        url = reverse('task-detail', kwargs={'uuid': task.uuid}) + '?fields=uuid,title'
+
+        with CaptureQueriesContext(connection) as context:
+            response = authenticated_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {'uuid': str(task.uuid), 'title': task.title}
+        assert len(context.captured_queries) == 1
+        assert 'users' not in context.captured_queries[0]['sql']
+        assert '"description"' not in context.captured_queries[0]['sql']
+
+    def test_retrieve_etag_depends_on_fields(self, authenticated_client, task):
+        """Test that different field selections get different ETags."""
+        url = reverse('task-detail', kwargs={'uuid': task.uuid})
+
+        full = authenticated_client.get(url)
+        sparse = authenticated_client.get(url + '?fields=uuid')
+
+        assert full['ETag'] != sparse['ETag']
+
+    def test_unknown_field(self, authenticated_client, task):
+        """Test that unknown field names return 400."""
+        url = reverse('task-list') + '?fields=uuid,nope&exclude=creator.nope'
+        response = authenticated_client.get(url)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert set(response.data) == {'fields', 'exclude'}
+
+    def test_writes_ignore_fields(self, authenticated_client):
+        """Test that ?fields= does not affect validation or output of writes."""
+        url = reverse('task-list') + '?fields=uuid'
+        response = authenticated_client.post(url, {'title': 'New'}, format='json')
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data['title'] == 'New'
+
+    def test_comment_fields(self, authenticated_client, user, task):
+        """Test sparse fieldsets on the comments list."""
+        comment = Comment.objects.create(task=task, author=user, text='Hello')
+
+        url = reverse('task-comments-list', kwargs={'task_uuid': task.uuid})
+        response = authenticated_client.get(url + '?fields=uuid,author.username')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['results'] == [{
+            'uuid': str(comment.uuid),
+            'author': {'username': user.username},
+        }]
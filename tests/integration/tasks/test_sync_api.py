@@ -0,0 +1,241 @@
+"""
+Integration tests for the change log and the delta sync endpoint.
+
+Entries are served once their transaction has ended, so these tests
+commit their writes.
+"""
+import uuid
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection, connections
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from apps.tasks.models import ChangeLogEntry, Comment, Task
+from apps.tasks.services import CommentService, TaskService
+
+SYNC_URL = reverse('sync-list')
+
+
+def sync(client, since=None, **params):
+    """
+    Return the sync response data after ``since``.
+    """
+    if since is not None:
+        params['since'] = since
+    response = client.get(SYNC_URL, params)
+    assert response.status_code == status.HTTP_200_OK, response.content
+    return response.data
+
+
+def uuids(items):
+    return {item['uuid'] for item in items}
+
+
+@pytest.mark.integration
+@pytest.mark.django_db(transaction=True)
+class TestSync:
+    """Test suite for GET /api/sync/."""
+
+    def test_full_sync_then_changes(self, authenticated_client, user):
+        """Test that a full sync returns everything, later syncs only the changes."""
+        kept = TaskService.create_task({'title': 'Kept'}, creator=user)
+        removed = TaskService.create_task({'title': 'Removed'}, creator=user)
+        comment = CommentService.create_comment({'text': 'First'}, author=user, task=removed)
+
+        data = sync(authenticated_client)
+        assert uuids(data['tasks']) == {str(kept.uuid), str(removed.uuid)}
+        assert uuids(data['comments']) == {str(comment.uuid)}
+        assert data['comments'][0]['task_uuid'] == str(removed.uuid)
+        assert not data['more'] and not data['reset']
+
+        TaskService.update_task(kept, {'title': 'Renamed'})
+        TaskService.delete_task(removed)
+        data = sync(authenticated_client, data['cursor'])
+
+        assert [task['title'] for task in data['tasks']] == ['Renamed']
+        assert data['comments'] == []
+        assert data['deleted_tasks'] == [str(removed.uuid)]
+        assert data['deleted_comments'] == [str(comment.uuid)]
+        assert sync(authenticated_client, data['cursor'])['tasks'] == []
+
+    def test_api_writes_are_logged(self, authenticated_client, user):
+        """Test that API creates, updates, comments and bulk operations are logged."""
+        data = sync(authenticated_client)
+        response = authenticated_client.post('/api/tasks/', {'title': 'Created'}, format='json')
+        task_uuid = response.data['uuid']
+        authenticated_client.patch(f'/api/tasks/{task_uuid}/', {'is_completed': True},
+                                   format='json')
+        authenticated_client.post(f'/api/tasks/{task_uuid}/comments/', {'text': 'Hi'},
+                                  format='json')
+        authenticated_client.post(reverse('task-bulk'), {
+            'create': [{'title': 'Bulk'}], 'delete': [task_uuid],
+        }, format='json')
+
+        data = sync(authenticated_client, data['cursor'])
+
+        assert [task['title'] for task in data['tasks']] == ['Bulk']
+        assert data['deleted_tasks'] == [task_uuid]
+        assert len(data['deleted_comments']) == 1
+
+    def test_changes_are_deduplicated(self, authenticated_client, user, task):
+        """Test that a row changed several times is returned once, in its current state."""
+        data = sync(authenticated_client)
+        for title in ('One', 'Two', 'Three'):
+            TaskService.update_task(task, {'title': title})
+
+        data = sync(authenticated_client, data['cursor'])
+
+        assert [item['title'] for item in data['tasks']] == ['Three']
+
+    def test_pages(self, authenticated_client, user):
+        """Test that following the cursor with a small limit returns every change once."""
+        created = {str(TaskService.create_task({'title': f'Task {index}'}, creator=user).uuid)
+                   for index in range(5)}
+        seen, cursor, pages = [], None, 0
+        while True:
+            data = sync(authenticated_client, cursor, limit=2)
+            seen += [item['uuid'] for item in data['tasks']]
+            cursor, pages = data['cursor'], pages + 1
+            if not data['more']:
+                break
+
+        assert sorted(seen) == sorted(created)
+        assert pages == 3
+
+    def test_open_transaction_holds_back_later_changes(self, authenticated_client, user):
+        """Test that entries committed after an older open transaction wait for it."""
+        cursor = sync(authenticated_client)['cursor']
+        other = connections.create_connection('default')
+        try:
+            with other.cursor() as other_cursor:
+                other_cursor.execute('BEGIN')
+                other_cursor.execute(
+                    "INSERT INTO change_log (kind, uuid, deleted) VALUES ('task', %s, true)",
+                    [str(uuid.uuid4())],
+                )
+                task = TaskService.create_task({'title': 'Later'}, creator=user)
+
+                assert sync(authenticated_client, cursor)['tasks'] == []
+
+                other_cursor.execute('COMMIT')
+        finally:
+            other.close()
+
+        data = sync(authenticated_client, cursor)
+        assert uuids(data['tasks']) == {str(task.uuid)}
+        assert len(data['deleted_tasks']) == 1
+
+    def test_compaction_resets_older_cursors(self, authenticated_client, user):
+        """Test that cursors before compacted deletions get a full sync with reset."""
+        kept = TaskService.create_task({'title': 'Kept'}, creator=user)
+        old_cursor = sync(authenticated_client)['cursor']
+        TaskService.update_task(kept, {'title': 'Renamed'})
+        TaskService.delete_task(TaskService.create_task({'title': 'Gone'}, creator=user))
+        new_cursor = sync(authenticated_client, old_cursor)['cursor']
+        out = StringIO()
+
+        call_command('compact_change_log', retention_days=0, stdout=out)
+
+        assert 'Removed 2 superseded and 1 deletion entries' in out.getvalue()
+        assert list(ChangeLogEntry.objects.values_list('uuid', flat=True)) == [kept.uuid]
+        data = sync(authenticated_client, old_cursor)
+        assert data['reset']
+        assert [task['title'] for task in data['tasks']] == ['Renamed']
+        assert not sync(authenticated_client, new_cursor)['reset']
+
+    def test_recent_deletions_are_kept(self, user):
+        """Test that deletions within the retention survive compaction."""
+        TaskService.delete_task(TaskService.create_task({'title': 'Gone'}, creator=user))
+        ChangeLogEntry.objects.filter(deleted=False).update(
+            created_at=timezone.now() - timedelta(days=60)
+        )
+        out = StringIO()
+
+        call_command('compact_change_log', stdout=out)
+
+        assert 'Removed 1 superseded and 0 deletion entries' in out.getvalue()
+        assert ChangeLogEntry.objects.get().deleted
+
+    def test_query_count_does_not_depend_on_changes(self, authenticated_client, user):
+        """Test that a page is read with the same queries for few or many changes."""
+        task = TaskService.create_task({'title': 'First'}, creator=user)
+        CommentService.create_comment({'text': 'First'}, author=user, task=task)
+        with CaptureQueriesContext(connection) as few:
+            sync(authenticated_client)
+        TaskService.bulk_apply({'create': [{'title': 'More'}] * 20}, user)
+        for _ in range(5):
+            CommentService.create_comment({'text': 'More'}, author=user, task=task)
+        with CaptureQueriesContext(connection) as many:
+            data = sync(authenticated_client)
+
+        assert len(data['tasks']) == 21 and len(data['comments']) == 6
+        assert len(many) == len(few)
+
+    def test_comment_deletion(self, authenticated_client, user, task):
+        """Test that deleted comments are reported and their task updated."""
+        comment = CommentService.create_comment({'text': 'Bye'}, author=user, task=task)
+        kept = CommentService.create_comment({'text': 'Stay'}, author=user, task=task)
+        cursor = sync(authenticated_client)['cursor']
+
+        CommentService.delete_comment(comment)
+        CommentService.delete_comments(Comment.objects.filter(pk=kept.pk))
+        data = sync(authenticated_client, cursor)
+
+        assert sorted(data['deleted_comments']) == sorted([str(comment.uuid), str(kept.uuid)])
+        assert [(item['uuid'], item['comment_count']) for item in data['tasks']] == [
+            (str(task.uuid), 0)
+        ]
+
+    def test_import_is_logged(self, authenticated_client, tmp_path, user):
+        """Test that tasks loaded by import_tasks are returned by the sync."""
+        path = tmp_path / 'tasks.ndjson'
+        path.write_text('{"title": "Imported", "creator": "testuser"}\n')
+
+        call_command('import_tasks', str(path), stdout=StringIO())
+
+        assert [task['title'] for task in sync(authenticated_client)['tasks']] == ['Imported']
+
+    def test_invalid_parameters(self, authenticated_client):
+        """Test that malformed cursors and limits are rejected."""
+        for params in ({'since': 'abc'}, {'since': '1.-2'}, {'since': '1.2.3'},
+                       {'limit': 0}, {'limit': 'x'}, {'limit': 100000}):
+            response = authenticated_client.get(SYNC_URL, params)
+            assert response.status_code == status.HTTP_400_BAD_REQUEST, params
+
+    def test_unauthenticated(self, api_client):
+        """Test that unauthenticated users cannot sync."""
+        response = api_client.get(SYNC_URL)
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.integration
+@pytest.mark.django_db(transaction=True)
+class TestChangeLogEntries:
+    """Test suite for the entries written by the services."""
+
+    def test_entry_has_transaction_id(self, user):
+        """Test that entries get the id of the writing transaction."""
+        task = TaskService.create_task({'title': 'Logged'}, creator=user)
+
+        entry = ChangeLogEntry.objects.get(uuid=task.uuid)
+
+        assert entry.kind == ChangeLogEntry.TASK
+        assert entry.txid > 0
+        assert not entry.deleted
+
+    def test_comment_logs_comment_and_task(self, user, task):
+        """Test that a new comment logs the comment and its task's new counters."""
+        ChangeLogEntry.objects.all().delete()
+
+        comment = CommentService.create_comment({'text': 'Hi'}, author=user, task=task)
+
+        assert set(ChangeLogEntry.objects.values_list('kind', 'uuid')) == {
+            (ChangeLogEntry.COMMENT, comment.uuid), (ChangeLogEntry.TASK, task.uuid),
+        }
+        assert Task.objects.get(pk=task.pk).comment_count == 1
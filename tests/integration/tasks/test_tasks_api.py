@@ -2,6 +2,8 @@
 Integration tests for Task API endpoints.
 """
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from apps.tasks.models import Task
@@ -303,3 +305,48 @@ class TestTaskAPI:
         assert response.data['results'][0]['uuid'] == str(assigned_task.uuid)
         assert response.data['results'][0]['assignee']['uuid'] == str(another_user.uuid)
         assert response.data['results'][0]['assignee']['email'] == another_user.email
+
+    def test_filter_tasks_by_multiple_assignees(self, authenticated_client, user, another_user):
+        """Test filtering tasks by a comma-separated list of assignee UUIDs."""
+        Task.objects.create(title='Mine', creator=user, assignee=user)
+        Task.objects.create(title='Theirs', creator=user, assignee=another_user)
+        Task.objects.create(title='Nobody', creator=user)
+
+        url = reverse('task-list') + f'?assignee={user.uuid},{another_user.uuid}'
+        with CaptureQueriesContext(connection) as context:
+            response = authenticated_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['count'] == 2
+        assert {task['title'] for task in response.data['results']} == {'Mine', 'Theirs'}
+        # Users are joined in the fingerprint and page queries instead of
+        # being looked up separately
+        assert len(context.captured_queries) == 2
+
+    def test_filter_unassigned_tasks(self, authenticated_client, user, another_user):
+        """Test filtering tasks without an assignee."""
+        unassigned = Task.objects.create(title='Nobody', creator=user)
+        Task.objects.create(title='Theirs', creator=user, assignee=another_user)
+
+        response = authenticated_client.get(reverse('task-list') + '?assignee__isnull=true')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['count'] == 1
+        assert response.data['results'][0]['uuid'] == str(unassigned.uuid)
+
+    def test_filter_tasks_by_unknown_creator(self, authenticated_client, user):
+        """Test that an unknown creator UUID yields no tasks."""
+        Task.objects.create(title='Task', creator=user)
+
+        response = authenticated_client.get(
+            reverse('task-list') + '?creator=00000000-0000-0000-0000-000000000000'
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['count'] == 0
+
+    def test_filter_tasks_by_invalid_uuid(self, authenticated_client):
+        """Test that a malformed UUID in a filter is rejected."""
+        response = authenticated_client.get(reverse('task-list') + '?assignee=not-a-uuid')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
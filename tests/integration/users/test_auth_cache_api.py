@@ -0,0 +1,173 @@
+"""
+Integration tests for the authenticated-user cache of JWT authentication.
+"""
+import time
+
+import pytest
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+from apps.core.metrics import registry as metrics
+from apps.users.authentication import CachedJWTAuthentication, UserCache
+
+
+def user_queries(context):
+    """
+    Return the captured queries reading the users table.
+    """
+    return [query for query in context.captured_queries if 'FROM "users"' in query['sql']]
+
+
+def cache_counts():
+    """
+    Return the local hits, shared hits and misses of UserCache so far.
+    """
+    return (
+        metrics.value('auth_user_cache_hits_total', (('level', 'local'),)),
+        metrics.value('auth_user_cache_hits_total', (('level', 'shared'),)),
+        metrics.value('auth_user_cache_misses_total'),
+    )
+
+
+@pytest.fixture
+def token_client(api_client, user):
+    """
+    API client sending a JWT access token of ``user``.
+    """
+    response = api_client.post(
+        reverse('token_obtain_pair'),
+        {'username': user.username, 'password': 'testpass123'},
+        format='json',
+    )
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+    return api_client
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestAuthUserCache:
+    """Test suite for CachedJWTAuthentication and UserCache."""
+
+    def test_repeated_requests_skip_user_query(self, token_client, user):
+        """Test that only the first authenticated request loads the user."""
+        url = reverse('user-current-user')
+        local_hits, shared_hits, misses = cache_counts()
+        with CaptureQueriesContext(connection) as first:
+            token_client.get(url)
+        with CaptureQueriesContext(connection) as second:
+            response = token_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['uuid'] == str(user.uuid)
+        assert len(user_queries(first)) == 1
+        assert len(second.captured_queries) == 0
+        assert cache_counts() == (local_hits + 1, shared_hits, misses + 1)
+
+    def test_requests_get_separate_instances(self, user):
+        """Test that cached users are rebuilt per lookup."""
+        UserCache.set(user)
+
+        first, second = UserCache.get(user.pk), UserCache.get(user.pk)
+
+        assert first == second == user
+        assert first is not second
+        assert (first.username, first.is_active) == (user.username, user.is_active)
+
+    def test_password_hash_is_not_cached(self, user, settings):
+        """Test that the shared cache holds no password hash, only its digest."""
+        settings.AUTH_USER_CACHE_ALIAS = 'default'
+
+        UserCache.set(user)
+
+        values = caches['default'].get(UserCache.make_key(user.pk))
+        assert 'password' not in values
+        assert user.password not in values.values()
+        assert 'password' in UserCache.get(user.pk).get_deferred_fields()
+
+    def test_revocation_check_on_cached_user(self, user, monkeypatch):
+        """Test that revoked tokens are rejected without loading the password."""
+        monkeypatch.setattr(api_settings, 'CHECK_REVOKE_TOKEN', True)
+        UserCache.set(user)
+        cached = UserCache.get(user.pk)
+        claim = api_settings.REVOKE_TOKEN_CLAIM
+
+        with CaptureQueriesContext(connection) as context:
+            assert CachedJWTAuthentication.check_user(
+                cached, {claim: get_md5_hash_password(user.password)}
+            ) is cached
+            with pytest.raises(AuthenticationFailed):
+                CachedJWTAuthentication.check_user(cached, {claim: 'revoked'})
+
+        assert len(context.captured_queries) == 0
+
+    def test_deactivation_invalidates(self, token_client, user):
+        """Test that saving a deactivated user rejects its token at once."""
+        url = reverse('user-current-user')
+        token_client.get(url)
+
+        user.is_active = False
+        user.save()
+
+        assert token_client.get(url).status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_password_change_invalidates(self, token_client, user):
+        """Test that a password change drops the cached user."""
+        url = reverse('user-current-user')
+        token_client.get(url)
+
+        user.set_password('another-pass-456')
+        user.save()
+        with CaptureQueriesContext(connection) as context:
+            token_client.get(url)
+
+        assert len(user_queries(context)) == 1
+
+    def test_shared_cache_level(self, token_client, user, settings):
+        """Test that another process's LRU miss is served by the shared cache."""
+        settings.AUTH_USER_CACHE_ALIAS = 'default'
+        url = reverse('user-current-user')
+        token_client.get(url)
+        UserCache.clear()
+        shared_hits = cache_counts()[1]
+
+        with CaptureQueriesContext(connection) as context:
+            response = token_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(context.captured_queries) == 0
+        assert cache_counts()[1] == shared_hits + 1
+
+        user.save()
+        UserCache.clear()
+        with CaptureQueriesContext(connection) as context:
+            token_client.get(url)
+        assert len(user_queries(context)) == 1
+
+    def test_lru_eviction_and_expiry(self, user, another_user, settings, monkeypatch):
+        """Test that the LRU keeps AUTH_USER_CACHE_SIZE users for the timeout."""
+        settings.AUTH_USER_CACHE_SIZE = 1
+        UserCache.set(user)
+        UserCache.set(another_user)
+
+        assert UserCache.get(user.pk) is None
+        assert UserCache.get(another_user.pk) == another_user
+
+        expired = time.monotonic() + settings.AUTH_USER_CACHE_TIMEOUT + 1
+        monkeypatch.setattr('apps.users.authentication.time.monotonic', lambda: expired)
+        assert UserCache.get(another_user.pk) is None
+
+    def test_disabled(self, token_client, settings):
+        """Test that a zero timeout loads the user on every request."""
+        settings.AUTH_USER_CACHE_TIMEOUT = 0
+        url = reverse('user-current-user')
+        token_client.get(url)
+
+        with CaptureQueriesContext(connection) as context:
+            token_client.get(url)
+
+        assert len(user_queries(context)) == 1
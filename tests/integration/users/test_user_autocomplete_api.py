@@ -0,0 +1,113 @@
+"""
+Integration tests for user autocomplete and the user search indexes.
+"""
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.urls import reverse
+from rest_framework import status
+from apps.users.models import prefix_key
+from tests.conftest import assert_user_structure
+
+User = get_user_model()
+
+URL = reverse('user-autocomplete')
+
+
+@pytest.fixture
+def people(db):
+    """
+    Users with overlapping names.
+    """
+    specs = [
+        ('annabelle', 'annabelle@example.com', 'Annabelle', 'Lee'),
+        ('ann', 'ann@example.com', 'Ann', 'Grey'),
+        ('bob_annex', 'bob@example.com', 'Bob', 'Annex'),
+        ('carol', 'carol.smith@example.com', 'Carol', 'Smith'),
+        ('dave', 'dave@example.com', 'Dave', 'Jones'),
+    ]
+    return {
+        username: User.objects.create_user(
+            username=username, email=email, password='x',
+            first_name=first_name, last_name=last_name,
+        )
+        for username, email, first_name, last_name in specs
+    }
+
+
+def usernames(response):
+    return [item['username'] for item in response.data]
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestUserAutocomplete:
+    """Test suite for GET /api/users/autocomplete/."""
+
+    def test_prefix_matches_ranked_by_similarity(self, authenticated_client, people):
+        """Test that prefixes of any field match, most similar first."""
+        response = authenticated_client.get(URL + '?q=Ann')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert usernames(response) == ['ann', 'bob_annex', 'annabelle']
+        assert_user_structure(response.data[0], user_obj=people['ann'])
+        assert usernames(authenticated_client.get(URL + '?q=jone')) == ['dave']
+
+    def test_substring_matches_fill_remaining_slots(self, authenticated_client, people):
+        """Test that substrings match after prefixes from three characters on."""
+        assert usernames(authenticated_client.get(URL + '?q=lee')) == ['annabelle']
+        assert usernames(authenticated_client.get(URL + '?q=belle')) == ['annabelle']
+        assert usernames(authenticated_client.get(URL + '?q=smith')) == ['carol']
+
+    def test_short_query_matches_prefixes_only(self, authenticated_client, people):
+        """Test that inputs under three characters only match prefixes."""
+        assert usernames(authenticated_client.get(URL + '?q=ex')) == []
+        assert usernames(authenticated_client.get(URL + '?q=da')) == ['dave']
+
+    def test_limit(self, authenticated_client, people):
+        """Test that limit caps the suggestions and is validated."""
+        assert usernames(authenticated_client.get(URL + '?q=ann&limit=1')) == ['ann']
+
+        for limit in ('0', '26', 'abc'):
+            response = authenticated_client.get(URL + f'?q=ann&limit={limit}')
+            assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_empty_query_and_inactive_users(self, authenticated_client, people):
+        """Test that a blank query returns nothing and inactive users are hidden."""
+        assert authenticated_client.get(URL + '?q=%20').data == []
+
+        User.objects.filter(username='ann').update(is_active=False)
+        assert usernames(authenticated_client.get(URL + '?q=ann')) == ['bob_annex', 'annabelle']
+
+    def test_wildcards_are_literal(self, authenticated_client, people):
+        """Test that LIKE wildcards in the input are matched literally."""
+        assert usernames(authenticated_client.get(URL + '?q=bob_')) == ['bob_annex']
+        assert authenticated_client.get(URL + '?q=%25').data == []
+
+    def test_requires_authentication(self, api_client):
+        """Test that autocomplete requires authentication."""
+        response = api_client.get(URL + '?q=ann')
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_indexes_are_usable(self, people):
+        """Test that prefix and substring lookups can use the indexes."""
+        queries = [
+            User.objects.alias(key=prefix_key('username')).filter(
+                key__startswith='AN'
+            ).order_by('key')[:10],
+            User.objects.filter(email__icontains='smith').order_by(),
+            User.objects.filter(username__icontains='ann').order_by(),
+        ]
+        plans = []
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+            for queryset in queries:
+                sql, params = queryset.query.sql_with_params()
+                cursor.execute(f'EXPLAIN {sql}', params)
+                plans.append(' '.join(row[0] for row in cursor.fetchall()))
+
+        assert 'users_username_prefix_idx' in plans[0]
+        assert 'Sort' not in plans[0]
+        assert 'users_email_trgm_idx' in plans[1]
+        assert 'users_username_trgm_idx' in plans[2]
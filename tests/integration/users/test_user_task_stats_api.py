@@ -0,0 +1,185 @@
+"""
+Integration tests for per-user task statistics.
+"""
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from apps.tasks.models import Task, UserTaskStats, empty_completion_buckets
+from apps.tasks.services import TaskService, TaskStatsService
+
+TASKS_URL = reverse('task-list')
+
+
+def stats_url(user):
+    return reverse('user-stats', kwargs={'uuid': user.uuid})
+
+
+def get_stats(client, user):
+    """
+    Return the statistics of ``user`` from the API.
+    """
+    response = client.get(stats_url(user))
+    assert response.status_code == status.HTTP_200_OK
+    return response.data
+
+
+def stored_stats(user):
+    """
+    Return the statistics row of ``user`` as a tuple, zeros if missing.
+    """
+    stats = UserTaskStats.objects.filter(user=user).first() or UserTaskStats()
+    return stats.open_count, stats.completed_count, stats.completion_buckets
+
+
+def rebuilt_stats(user):
+    """
+    Return the statistics of ``user`` recomputed from the tasks table.
+    """
+    TaskStatsService.rebuild(user.pk, user.pk + 1)
+    return stored_stats(user)
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestUserTaskStats:
+    """Test suite for GET /api/users/{uuid}/stats/ and /api/users/me/stats/."""
+
+    def test_user_without_tasks(self, authenticated_client, another_user):
+        """Test that users without assigned tasks have zero counts."""
+        assert get_stats(authenticated_client, another_user) == {
+            'user': str(another_user.uuid),
+            'open_count': 0,
+            'completed_count': 0,
+            'median_completion_seconds': None,
+        }
+
+    def test_api_changes_update_stats(self, authenticated_client, user, another_user):
+        """Test that create, complete, reassign and delete keep counts in step."""
+        response = authenticated_client.post(
+            TASKS_URL, {'title': 'Assigned', 'assignee_uuid': str(user.uuid)}, format='json'
+        )
+        url = reverse('task-detail', kwargs={'uuid': response.data['uuid']})
+        authenticated_client.post(
+            TASKS_URL, {'title': 'Open', 'assignee_uuid': str(user.uuid)}, format='json'
+        )
+        assert get_stats(authenticated_client, user)['open_count'] == 2
+
+        authenticated_client.patch(url, {'is_completed': True}, format='json')
+        data = get_stats(authenticated_client, user)
+        assert (data['open_count'], data['completed_count']) == (1, 1)
+        assert data['median_completion_seconds'] is not None
+
+        authenticated_client.patch(url, {'assignee_uuid': str(another_user.uuid)}, format='json')
+        assert get_stats(authenticated_client, user)['completed_count'] == 0
+        assert get_stats(authenticated_client, another_user)['completed_count'] == 1
+
+        authenticated_client.delete(url)
+        assert get_stats(authenticated_client, another_user)['completed_count'] == 0
+        for member in (user, another_user):
+            assert stored_stats(member) == rebuilt_stats(member)
+
+    def test_bulk_changes_update_stats(self, authenticated_client, user):
+        """Test that the bulk endpoint updates the statistics of all its operations."""
+        first, second = (
+            Task.objects.create(title=title, creator=user) for title in ('First', 'Second')
+        )
+        payload = {
+            'create': [{'title': 'New', 'assignee_uuid': str(user.uuid)}],
+            'update': [{'uuid': str(first.uuid), 'assignee_uuid': str(user.uuid),
+                        'is_completed': True}],
+            'delete': [str(second.uuid)],
+        }
+        response = authenticated_client.post(reverse('task-bulk'), payload, format='json')
+        assert response.status_code == status.HTTP_200_OK
+
+        data = get_stats(authenticated_client, user)
+        assert (data['open_count'], data['completed_count']) == (1, 1)
+        assert stored_stats(user) == rebuilt_stats(user)
+
+    def test_current_user_stats(self, authenticated_client, user):
+        """Test that /me/stats/ returns the authenticated user's statistics."""
+        TaskService.create_task({'title': 'Mine', 'assignee': user}, creator=user)
+
+        response = authenticated_client.get(reverse('user-current-user-stats'))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['user'] == str(user.uuid)
+        assert response.data['open_count'] == 1
+
+    def test_median_completion_estimate(self, user):
+        """Test that the median is estimated within one bucket of the exact value."""
+        now = timezone.now()
+        for minutes in (10, 20, 30, 600, 6000):
+            Task.objects.create(title='Done', creator=user, assignee=user, is_completed=True,
+                                created_at=now - timedelta(minutes=minutes), completed_at=now)
+        rebuilt_stats(user)
+
+        median = UserTaskStats.objects.get(user=user).median_completion_seconds()
+
+        assert 30 * 60 / 1.25 <= median <= 30 * 60 * 1.25
+
+    def test_constant_query_count(self, authenticated_client, user):
+        """Test that the endpoint runs the same queries whatever the number of tasks."""
+        TaskService.create_task({'title': 'One', 'assignee': user}, creator=user)
+        with CaptureQueriesContext(connection) as few:
+            get_stats(authenticated_client, user)
+        TaskService.bulk_apply({'create': [{'title': 'Many', 'assignee': user}] * 50}, user)
+        with CaptureQueriesContext(connection) as many:
+            data = get_stats(authenticated_client, user)
+
+        assert data['open_count'] == 51
+        assert len(many) == len(few)
+
+    def test_unknown_user(self, authenticated_client):
+        """Test that statistics of an unknown user return 404."""
+        url = reverse('user-stats', kwargs={'uuid': '00000000-0000-0000-0000-000000000000'})
+
+        response = authenticated_client.get(url)
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_unauthenticated(self, api_client, user):
+        """Test that unauthenticated users cannot read statistics."""
+        response = api_client.get(stats_url(user))
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestRebuildTaskStatsCommand:
+    """Test suite for the rebuild_task_stats management command."""
+
+    def test_repairs_drift(self, user, another_user):
+        """Test that drifted and missing rows are rebuilt, stale rows zeroed."""
+        Task.objects.create(title='Unmaintained', creator=user, assignee=user)
+        UserTaskStats.objects.create(user=another_user, open_count=7)
+        out = StringIO()
+
+        call_command('rebuild_task_stats', batch_size=1, stdout=out)
+
+        assert stored_stats(user) == (1, 0, empty_completion_buckets())
+        assert stored_stats(another_user) == (0, 0, empty_completion_buckets())
+        assert 'corrected 2 users' in out.getvalue()
+
+    def test_up_to_date_stats_are_not_written(self, user):
+        """Test that a rebuild of maintained statistics corrects nothing."""
+        TaskService.create_task({'title': 'Maintained', 'assignee': user}, creator=user)
+        out = StringIO()
+
+        call_command('rebuild_task_stats', stdout=out)
+
+        assert 'corrected 0 users' in out.getvalue()
+
+    def test_invalid_batch_size(self):
+        """Test that a non-positive batch size is rejected."""
+        with pytest.raises(CommandError):
+            call_command('rebuild_task_stats', batch_size=0)
@@ -0,0 +1,273 @@
+"""
+Integration tests for the webhook worker, delivering to a stub HTTP
+server running in a thread.
+"""
+import hashlib
+import hmac
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connections
+from django.utils import timezone
+from apps.tasks.services import CommentService, TaskService
+from apps.webhooks.models import (
+    COMMENT_CREATED,
+    TASK_COMPLETED,
+    TASK_CREATED,
+    WebhookDelivery,
+    WebhookEvent,
+    WebhookSubscription,
+)
+from apps.webhooks.services import WebhookService
+from apps.webhooks.worker import WebhookWorker
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """
+    Records each POST and answers with the next status of the server.
+    """
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        server = self.server
+        server.requests.append({
+            'path': self.path,
+            'headers': dict(self.headers),
+            'body': body,
+            'client': self.client_address,
+        })
+        code = server.statuses.pop(0) if server.statuses else 200
+        self.send_response(code)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def endpoint():
+    """
+    Fixture for a local HTTP server recording the webhook requests.
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    server.requests, server.statuses = [], []
+    server.url = f'http://127.0.0.1:{server.server_port}'
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def worker(settings):
+    """
+    Fixture for a worker retrying after at most one second.
+    """
+    settings.WEBHOOK_RETRY_BASE_SECONDS = 1
+    settings.WEBHOOK_RETRY_MAX_SECONDS = 1
+    worker = WebhookWorker(batch_size=2, timeout=5)
+    yield worker
+    worker.pool.close()
+
+
+def subscribe(endpoint, path='/hooks', events=(TASK_CREATED, TASK_COMPLETED, COMMENT_CREATED),
+              **fields):
+    return WebhookSubscription.objects.create(url=endpoint.url + path, events=list(events),
+                                              **fields)
+
+
+def sent_events(request):
+    return json.loads(request['body'])['events']
+
+
+def make_due():
+    WebhookDelivery.objects.update(next_attempt_at=timezone.now())
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestWebhookWorker:
+    """Test suite for WebhookWorker."""
+
+    def test_delivers_signed_batches(self, endpoint, worker, user):
+        """Test that events are sent in signed batches and their deliveries removed."""
+        subscription = subscribe(endpoint)
+        tasks = [TaskService.create_task({'title': f'Task {index}'}, creator=user)
+                 for index in range(3)]
+
+        counts = worker.run_once()
+
+        assert counts == {'events': 3, 'delivered': 3, 'retrying': 0, 'failed': 0}
+        assert [len(sent_events(request)) for request in endpoint.requests] == [2, 1]
+        events = sent_events(endpoint.requests[0]) + sent_events(endpoint.requests[1])
+        assert [event['data']['uuid'] for event in events] == [str(task.uuid) for task in tasks]
+        assert {event['type'] for event in events} == {TASK_CREATED}
+        for request in endpoint.requests:
+            timestamp = request['headers']['Webhook-Timestamp']
+            expected = hmac.new(subscription.secret.encode(),
+                                f'{timestamp}.'.encode() + request['body'],
+                                hashlib.sha256).hexdigest()
+            assert request['headers']['Webhook-Signature'] == f'v1={expected}'
+            assert request['path'] == '/hooks'
+        assert not WebhookEvent.objects.exists()
+        assert not WebhookDelivery.objects.exists()
+
+    def test_connection_is_reused(self, endpoint, worker, user):
+        """Test that consecutive requests to an endpoint share one connection."""
+        subscribe(endpoint)
+        for index in range(5):
+            TaskService.create_task({'title': f'Task {index}'}, creator=user)
+
+        worker.run_once()
+
+        assert len(endpoint.requests) == 3
+        assert len({request['client'] for request in endpoint.requests}) == 1
+
+    def test_fans_out_per_subscription(self, endpoint, worker, user, task):
+        """Test that each endpoint only receives the events it subscribed to."""
+        subscribe(endpoint, '/tasks', events=[TASK_CREATED, TASK_COMPLETED])
+        subscribe(endpoint, '/comments', events=[COMMENT_CREATED])
+        subscribe(endpoint, '/inactive', is_active=False)
+        TaskService.update_task(task, {'is_completed': True})
+        CommentService.create_comment({'text': 'Hi'}, author=user, task=task)
+
+        worker.run_once()
+
+        received = {request['path']: [event['type'] for event in sent_events(request)]
+                    for request in endpoint.requests}
+        assert received == {'/tasks': [TASK_COMPLETED], '/comments': [COMMENT_CREATED]}
+
+    def test_events_without_subscribers_are_dropped(self, endpoint, worker, user):
+        """Test that events nobody subscribed to leave the outbox unsent."""
+        TaskService.create_task({'title': 'Unheard'}, creator=user)
+
+        assert worker.run_once()['events'] == 1
+
+        assert not WebhookEvent.objects.exists()
+        assert endpoint.requests == []
+
+    def test_retries_with_backoff(self, endpoint, worker, user):
+        """Test that failed deliveries are retried once their backoff passed."""
+        subscribe(endpoint)
+        endpoint.statuses = [500]
+        TaskService.create_task({'title': 'Retried'}, creator=user)
+
+        assert worker.run_once()['retrying'] == 1
+        delivery = WebhookDelivery.objects.get()
+        assert (delivery.attempts, delivery.last_error) == (1, 'HTTP 500')
+        assert delivery.next_attempt_at > timezone.now()
+        assert worker.run_once()['delivered'] == 0
+
+        make_due()
+        assert worker.run_once()['delivered'] == 1
+        assert len(endpoint.requests) == 2
+        assert sent_events(endpoint.requests[0]) == sent_events(endpoint.requests[1])
+
+    def test_unreachable_endpoint_is_retried(self, worker, user):
+        """Test that connection errors are recorded and retried."""
+        WebhookSubscription.objects.create(url='http://127.0.0.1:1/hooks',
+                                           events=[TASK_CREATED])
+        TaskService.create_task({'title': 'Unreachable'}, creator=user)
+
+        assert worker.run_once()['retrying'] == 1
+
+        assert 'ConnectionRefusedError' in WebhookDelivery.objects.get().last_error
+
+    def test_fails_after_max_attempts(self, endpoint, worker, settings, user):
+        """Test that deliveries are marked failed after the last attempt."""
+        settings.WEBHOOK_MAX_ATTEMPTS = 2
+        subscribe(endpoint)
+        endpoint.statuses = [503, 503]
+        TaskService.create_task({'title': 'Failing'}, creator=user)
+
+        worker.run_once()
+        make_due()
+        assert worker.run_once()['failed'] == 1
+
+        make_due()
+        assert worker.run_once()['delivered'] == 0
+        delivery = WebhookDelivery.objects.get()
+        assert (delivery.status, delivery.attempts) == (WebhookDelivery.FAILED, 2)
+
+    def test_retry_delay(self, settings):
+        """Test that the backoff doubles per attempt, with jitter, up to the cap."""
+        settings.WEBHOOK_RETRY_BASE_SECONDS = 10
+        settings.WEBHOOK_RETRY_MAX_SECONDS = 60
+
+        assert 5 <= WebhookService.retry_delay(1) <= 10
+        assert 20 <= WebhookService.retry_delay(3) <= 40
+        assert 30 <= WebhookService.retry_delay(10) <= 60
+
+
+@pytest.mark.integration
+@pytest.mark.django_db(transaction=True)
+class TestWebhookClaims:
+    """Test suite for concurrent claims of events and deliveries."""
+
+    def test_claimed_deliveries_are_leased(self, user):
+        """Test that a claimed delivery is not claimed again until its lease ends."""
+        WebhookSubscription.objects.create(url='http://127.0.0.1:1/hooks',
+                                           events=[TASK_CREATED])
+        TaskService.create_task({'title': 'Claimed'}, creator=user)
+        WebhookService.fan_out(10)
+
+        assert len(WebhookService.claim(10, lease_seconds=60)) == 1
+        assert WebhookService.claim(10, lease_seconds=60) == []
+
+        make_due()
+        assert len(WebhookService.claim(10, lease_seconds=60)) == 1
+
+    def test_locked_rows_are_skipped(self, user):
+        """Test that events and deliveries locked by another worker are skipped."""
+        WebhookSubscription.objects.create(url='http://127.0.0.1:1/hooks',
+                                           events=[TASK_CREATED])
+        TaskService.create_task({'title': 'First'}, creator=user)
+        WebhookService.fan_out(10)
+        TaskService.create_task({'title': 'Second'}, creator=user)
+        other = connections.create_connection('default')
+        try:
+            with other.cursor() as cursor:
+                cursor.execute('BEGIN')
+                cursor.execute('SELECT id FROM webhook_outbox FOR UPDATE')
+                cursor.execute('SELECT id FROM webhook_deliveries FOR UPDATE')
+
+                assert WebhookService.fan_out(10) == (0, 0)
+                assert WebhookService.claim(10, lease_seconds=60) == []
+
+                cursor.execute('ROLLBACK')
+        finally:
+            other.close()
+
+        assert WebhookService.fan_out(10) == (1, 1)
+        assert len(WebhookService.claim(10, lease_seconds=60)) == 2
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestRunWebhookWorkerCommand:
+    """Test suite for the run_webhook_worker management command."""
+
+    def test_once(self, endpoint, user):
+        """Test that --once delivers everything due and reports the counts."""
+        subscribe(endpoint)
+        TaskService.create_task({'title': 'Delivered'}, creator=user)
+        out = StringIO()
+
+        call_command('run_webhook_worker', once=True, stdout=out)
+
+        assert 'Fanned out 1 events; delivered 1, retrying 0, failed 0' in out.getvalue()
+        assert len(endpoint.requests) == 1
+
+    def test_invalid_options(self):
+        """Test that non-positive claim sizes and thread counts are rejected."""
+        for options in ({'claim_size': 0}, {'threads': 0}):
+            with pytest.raises(CommandError):
+                call_command('run_webhook_worker', once=True, **options)
@@ -0,0 +1,162 @@
+"""
+Integration tests for webhook subscriptions and the events the services
+add to the outbox.
+"""
+import pytest
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from apps.tasks.services import CommentService, TaskService
+from apps.webhooks.models import (
+    COMMENT_CREATED,
+    TASK_COMPLETED,
+    TASK_CREATED,
+    WebhookEvent,
+    WebhookSubscription,
+)
+
+WEBHOOKS_URL = reverse('webhook-list')
+TASKS_URL = reverse('task-list')
+
+
+@pytest.fixture
+def staff_client(authenticated_client, user):
+    """
+    Fixture for an API client authenticated as a staff user.
+    """
+    user.is_staff = True
+    user.save()
+    return authenticated_client
+
+
+def outbox():
+    return list(WebhookEvent.objects.order_by('id').values_list('event', flat=True))
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestWebhookSubscriptionAPI:
+    """Test suite for /api/webhooks/."""
+
+    def test_create_subscription(self, staff_client):
+        """Test that staff can subscribe an endpoint and get its secret."""
+        response = staff_client.post(WEBHOOKS_URL, {
+            'url': 'https://example.com/hooks',
+            'events': [TASK_CREATED, TASK_COMPLETED, TASK_CREATED],
+        }, format='json')
+
+        assert response.status_code == status.HTTP_201_CREATED
+        subscription = WebhookSubscription.objects.get(uuid=response.data['uuid'])
+        assert subscription.events == [TASK_CREATED, TASK_COMPLETED]
+        assert response.data['secret'] == subscription.secret
+        assert len(subscription.secret) == 64
+
+    def test_secret_is_read_only(self, staff_client):
+        """Test that updates cannot replace the generated secret."""
+        subscription = WebhookSubscription.objects.create(
+            url='https://example.com/hooks', events=[TASK_CREATED]
+        )
+        url = reverse('webhook-detail', kwargs={'uuid': subscription.uuid})
+
+        response = staff_client.patch(url, {'secret': 'guessable', 'is_active': False},
+                                      format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        subscription.refresh_from_db()
+        assert subscription.secret != 'guessable'
+        assert not subscription.is_active
+
+    def test_invalid_subscriptions(self, staff_client):
+        """Test that unknown events, empty events and non-http URLs are rejected."""
+        for payload in (
+            {'url': 'https://example.com/hooks', 'events': ['task.deleted']},
+            {'url': 'https://example.com/hooks', 'events': []},
+            {'url': 'ftp://example.com/hooks', 'events': [TASK_CREATED]},
+        ):
+            response = staff_client.post(WEBHOOKS_URL, payload, format='json')
+            assert response.status_code == status.HTTP_400_BAD_REQUEST, payload
+
+    def test_non_staff_forbidden(self, authenticated_client):
+        """Test that users without staff status cannot manage subscriptions."""
+        response = authenticated_client.get(WEBHOOKS_URL)
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_unauthenticated(self, api_client):
+        """Test that unauthenticated users cannot manage subscriptions."""
+        response = api_client.get(WEBHOOKS_URL)
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestWebhookOutbox:
+    """Test suite for the events written by the task and comment services."""
+
+    def test_request_pays_one_insert(self, authenticated_client):
+        """Test that creating a task only adds one outbox INSERT to the request."""
+        WebhookSubscription.objects.create(url='https://example.com/hooks',
+                                           events=[TASK_CREATED])
+
+        with CaptureQueriesContext(connection) as queries:
+            response = authenticated_client.post(TASKS_URL, {'title': 'Hooked'}, format='json')
+
+        assert response.status_code == status.HTTP_201_CREATED
+        webhook_queries = [query['sql'] for query in queries if 'webhook' in query['sql']]
+        assert len(webhook_queries) == 1
+        assert webhook_queries[0].startswith('INSERT INTO "webhook_outbox"')
+        event = WebhookEvent.objects.get()
+        assert event.event == TASK_CREATED
+        assert event.payload['uuid'] == response.data['uuid']
+        assert event.payload['creator'] == response.data['creator']['uuid']
+
+    def test_completion_events(self, authenticated_client, task):
+        """Test that only the transition to completed adds a task.completed event."""
+        url = reverse('task-detail', kwargs={'uuid': task.uuid})
+
+        authenticated_client.patch(url, {'title': 'Renamed'}, format='json')
+        authenticated_client.patch(url, {'is_completed': True}, format='json')
+        authenticated_client.patch(url, {'is_completed': True}, format='json')
+
+        assert outbox() == [TASK_COMPLETED]
+        assert WebhookEvent.objects.get().payload['completed_at'] is not None
+
+    def test_comment_event(self, user, task):
+        """Test that a new comment adds a comment.created event."""
+        comment = CommentService.create_comment({'text': 'Hi'}, author=user, task=task)
+
+        event = WebhookEvent.objects.get()
+        assert event.event == COMMENT_CREATED
+        assert event.payload == {
+            'uuid': str(comment.uuid),
+            'task_uuid': str(task.uuid),
+            'author': str(user.uuid),
+            'text': 'Hi',
+            'created_at': event.payload['created_at'],
+        }
+
+    def test_bulk_events(self, user, task):
+        """Test that bulk operations add their events in one INSERT."""
+        task.refresh_from_db()
+        payload = {
+            'create': [{'title': 'One'}, {'title': 'Two'}],
+            'update': [{'task': task, 'is_completed': True}],
+        }
+
+        with CaptureQueriesContext(connection) as queries:
+            TaskService.bulk_apply(payload, user)
+
+        assert len([query for query in queries if 'webhook_outbox' in query['sql']]) == 1
+        assert outbox() == [TASK_CREATED, TASK_CREATED, TASK_COMPLETED]
+
+    def test_rolled_back_change_has_no_event(self, user):
+        """Test that events are only kept with the change they describe."""
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                TaskService.create_task({'title': 'Rolled back'}, creator=user)
+                raise RuntimeError
+
+        assert outbox() == []
+
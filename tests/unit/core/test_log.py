@@ -0,0 +1,119 @@
+"""
+Unit tests for the background logging pipeline.
+"""
+import json
+import logging
+import queue
+import sys
+import threading
+
+import pytest
+from apps.core.log import AsyncQueueHandler, BackgroundListener, JsonFormatter, SamplingFilter
+
+
+class ThreadRecordingHandler(logging.Handler):
+    """
+    Handler keeping formatted messages and the threads that wrote them.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+        self.threads = set()
+
+    def emit(self, record):
+        self.lines.append(self.format(record))
+        self.threads.add(threading.current_thread())
+
+
+def make_record(name='apps.tasks.services', level=logging.INFO, msg='Task %s created', args=('a',)):
+    return logging.LogRecord(name, level, __file__, 1, msg, args, None)
+
+
+@pytest.mark.unit
+class TestJsonFormatter:
+    """Test suite for JsonFormatter."""
+
+    def test_fields_and_extra(self):
+        """Test that records become one JSON object with extra fields."""
+        record = make_record()
+        record.task_uuid = 'a'
+
+        data = json.loads(JsonFormatter().format(record))
+
+        assert data['level'] == 'INFO'
+        assert data['logger'] == 'apps.tasks.services'
+        assert data['message'] == 'Task a created'
+        assert data['task_uuid'] == 'a'
+        assert 'args' not in data
+
+    def test_exception(self):
+        """Test that tracebacks are included as text."""
+        try:
+            raise ValueError('broken')
+        except ValueError:
+            logger = logging.getLogger('tests.log')
+            record = logger.makeRecord('tests.log', logging.ERROR, __file__, 1, 'Failed', (),
+                                       sys.exc_info())
+
+        data = json.loads(JsonFormatter().format(record))
+
+        assert 'ValueError: broken' in data['exc_info']
+
+
+@pytest.mark.unit
+class TestSamplingFilter:
+    """Test suite for SamplingFilter."""
+
+    def test_rates_apply_to_child_loggers(self):
+        """Test that INFO records of sampled loggers and their children are dropped."""
+        sampling = SamplingFilter({'apps.core': 0.0})
+
+        assert not sampling.filter(make_record('apps.core.timing'))
+        assert sampling.filter(make_record('apps.core.timing', logging.WARNING))
+        assert sampling.filter(make_record('apps.tasks.services'))
+
+
+@pytest.mark.unit
+class TestAsyncQueueHandler:
+    """Test suite for AsyncQueueHandler and BackgroundListener."""
+
+    def test_records_are_written_by_listener_thread(self):
+        """Test that formatting and writing happen in the listener thread."""
+        target = ThreadRecordingHandler()
+        handler = AsyncQueueHandler(queue.Queue(10))
+        handler.listener = BackgroundListener(handler.queue, target)
+
+        handler.handle(make_record())
+        handler.close()
+
+        assert target.lines == ['Task a created']
+        assert threading.current_thread() not in target.threads
+
+    def test_full_queue_drops_and_reports(self):
+        """Test that records are dropped while the queue is full, then reported."""
+        handler = AsyncQueueHandler(queue.Queue(2))
+
+        for _ in range(3):
+            handler.handle(make_record())
+        assert handler.dropped == 1
+        handler.queue.get_nowait()
+        handler.queue.get_nowait()
+        handler.handle(make_record())
+
+        assert handler.dropped == 0
+        assert [handler.queue.get_nowait().getMessage() for _ in range(2)] == [
+            'Task a created', 'Dropped 1 log records, the log queue was full',
+        ]
+
+    def test_block_overflow(self):
+        """Test that overflow = 'block' waits for room instead of dropping."""
+        handler = AsyncQueueHandler(queue.Queue(1))
+        handler.overflow = 'block'
+        handler.handle(make_record())
+        threading.Timer(0.05, handler.queue.get_nowait).start()
+
+        handler.handle(make_record())
+
+        assert handler.dropped == 0
+        assert handler.queue.qsize() == 1